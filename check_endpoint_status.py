@@ -1,13 +1,21 @@
 #!/usr/bin/env python3
 """Check Databricks endpoint status using REST API."""
 
-import os
+import re
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from server.config import get_settings
+
+# Endpoint names that identify foundation models
+FOUNDATION_RE = re.compile(r'llama|mixtral|dbrx|mpt', re.IGNORECASE)
 
 # Get credentials
-host = os.getenv('DATABRICKS_HOST', '').rstrip('/')
-token = os.getenv('DATABRICKS_TOKEN', '')
+settings = get_settings()
+host = (settings.databricks_host or '').rstrip('/')
+token = settings.databricks_token or ''
 
 if not host or not token:
     print("Error: DATABRICKS_HOST and DATABRICKS_TOKEN must be set")
@@ -16,18 +24,24 @@ if not host or not token:
 print(f"Host: {host}")
 print(f"Token: {'*' * 10}{token[-4:] if len(token) > 4 else ''}")
 
-# Headers for API requests
-headers = {
+# Pooled session shared by all API requests
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+))
+session.headers.update({
     'Authorization': f'Bearer {token}',
     'Content-Type': 'application/json'
-}
+})
 
 # List all serving endpoints
 print("\nListing serving endpoints...")
 url = f"{host}/api/2.0/serving-endpoints"
 
 try:
-    response = requests.get(url, headers=headers, timeout=30)
+    response = session.get(url, timeout=30)
     
     if response.status_code == 200:
         data = response.json()
@@ -41,7 +55,7 @@ try:
             state = endpoint.get('state', {}).get('ready', 'UNKNOWN')
             
             # Check if it's a foundation model
-            if any(model in name.lower() for model in ['llama', 'mixtral', 'dbrx', 'mpt']):
+            if FOUNDATION_RE.search(name):
                 foundation_models.append((name, state))
                 print(f"  {name:<50} {state}")
         
@@ -32,6 +32,15 @@ interface BatchAnalysisProps {
   selectedSchemaId?: string;
 }
 
+const downloadSpreadsheet = (downloadUrl: string, filename: string) => {
+  const a = document.createElement('a');
+  a.href = downloadUrl;
+  a.download = filename;
+  document.body.appendChild(a);
+  a.click();
+  document.body.removeChild(a);
+};
+
 const BatchAnalysis: React.FC<BatchAnalysisProps> = ({ selectedSchemaId }) => {
   const [inputs, setInputs] = useState<BatchInput[]>([
     { id: '1', type: 'text', content: '' }
@@ -90,27 +99,8 @@ const BatchAnalysis: React.FC<BatchAnalysisProps> = ({ selectedSchemaId }) => {
       setResultsData(result.table_data);
       setShowResults(true);
       
-      // Also create download link from base64
-      const byteCharacters = atob(result.spreadsheet_base64);
-      const byteNumbers = new Array(byteCharacters.length);
-      for (let i = 0; i < byteCharacters.length; i++) {
-        byteNumbers[i] = byteCharacters.charCodeAt(i);
-      }
-      const byteArray = new Uint8Array(byteNumbers);
-      const blob = new Blob([byteArray], { 
-        type: data.export_format === 'xlsx' 
-          ? 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' 
-          : 'text/csv' 
-      });
-      
-      const url = window.URL.createObjectURL(blob);
-      const a = document.createElement('a');
-      a.href = url;
-      a.download = result.filename;
-      document.body.appendChild(a);
-      a.click();
-      window.URL.revokeObjectURL(url);
-      document.body.removeChild(a);
+      // Fetch the generated spreadsheet from its one-time download URL
+      downloadSpreadsheet(result.download_url, result.filename);
 
       return result;
     }
@@ -143,27 +133,8 @@ const BatchAnalysis: React.FC<BatchAnalysisProps> = ({ selectedSchemaId }) => {
       setResultsData(result.table_data);
       setShowResults(true);
       
-      // Also create download link from base64
-      const byteCharacters = atob(result.spreadsheet_base64);
-      const byteNumbers = new Array(byteCharacters.length);
-      for (let i = 0; i < byteCharacters.length; i++) {
-        byteNumbers[i] = byteCharacters.charCodeAt(i);
-      }
-      const byteArray = new Uint8Array(byteNumbers);
-      const blob = new Blob([byteArray], { 
-        type: data.export_format === 'xlsx' 
-          ? 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' 
-          : 'text/csv' 
-      });
-      
-      const url = window.URL.createObjectURL(blob);
-      const a = document.createElement('a');
-      a.href = url;
-      a.download = result.filename;
-      document.body.appendChild(a);
-      a.click();
-      window.URL.revokeObjectURL(url);
-      document.body.removeChild(a);
+      // Fetch the generated spreadsheet from its one-time download URL
+      downloadSpreadsheet(result.download_url, result.filename);
 
       return result;
     }
@@ -264,27 +235,8 @@ const BatchAnalysis: React.FC<BatchAnalysisProps> = ({ selectedSchemaId }) => {
       setResultsData(result.table_data);
       setShowResults(true);
       
-      // Also create download link from base64
-      const byteCharacters = atob(result.spreadsheet_base64);
-      const byteNumbers = new Array(byteCharacters.length);
-      for (let i = 0; i < byteCharacters.length; i++) {
-        byteNumbers[i] = byteCharacters.charCodeAt(i);
-      }
-      const byteArray = new Uint8Array(byteNumbers);
-      const blob = new Blob([byteArray], { 
-        type: formData.get('export_format') === 'xlsx' 
-          ? 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-          : 'text/csv'
-      });
-      
-      const url = window.URL.createObjectURL(blob);
-      const a = document.createElement('a');
-      a.href = url;
-      a.download = result.filename;
-      document.body.appendChild(a);
-      a.click();
-      document.body.removeChild(a);
-      window.URL.revokeObjectURL(url);
+      // Fetch the generated spreadsheet from its one-time download URL
+      downloadSpreadsheet(result.download_url, result.filename);
     }
   });
 
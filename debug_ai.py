@@ -2,81 +2,102 @@
 """Debug script to test Databricks Foundation Model integration."""
 
 import asyncio
-import os
+import string
 import sys
 
+import orjson
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.service.serving import ChatMessage, ChatMessageRole
 
+from server.config import get_settings
+from server.services.databricks_client import get_client
+from server.utils.json_extract import extract_first_json
+from server.utils.rate_limit import call_with_retry
 
-async def test_foundation_model():
-  """Test the Foundation Model directly."""
-  print('Testing Databricks Foundation Model integration...')
+ENDPOINT_NAME = 'databricks-meta-llama-3-3-70b-instruct'
 
-  # Load environment
-  from dotenv import load_dotenv
-
-  load_dotenv('.env.local')
+# Meeting snippets sent to the endpoint; each one is an independent probe
+TEST_TEXTS = [
+  'Meeting with Thermo Fisher on July 9, 2025. They discussed implementing vector search.',
+  'March 11, 2025 | 7-Eleven - Vector Search, Embedding FT. Batch analytics for inventory.',
+]
 
-  print(f'DATABRICKS_HOST: {os.getenv("DATABRICKS_HOST")}')
-  print(f'DATABRICKS_TOKEN present: {bool(os.getenv("DATABRICKS_TOKEN"))}')
-
-  try:
-    client = WorkspaceClient()
-    endpoint_name = 'databricks-meta-llama-3-3-70b-instruct'
-
-    # Test simple query
-    test_text = (
-      'Meeting with Thermo Fisher on July 9, 2025. They discussed implementing vector search.'
-    )
-
-    prompt = f"""Analyze this customer meeting text and identify products mentioned.
+# Product extraction prompt; only the meeting text varies between probes
+PROMPT_TMPL = string.Template("""Analyze this customer meeting text and identify products mentioned.
 
 Customer meeting notes text:
-"{test_text}"
+"$text"
 
 Possible products: Vector Search, Real-time Search, Keyword Search, Batch Processing
 
 You MUST respond with ONLY a JSON object:
-{{"values": ["product1"], "evidence": ["text snippet"], "confidence": 0.8}}"""
-
-    print(f'\nSending prompt ({len(prompt)} chars):')
-    print(prompt)
+{"values": ["product1"], "evidence": ["text snippet"], "confidence": 0.8}""")
+
+
+async def run_probe(client: WorkspaceClient, test_text: str) -> bool:
+  """Send one extraction prompt to the Foundation Model and validate the JSON reply."""
+  prompt = PROMPT_TMPL.substitute(text=test_text)
+
+  print(f'\nSending prompt ({len(prompt)} chars):')
+  print(prompt)
+  print('\n' + '=' * 50)
+
+  messages = [ChatMessage(role=ChatMessageRole.USER, content=prompt)]
+
+  # The SDK call is blocking; run it in a thread so probes overlap on the shared loop, paced by the
+  # shared serving rate limiter and retried on throttling
+  response = await call_with_retry(
+    lambda: asyncio.to_thread(
+      client.serving_endpoints.query,
+      name=ENDPOINT_NAME,
+      messages=messages,
+      max_tokens=200,
+      temperature=0.1,
+    ),
+    ENDPOINT_NAME,
+  )
+
+  if response.choices and len(response.choices) > 0:
+    content = response.choices[0].message.content
+    print(f'Foundation Model Response for "{test_text[:40]}...":')
+    print(content)
     print('\n' + '=' * 50)
 
-    messages = [ChatMessage(role=ChatMessageRole.USER, content=prompt)]
-
-    response = client.serving_endpoints.query(
-      name=endpoint_name, messages=messages, max_tokens=200, temperature=0.1
-    )
-
-    if response.choices and len(response.choices) > 0:
-      content = response.choices[0].message.content
-      print('Foundation Model Response:')
-      print(content)
-      print('\n' + '=' * 50)
-
-      # Test JSON extraction
-      import json
-      import re
-
-      json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', content, re.DOTALL)
-      if json_match:
-        json_text = json_match.group()
-        print(f'Extracted JSON: {json_text}')
-        try:
-          parsed = json.loads(json_text)
-          print(f'Successfully parsed: {parsed}')
-          return True
-        except json.JSONDecodeError as e:
-          print(f'JSON parse error: {e}')
-          return False
-      else:
-        print('No JSON found in response')
+    # Test JSON extraction
+    json_text = extract_first_json(content)
+    if json_text:
+      print(f'Extracted JSON: {json_text}')
+      try:
+        parsed = orjson.loads(json_text)
+        print(f'Successfully parsed: {parsed}')
+        return True
+      except orjson.JSONDecodeError as e:
+        print(f'JSON parse error: {e}')
         return False
     else:
-      print('No response choices')
+      print('No JSON found in response')
       return False
+  else:
+    print('No response choices')
+    return False
+
+
+async def test_foundation_model():
+  """Test the Foundation Model directly."""
+  print('Testing Databricks Foundation Model integration...')
+
+  # Load environment
+  settings = get_settings()
+
+  print(f'DATABRICKS_HOST: {settings.databricks_host}')
+  print(f'DATABRICKS_TOKEN present: {bool(settings.databricks_token)}')
+
+  try:
+    client = get_client()
+
+    # Run every probe concurrently on one event loop with one shared client
+    results = await asyncio.gather(*(run_probe(client, text) for text in TEST_TEXTS))
+    return all(results)
 
   except Exception as e:
     print(f'Error: {e}')
@@ -5,10 +5,10 @@ import asyncio
 import os
 from server.services.ai_engine import AIInsightsEngine
 from server.models.schema_models import CategoryDefinition, CategoryValueType, SchemaTemplate
+from server.utils.env import load_env
 
 # Load environment
-from dotenv import load_dotenv
-load_dotenv(".env.local")
+load_env()
 
 async def debug_extraction():
     """Debug extraction for specific documents."""
@@ -94,38 +94,41 @@ They want to run everything in real-time for their investment analysis platform.
     print("DEBUGGING EXTRACTION ISSUES")
     print("="*80)
     
-    for filename, content in test_docs.items():
+    # Run all documents concurrently; each analysis is an independent LLM-bound call
+    results = await asyncio.gather(
+        *(ai_engine.analyze_text(content, schema, extract_customer_info=True) for content in test_docs.values()),
+        return_exceptions=True,
+    )
+    
+    for (filename, content), result in zip(test_docs.items(), results):
         print(f"\n{'='*60}")
         print(f"Testing: {filename}")
         print(f"{'='*60}")
         
-        try:
-            # Enable detailed logging
-            print("\nDocument content preview:")
-            print(content[:300] + "...")
-            
-            result = await ai_engine.analyze_text(content, schema, extract_customer_info=True)
-            
-            print(f"\n--- EXTRACTION RESULTS ---")
-            print(f"Customer Name: {result.customer_name or '(EMPTY)'}")
-            print(f"Meeting Date: {result.meeting_date or '(EMPTY)'}")
-            
-            print("\nCategories:")
-            for category_name, category_result in result.categories.items():
-                values = category_result.values if category_result.values else ["(EMPTY)"]
-                print(f"\n{category_name}:")
-                print(f"  Values: {', '.join(values)}")
-                print(f"  Confidence: {category_result.confidence}")
-                print(f"  Model: {category_result.model_used}")
-                if category_result.error:
-                    print(f"  ERROR: {category_result.error}")
-                if category_result.evidence_text and len(category_result.evidence_text) > 0:
-                    print(f"  Evidence: {category_result.evidence_text[0][:100]}...")
-                    
-        except Exception as e:
-            print(f"ERROR during extraction: {e}")
+        print("\nDocument content preview:")
+        print(content[:300] + "...")
+        
+        if isinstance(result, Exception):
+            print(f"ERROR during extraction: {result}")
             import traceback
-            traceback.print_exc()
+            traceback.print_exception(result)
+            continue
+        
+        print(f"\n--- EXTRACTION RESULTS ---")
+        print(f"Customer Name: {result.customer_name or '(EMPTY)'}")
+        print(f"Meeting Date: {result.meeting_date or '(EMPTY)'}")
+        
+        print("\nCategories:")
+        for category_name, category_result in result.categories.items():
+            values = category_result.values if category_result.values else ["(EMPTY)"]
+            print(f"\n{category_name}:")
+            print(f"  Values: {', '.join(values)}")
+            print(f"  Confidence: {category_result.confidence}")
+            print(f"  Model: {category_result.model_used}")
+            if category_result.error:
+                print(f"  ERROR: {category_result.error}")
+            if category_result.evidence_text and len(category_result.evidence_text) > 0:
+                print(f"  Evidence: {category_result.evidence_text[0][:100]}...")
     
     print("\n" + "="*80)
     print("ANALYSIS COMPLETE")
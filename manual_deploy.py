@@ -1,39 +1,70 @@
 #!/usr/bin/env python3
 """Manual deployment script for Databricks Apps using the SDK."""
 
-import os
+import asyncio
 import sys
+from pathlib import Path
 
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.service.workspace import ImportFormat, Language
 
+from server.config import get_settings
+from server.services.databricks_client import get_client
+
+# Maximum number of workspace uploads in flight at once
+UPLOAD_CONCURRENCY = 16
+
+# File types uploaded from the server package
+UPLOAD_EXTENSIONS = frozenset({'.py', '.txt', '.yaml', '.yml'})
+
+
+async def upload_files(
+  client: WorkspaceClient, source_path: str, uploads: list[tuple[str, Language | None]]
+) -> list:
+  """Upload files to the workspace concurrently.
+
+  The SDK is synchronous, so each import runs in a worker thread; a semaphore bounds
+  the number of requests in flight. Files are read before a slot is acquired so disk
+  reads overlap with network uploads.
+
+  Returns:
+    One entry per upload, in order: None on success or the raised exception.
+  """
+  semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+  async def upload_one(file_path: str, language: Language | None) -> None:
+    content = await asyncio.to_thread(Path(file_path).read_bytes)
+    async with semaphore:
+      await asyncio.to_thread(
+        client.workspace.import_,
+        path=f'{source_path}/{file_path}',
+        content=content,
+        format=ImportFormat.AUTO,
+        language=language,
+        overwrite=True,
+      )
+
+  return await asyncio.gather(
+    *(upload_one(file_path, language) for file_path, language in uploads),
+    return_exceptions=True,
+  )
+
 
 def main():
   """Deploy the application to Databricks Apps using the SDK."""
   # Load environment
-  if os.path.exists('.env.local'):
-    with open('.env.local', 'r') as f:
-      for line in f:
-        if '=' in line and not line.startswith('#'):
-          key, value = line.strip().split('=', 1)
-          os.environ[key] = value
-
-  host = os.getenv('DATABRICKS_HOST')
-  token = os.getenv('DATABRICKS_TOKEN')
-  source_path = os.getenv('DBA_SOURCE_CODE_PATH')
-  app_name = os.getenv('DATABRICKS_APP_NAME')
-
-  if not all([host, token, source_path, app_name]):
+  settings = get_settings()
+  source_path = settings.source_code_path
+  app_name = settings.databricks_app_name
+
+  if not all([settings.databricks_host, settings.databricks_token, source_path, app_name]):
     print('❌ Missing required environment variables')
     sys.exit(1)
 
-  print(f'🔗 Connecting to Databricks at {host}')
+  print(f'🔗 Connecting to Databricks at {settings.databricks_host}')
 
   # Initialize Databricks client
-  os.environ['DATABRICKS_HOST'] = host
-  os.environ['DATABRICKS_TOKEN'] = token
-
-  client = WorkspaceClient()
+  client = get_client()
 
   print(f'📂 Creating workspace directory: {source_path}')
   try:
@@ -41,61 +72,27 @@ def main():
   except Exception as e:
     print(f'Directory may already exist: {e}')
 
-  print('📤 Uploading key files...')
-
-  # Upload app.yaml
-  try:
-    with open('app.yaml', 'r') as f:
-      content = f.read()
-    client.workspace.import_(
-      path=f'{source_path}/app.yaml',
-      content=content.encode('utf-8'),
-      format=ImportFormat.AUTO,
-      language=Language.YAML,
-      overwrite=True,
-    )
-    print('✅ Uploaded app.yaml')
-  except Exception as e:
-    print(f'⚠️ Failed to upload app.yaml: {e}')
-
-  # Upload requirements.txt
-  try:
-    with open('requirements.txt', 'r') as f:
-      content = f.read()
-    client.workspace.import_(
-      path=f'{source_path}/requirements.txt',
-      content=content.encode('utf-8'),
-      format=ImportFormat.AUTO,
-      overwrite=True,
-    )
-    print('✅ Uploaded requirements.txt')
-  except Exception as e:
-    print(f'⚠️ Failed to upload requirements.txt: {e}')
-
-  # Upload server directory files
-  server_files = []
-  for root, dirs, files in os.walk('server'):
-    for file in files:
-      if file.endswith(('.py', '.txt', '.yaml', '.yml')):
-        server_files.append(os.path.join(root, file))
-
-  print(f'📁 Uploading {len(server_files)} server files...')
-  for file_path in server_files:
-    try:
-      with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-      remote_path = f'{source_path}/{file_path}'
-      client.workspace.import_(
-        path=remote_path,
-        content=content.encode('utf-8'),
-        format=ImportFormat.AUTO,
-        language=Language.PYTHON if file_path.endswith('.py') else None,
-        overwrite=True,
-      )
+  # Collect files to upload: top-level config files plus the server package
+  uploads = [
+    ('app.yaml', Language.YAML),
+    ('requirements.txt', None),
+  ]
+  server_files = sorted(
+    p.as_posix() for p in Path('server').rglob('*') if p.suffix in UPLOAD_EXTENSIONS and p.is_file()
+  )
+  uploads.extend(
+    (file_path, Language.PYTHON if file_path.endswith('.py') else None)
+    for file_path in server_files
+  )
+
+  print(f'📤 Uploading {len(uploads)} files ({len(server_files)} server files)...')
+  results = asyncio.run(upload_files(client, source_path, uploads))
+
+  for (file_path, _), result in zip(uploads, results):
+    if isinstance(result, Exception):
+      print(f'⚠️ Failed to upload {file_path}: {result}')
+    else:
       print(f'✅ Uploaded {file_path}')
-    except Exception as e:
-      print(f'⚠️ Failed to upload {file_path}: {e}')
 
   print('🚀 Files uploaded successfully!')
   print(f'📱 App Name: {app_name}')
@@ -2,37 +2,27 @@
 
 import os
 from contextlib import asynccontextmanager
-from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from server.routers import router
+from server.routers import register_routers
+from server.services.databricks_client import close_serving_http_client
+from server.utils.env import load_env
+from server.utils.responses import OrjsonResponse
 
-
-# Load environment variables from .env.local if it exists
-def load_env_file(filepath: str) -> None:
-  """Load environment variables from a file."""
-  if Path(filepath).exists():
-    with open(filepath) as f:
-      for line in f:
-        line = line.strip()
-        if line and not line.startswith('#'):
-          key, _, value = line.partition('=')
-          if key and value:
-            os.environ[key] = value
-
-
-# Load .env files
-load_env_file('.env')
-load_env_file('.env.local')
+# Load .env files. Variables already set in the environment win, and .env.local is read first so
+# its values win over .env.
+load_env('.env.local')
+load_env('.env')
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
   """Manage application lifespan."""
   yield
+  await close_serving_http_client()
 
 
 app = FastAPI(
@@ -40,6 +30,8 @@ app = FastAPI(
   description='Modern FastAPI application template for Databricks Apps with React frontend',
   version='0.1.0',
   lifespan=lifespan,
+  # Render every JSON response with orjson rather than the stdlib json module
+  default_response_class=OrjsonResponse,
 )
 
 app.add_middleware(
@@ -50,7 +42,7 @@ app.add_middleware(
   allow_headers=['*'],
 )
 
-app.include_router(router, prefix='/api', tags=['api'])
+register_routers(app)
 
 
 @app.get('/health')
@@ -0,0 +1,51 @@
+"""Application settings read from the environment."""
+
+import os
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from server.utils.env import load_env
+
+
+class Settings(BaseModel):
+  """Snapshot of the environment variables used by the app and helper scripts."""
+
+  databricks_host: Optional[str] = None
+  databricks_token: Optional[str] = None
+  databricks_auth_type: Optional[str] = None
+  databricks_app_name: Optional[str] = None
+  source_code_path: Optional[str] = None
+  use_mock_llm: bool = False
+  serving_requests_per_minute: int = 60
+  serving_max_concurrency: int = 8
+  serving_max_attempts: int = 5
+
+  model_config = ConfigDict(frozen=True)
+
+  @classmethod
+  def from_env(cls) -> 'Settings':
+    """Build settings from the current process environment."""
+    return cls(
+      databricks_host=os.getenv('DATABRICKS_HOST') or None,
+      databricks_token=os.getenv('DATABRICKS_TOKEN') or None,
+      databricks_auth_type=os.getenv('DATABRICKS_AUTH_TYPE') or None,
+      databricks_app_name=os.getenv('DATABRICKS_APP_NAME') or None,
+      source_code_path=os.getenv('DBA_SOURCE_CODE_PATH') or None,
+      use_mock_llm=os.getenv('USE_MOCK_LLM', 'false').lower() == 'true',
+      serving_requests_per_minute=int(os.getenv('SERVING_REQUESTS_PER_MINUTE', '60')),
+      serving_max_concurrency=int(os.getenv('SERVING_MAX_CONCURRENCY', '8')),
+      serving_max_attempts=int(os.getenv('SERVING_MAX_ATTEMPTS', '5')),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+  """Load .env.local (once) and return the cached settings snapshot.
+
+  Returns:
+    Settings read from the environment on first call.
+  """
+  load_env()
+  return Settings.from_env()
@@ -1,9 +1,12 @@
 """Pydantic models for batch processing and spreadsheet export."""
 
-from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Union
-from pydantic import BaseModel, Field
+from functools import cached_property, lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
+
+from server.models.document_models import CategoryResult, QuickAnalysisResult
 
 
 class BatchInputType(str, Enum):
@@ -16,10 +19,17 @@ class BatchInputType(str, Enum):
 class BatchInput(BaseModel):
   """Single input item for batch processing."""
   input_type: BatchInputType
-  content: str = Field(..., description='Text content, file path, or URL')
+  content: Union[str, bytes] = Field(..., description='Text content, file path, or URL')
   filename: Optional[str] = Field(None, description='Original filename if applicable')
   
-  model_config = {'use_enum_values': True}
+  model_config = ConfigDict(use_enum_values=True)
+
+  @cached_property
+  def text(self) -> str:
+    """Content as text; raw bytes from in-process callers are decoded once, on first use."""
+    if isinstance(self.content, bytes):
+      return self.content.decode('utf-8', errors='replace')
+    return self.content
 
 
 class BatchAnalysisRequest(BaseModel):
@@ -29,7 +39,7 @@ class BatchAnalysisRequest(BaseModel):
   extract_customer_info: bool = Field(True, description='Whether to extract customer name and meeting date')
   export_format: str = Field('csv', description='Export format (csv, xlsx)')
   
-  model_config = {'use_enum_values': True}
+  model_config = ConfigDict(use_enum_values=True)
 
 
 class BatchItemResult(BaseModel):
@@ -39,12 +49,58 @@ class BatchItemResult(BaseModel):
   filename: Optional[str] = None
   customer_name: Optional[str] = None
   meeting_date: Optional[str] = None
-  categories: dict = Field(default_factory=dict)
+  categories: Dict[str, CategoryResult] = Field(default_factory=dict)
   processing_time_ms: int
   word_count: int
   error: Optional[str] = None
   
-  model_config = {'use_enum_values': True}
+  model_config = ConfigDict(use_enum_values=True, frozen=True)
+
+  @field_serializer('categories')
+  def _serialize_categories(self, categories: Dict[str, CategoryResult]) -> Dict[str, dict]:
+    return categories_to_dict(categories)
+
+  @classmethod
+  def from_analysis(
+    cls,
+    index: int,
+    input_type: BatchInputType,
+    filename: Optional[str],
+    analysis_result: QuickAnalysisResult,
+  ) -> 'BatchItemResult':
+    """Build the batch row for a successfully analyzed item."""
+    return cls(
+      index=index,
+      input_type=input_type,
+      filename=filename,
+      customer_name=analysis_result.customer_name,
+      meeting_date=analysis_result.meeting_date,
+      categories=analysis_result.categories,
+      processing_time_ms=analysis_result.processing_time_ms,
+      word_count=analysis_result.word_count,
+    )
+
+  @classmethod
+  def from_error(
+    cls, index: int, input_type: BatchInputType, filename: Optional[str], error: Exception
+  ) -> 'BatchItemResult':
+    """Build the batch row for an item whose extraction or analysis failed."""
+    return cls(
+      index=index,
+      input_type=input_type,
+      filename=filename,
+      processing_time_ms=0,
+      word_count=0,
+      error=str(error),
+    )
+
+
+def categories_to_dict(categories: Dict[str, CategoryResult]) -> Dict[str, dict]:
+  """Category results in the values/confidence/evidence shape batch responses send to clients."""
+  return {
+    name: {'values': cat.values, 'confidence': cat.confidence, 'evidence': cat.evidence_text}
+    for name, cat in categories.items()
+  }
 
 
 class BatchAnalysisResult(BaseModel):
@@ -56,4 +112,87 @@ class BatchAnalysisResult(BaseModel):
   results: List[BatchItemResult]
   spreadsheet_filename: str = Field(..., description='Suggested filename for download')
   
-  model_config = {'use_enum_values': True}
\ No newline at end of file
+  model_config = ConfigDict(use_enum_values=True, frozen=True)
+
+
+# Base export columns, in spreadsheet order.
+BASE_EXPORT_COLUMNS = [
+  'Index',
+  'Input Type',
+  'Source',
+  'Customer Name',
+  'Meeting Date',
+  'Word Count',
+  'Processing Time (ms)',
+  'Error',
+]
+
+
+# Cell expression for each base export column, in terms of a BatchItemResult named `r`
+_BASE_COLUMN_EXPRS = {
+  'Index': 'r.index + 1',
+  'Input Type': 'r.input_type',
+  'Source': "r.filename or ''",
+  'Customer Name': "r.customer_name or ''",
+  'Meeting Date': "r.meeting_date or ''",
+  'Word Count': 'r.word_count',
+  'Processing Time (ms)': 'r.processing_time_ms',
+  'Error': "r.error or ''",
+}
+
+
+def _known_columns(include: Sequence[str], category_names: Sequence[str]) -> List[str]:
+  """Names in include that are a base column or a schema category, in order."""
+  categories = set(category_names)
+  return [name for name in include if name in _BASE_COLUMN_EXPRS or name in categories]
+
+
+@lru_cache(maxsize=128)
+def compile_row_builder(columns: Tuple[str, ...]) -> Callable[[BatchItemResult], tuple]:
+  """Generate a function that returns one result's cells for the given columns, as a tuple.
+
+  A column selection is fixed for a whole export (and usually across exports of one schema), so
+  rather than dispatching to a getter per cell the builder is generated once as straight-line
+  attribute access and compiled. Column names only reach the generated source as repr()
+  literals.
+
+  Args:
+    columns: Base column or category names, in output order; see _known_columns.
+
+  Returns:
+    build_row(result) -> tuple of cell values. Categories give comma-joined values.
+  """
+  cells = ''.join(
+    f'{_BASE_COLUMN_EXPRS[name]}, '
+    if name in _BASE_COLUMN_EXPRS
+    else f"_join(c[{name!r}].values) if {name!r} in c else '', "
+    for name in columns
+  )
+  source = f'def build_row(r):\n  c = r.categories\n  return ({cells})\n'
+  namespace = {'_join': ', '.join}
+  exec(compile(source, '<batch row builder>', 'exec'), namespace)
+  return namespace['build_row']
+
+
+def batch_results_to_rows(
+  results: Sequence[BatchItemResult],
+  category_names: Sequence[str],
+  include: Optional[Sequence[str]] = None,
+) -> Tuple[List[str], List[tuple]]:
+  """Project batch results into spreadsheet rows.
+
+  Args:
+    results: Per-item batch results.
+    category_names: Schema category names; each becomes one column of comma-joined values.
+    include: Columns to build, in order; defaults to the base columns followed by every
+      category. Names that are neither a base column nor a category are skipped.
+
+  Returns:
+    Tuple of (column names, one tuple of cell values per result).
+  """
+  if include is None:
+    include = BASE_EXPORT_COLUMNS + list(category_names)
+  columns = _known_columns(include, category_names)
+  build_row = compile_row_builder(tuple(columns))
+  return columns, [build_row(result) for result in results]
+
@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class DocumentSource(str, Enum):
@@ -27,7 +27,7 @@ class DocumentInput(BaseModel):
     default_factory=dict, description='Additional metadata'
   )
 
-  model_config = {'use_enum_values': True}
+  model_config = ConfigDict(use_enum_values=True)
 
 
 class ProcessingRequest(BaseModel):
@@ -38,7 +38,7 @@ class ProcessingRequest(BaseModel):
   documents: List[DocumentInput] = Field(..., description='Documents to process')
   user_id: Optional[str] = Field(None, description='User ID for the session')
 
-  model_config = {'use_enum_values': True}
+  model_config = ConfigDict(use_enum_values=True)
 
 
 class ExtractedEntity(BaseModel):
@@ -50,6 +50,8 @@ class ExtractedEntity(BaseModel):
   start_pos: Optional[int] = Field(None, description='Start position in text')
   end_pos: Optional[int] = Field(None, description='End position in text')
 
+  model_config = ConfigDict(frozen=True)
+
 
 class CategoryResult(BaseModel):
   """Result for a single category classification."""
@@ -63,6 +65,8 @@ class CategoryResult(BaseModel):
   model_used: str = Field(..., description='AI model used for this classification')
   error: Optional[str] = Field(None, description='Error message if processing failed')
 
+  model_config = ConfigDict(frozen=True)
+
 
 class DocumentAnalysisResult(BaseModel):
   """Result of analyzing a single document."""
@@ -83,7 +87,7 @@ class DocumentAnalysisResult(BaseModel):
   )
   source_info: DocumentInput = Field(..., description='Original document information')
 
-  model_config = {'use_enum_values': True}
+  model_config = ConfigDict(use_enum_values=True, frozen=True)
 
 
 class AnalysisSession(BaseModel):
@@ -109,7 +113,7 @@ class AnalysisSession(BaseModel):
       return 0.0
     return (self.processed_documents / self.total_documents) * 100
 
-  model_config = {'use_enum_values': True}
+  model_config = ConfigDict(use_enum_values=True)
 
 
 class ProcessingProgress(BaseModel):
@@ -136,7 +140,7 @@ class TextAnalysisRequest(BaseModel):
     True, description='Whether to extract customer name and meeting date'
   )
 
-  model_config = {'use_enum_values': True}
+  model_config = ConfigDict(use_enum_values=True)
 
 
 class QuickAnalysisResult(BaseModel):
@@ -148,4 +152,4 @@ class QuickAnalysisResult(BaseModel):
   processing_time_ms: int = Field(..., description='Time taken to process')
   word_count: int = Field(..., description='Number of words in the input text')
 
-  model_config = {'use_enum_values': True}
+  model_config = ConfigDict(use_enum_values=True, frozen=True)
@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class CategoryValueType(str, Enum):
@@ -26,7 +26,7 @@ class CategoryDefinition(BaseModel):
     None, description='Predefined values (only for predefined type)'
   )
 
-  model_config = {'use_enum_values': True}
+  model_config = ConfigDict(use_enum_values=True)
 
 
 class SchemaTemplate(BaseModel):
@@ -40,7 +40,7 @@ class SchemaTemplate(BaseModel):
   created_at: Optional[datetime] = Field(None, description='When the template was created')
   updated_at: Optional[datetime] = Field(None, description='When the template was last updated')
 
-  model_config = {'use_enum_values': True}
+  model_config = ConfigDict(use_enum_values=True)
 
 
 class CreateSchemaRequest(BaseModel):
@@ -51,7 +51,7 @@ class CreateSchemaRequest(BaseModel):
     ..., description='Categories to include in the schema'
   )
 
-  model_config = {'use_enum_values': True}
+  model_config = ConfigDict(use_enum_values=True)
 
 
 class UpdateSchemaRequest(BaseModel):
@@ -60,7 +60,7 @@ class UpdateSchemaRequest(BaseModel):
   template_name: Optional[str] = Field(None, description='New name for the template')
   categories: Optional[List[CategoryDefinition]] = Field(None, description='Updated categories')
 
-  model_config = {'use_enum_values': True}
+  model_config = ConfigDict(use_enum_values=True)
 
 
 class SchemaValidationError(BaseModel):
@@ -69,6 +69,8 @@ class SchemaValidationError(BaseModel):
   field: str = Field(..., description='Field that failed validation')
   message: str = Field(..., description='Error message')
 
+  model_config = ConfigDict(frozen=True)
+
 
 class SchemaValidationResponse(BaseModel):
   """Response for schema validation requests."""
@@ -80,6 +82,10 @@ class SchemaValidationResponse(BaseModel):
 
 
 # Default schema templates
+# Built-in templates are static, so they share a fixed creation timestamp instead of
+# reading the clock every time a worker imports this module.
+DEFAULT_TEMPLATES_CREATED_AT = datetime(2025, 1, 1)
+
 DEFAULT_PRODUCT_FEEDBACK_SCHEMA = SchemaTemplate(
   template_id='default_product_feedback',
   template_name='Product Feedback Template',
@@ -115,7 +121,7 @@ DEFAULT_PRODUCT_FEEDBACK_SCHEMA = SchemaTemplate(
     ),
   ],
   is_default=True,
-  created_at=datetime.now(),
+  created_at=DEFAULT_TEMPLATES_CREATED_AT,
 )
 
 DEFAULT_VECTOR_SEARCH_SCHEMA = SchemaTemplate(
@@ -172,7 +178,7 @@ DEFAULT_VECTOR_SEARCH_SCHEMA = SchemaTemplate(
     ),
   ],
   is_default=True,
-  created_at=datetime.now(),
+  created_at=DEFAULT_TEMPLATES_CREATED_AT,
 )
 
 DEFAULT_FEATURE_REQUESTS_SCHEMA = SchemaTemplate(
@@ -210,5 +216,5 @@ DEFAULT_FEATURE_REQUESTS_SCHEMA = SchemaTemplate(
     ),
   ],
   is_default=True,
-  created_at=datetime.now(),
+  created_at=DEFAULT_TEMPLATES_CREATED_AT,
 )
@@ -1,15 +1,35 @@
 # Generic router module for the Databricks app template
 # Add your FastAPI routes here
+#
+# Router submodules are imported on demand by register_routers() rather than at package import,
+# so `from server.routers.schema import _schemas` does not pull in the AI engine and every other
+# router with it.
 
-from fastapi import APIRouter
+from importlib import import_module
 
-from .insights import router as insights_router
-from .schema import router as schema_router
-from .user import router as user_router
-from .batch import router as batch_router
+from fastapi import APIRouter, FastAPI
 
-router = APIRouter()
-router.include_router(user_router, prefix='/user', tags=['user'])
-router.include_router(schema_router, tags=['schema'])
-router.include_router(insights_router, tags=['insights'])
-router.include_router(batch_router, tags=['batch'])
+# (module name, prefix, tags) for each router mounted under the API prefix
+ROUTERS = [
+  ('user', '/user', ['user']),
+  ('schema', '', ['schema']),
+  ('insights', '', ['insights']),
+  ('batch', '', ['batch']),
+]
+
+
+def register_routers(app: FastAPI, prefix: str = '/api') -> None:
+  """Import each router module and mount it on the app.
+
+  Must be called before the static-files catch-all is mounted, otherwise the API routes would be
+  unreachable.
+
+  Args:
+    app: FastAPI application to register the routes on.
+    prefix: Path prefix shared by all API routes.
+  """
+  router = APIRouter()
+  for name, router_prefix, tags in ROUTERS:
+    module = import_module(f'.{name}', __package__)
+    router.include_router(module.router, prefix=router_prefix, tags=tags)
+  app.include_router(router, prefix=prefix, tags=['api'])
@@ -1,27 +1,34 @@
 """Batch processing endpoints for insights extraction."""
 
-import io
-from typing import List, Optional
+import asyncio
+import json
+import time
+import uuid
 from datetime import datetime
-import pandas as pd
 from io import BytesIO
-import base64
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile, status
 from fastapi.responses import StreamingResponse
 
 from server.models.batch_models import (
-  BatchAnalysisRequest,
-  BatchAnalysisResult,
-  BatchInput,
   BatchInputType,
   BatchItemResult,
+  categories_to_dict,
 )
-from server.routers.schema import _schemas
-from server.services.ai_engine import ai_engine
 from server.routers.insights import extract_text_from_file, extract_text_from_google_drive
+from server.routers.schema import (
+  SchemaColumns,
+  _schemas,
+  build_schema_columns,
+  get_schema_columns,
+  get_schema_or_404,
+)
+from server.services.ai_engine import ai_engine
+from server.services.batch_export import write_batch_spreadsheet
+from server.utils.blocking import run_blocking, run_in_process
+from server.utils.memory_store import MemoryStore
+from server.utils.responses import OrjsonResponse
 
 router = APIRouter(prefix='/batch', tags=['Batch Processing'])
 
@@ -29,28 +36,9 @@ router = APIRouter(prefix='/batch', tags=['Batch Processing'])
 @router.get('/available-columns/{schema_template_id}')
 async def get_available_columns(schema_template_id: str):
   """Get list of available columns for export selection."""
-  if schema_template_id not in _schemas:
-    raise HTTPException(
-      status_code=status.HTTP_404_NOT_FOUND,
-      detail=f"Schema template '{schema_template_id}' not found",
-    )
-  
-  schema = _schemas[schema_template_id]
-  
-  # Base columns
-  base_columns = [
-    'Index',
-    'Input Type', 
-    'Source',
-    'Customer Name',
-    'Meeting Date',
-    'Word Count',
-    'Processing Time (ms)',
-    'Error'
-  ]
-  
-  # Category columns
-  category_columns = [category.name for category in schema.categories]
+  schema_columns = get_schema_columns(schema_template_id)
+  base_columns = list(schema_columns.base_columns)
+  category_columns = list(schema_columns.category_columns)
   
   return {
     'base_columns': base_columns,
@@ -59,78 +47,228 @@ async def get_available_columns(schema_template_id: str):
   }
 
 
+# Default number of batch items analyzed at once
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Batches with at least this many rows are exported in a worker process
+PROCESS_EXPORT_MIN_ROWS = 500
+
+# Seconds a generated spreadsheet stays available for download
+DOWNLOAD_TTL_SECS = 600
+
+EXPORT_MEDIA_TYPES = {
+  'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+  'csv': 'text/csv',
+}
+
+# Spreadsheets kept for download at once; beyond this the oldest unfetched ones are dropped
+DOWNLOAD_STORE_SIZE = 64
+
+# download_id -> (spreadsheet bytes, filename, media type, expiry timestamp). Held in this
+# process's memory only: with several uvicorn workers a link works only when the download request
+# reaches the worker that produced the spreadsheet, so run a single worker or move this to shared
+# storage before scaling out.
+_pending_downloads: MemoryStore[Tuple[bytes, str, str, float]] = MemoryStore(DOWNLOAD_STORE_SIZE)
+
+
+def _store_download(spreadsheet_data: bytes, filename: str, export_format: str) -> str:
+  """Keep a generated spreadsheet until it is fetched from /batch/download/{download_id}.
+
+  Returns:
+    The download ID.
+  """
+  now = time.monotonic()
+  for download_id in [key for key, entry in _pending_downloads.items() if entry[3] < now]:
+    del _pending_downloads[download_id]
+
+  download_id = str(uuid.uuid4())
+  media_type = EXPORT_MEDIA_TYPES.get(export_format, EXPORT_MEDIA_TYPES['csv'])
+  _pending_downloads[download_id] = (
+    spreadsheet_data, filename, media_type, now + DOWNLOAD_TTL_SECS
+  )
+  return download_id
+
+
+def _download_info(spreadsheet_data: bytes, filename: str, export_format: str) -> dict:
+  """Store a spreadsheet and return the response fields pointing at it."""
+  download_id = _store_download(spreadsheet_data, filename, export_format)
+  return {
+    'download_id': download_id,
+    'download_url': f'/api/batch/download/{download_id}',
+    'filename': filename,
+  }
+
+
+@router.get('/download/{download_id}')
+async def download_spreadsheet(download_id: str):
+  """Download a spreadsheet generated by one of the preview endpoints.
+
+  Each download ID can be fetched once and expires after DOWNLOAD_TTL_SECS, or earlier if more
+  than DOWNLOAD_STORE_SIZE newer spreadsheets are waiting to be fetched. Spreadsheets are kept in
+  the memory of the worker process that generated them; see _pending_downloads.
+
+  Raises:
+    HTTPException: 404 if the ID is unknown, was already fetched or has expired.
+  """
+  entry = _pending_downloads.pop(download_id, None)
+  if entry is None or entry[3] < time.monotonic():
+    raise HTTPException(
+      status_code=status.HTTP_404_NOT_FOUND,
+      detail=(
+        f'Download {download_id} not found. Download links work once, expire after '
+        f'{DOWNLOAD_TTL_SECS / 60:.0f} minutes and are dropped once {DOWNLOAD_STORE_SIZE} newer '
+        'spreadsheets are waiting; run the analysis again for a new link.'
+      ),
+    )
+
+  spreadsheet_data, filename, media_type, _ = entry
+  return StreamingResponse(
+    BytesIO(spreadsheet_data),
+    media_type=media_type,
+    headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+  )
+
+
+# Seconds an extracted Google Drive document is reused before it is fetched again
+URL_TEXT_TTL_SECS = 300
+URL_TEXT_CACHE_SIZE = 1024
+
+# url -> (extraction task, expiry timestamp); concurrent requests for one URL share the task.
+# Expired entries are replaced when next looked up, or evicted as least recently used.
+_url_text_cache: MemoryStore[Tuple[asyncio.Task, float]] = MemoryStore(URL_TEXT_CACHE_SIZE)
+
+
+async def _cached_drive_text(url: str) -> str:
+  """Extract a Google Drive document, reusing recent and in-flight extractions of the same URL.
+
+  Preview-then-export flows submit the same URLs twice in quick succession; the second pass is
+  served from the cache. Failed extractions are not cached.
+  """
+  now = time.monotonic()
+  entry = _url_text_cache.get(url)
+  if entry is None or entry[1] < now:
+    task = asyncio.ensure_future(extract_text_from_google_drive(url))
+    entry = _url_text_cache[url] = (task, now + URL_TEXT_TTL_SECS)
+
+  task = entry[0]
+  try:
+    # shield() so one cancelled request does not cancel the fetch for the others sharing it
+    return await (task if task.done() else asyncio.shield(task))
+  except Exception:
+    if _url_text_cache.get(url) is entry:
+      del _url_text_cache[url]
+    raise
+
+
+def _parse_json_list(value: Optional[str], field_name: str) -> List[str]:
+  """Parse a form field holding a JSON array of strings.
+
+  Raises:
+    HTTPException: 400 if the field is not a JSON array of strings.
+  """
+  if not value:
+    return []
+  try:
+    items = json.loads(value)
+  except json.JSONDecodeError as e:
+    raise HTTPException(
+      status_code=status.HTTP_400_BAD_REQUEST, detail=f'{field_name} is not valid JSON: {e}'
+    )
+  if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+    raise HTTPException(
+      status_code=status.HTTP_400_BAD_REQUEST,
+      detail=f'{field_name} must be a JSON array of strings',
+    )
+  return items
+
+
+async def _analyze_inputs(
+  inputs: List[tuple],
+  schema,
+  extract_customer_info: bool,
+  max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> List[BatchItemResult]:
+  """Extract the text of every batch input, then analyze the texts as one engine batch.
+
+  Both stages run at most max_concurrency items at a time.
+
+  Args:
+    inputs: (input_type, filename, source) tuples, where source is an UploadFile for FILE
+      inputs, a Google Drive URL for URL inputs and the text itself for TEXT inputs.
+    schema: Schema template to extract.
+    extract_customer_info: Whether to extract customer name and meeting date.
+    max_concurrency: Maximum number of items in flight at once in each stage.
+
+  Returns:
+    One BatchItemResult per input, in input order; failures carry the error message.
+  """
+  if not inputs:
+    raise HTTPException(
+      status_code=status.HTTP_400_BAD_REQUEST,
+      detail='No inputs provided. Add at least one file, text or URL.',
+    )
+
+  semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+  async def extract_one(input_type, source):
+    async with semaphore:
+      if input_type == BatchInputType.FILE:
+        return await extract_text_from_file(source)
+      elif input_type == BatchInputType.URL:
+        return await _cached_drive_text(source)
+      return source
+
+  # Extract every document first, then hand the texts to the engine as one batch
+  outcomes = await asyncio.gather(
+    *(extract_one(input_type, source) for input_type, _, source in inputs), return_exceptions=True
+  )
+  extracted = [idx for idx, outcome in enumerate(outcomes) if isinstance(outcome, str)]
+  analyses = await ai_engine.analyze_text_batch(
+    [outcomes[idx] for idx in extracted],
+    schema,
+    extract_customer_info=extract_customer_info,
+    fast_mode=False,  # Always use LLM, no fast mode
+    max_concurrency=max_concurrency,
+  )
+  for idx, analysis_result in zip(extracted, analyses):
+    outcomes[idx] = analysis_result
+
+  results = []
+  for idx, ((input_type, filename, _), outcome) in enumerate(zip(inputs, outcomes)):
+    if isinstance(outcome, Exception):
+      results.append(BatchItemResult.from_error(idx, input_type, filename, outcome))
+    elif isinstance(outcome, BaseException):
+      raise outcome
+    else:
+      results.append(BatchItemResult.from_analysis(idx, input_type, filename, outcome))
+  return results
+
+
 @router.post('/analyze-files')
 async def batch_analyze_files(
   files: List[UploadFile] = File(...),
   schema_template_id: str = Form(...),
   extract_customer_info: bool = Form(True),
   export_format: str = Form('xlsx'),
-  selected_columns: Optional[str] = Form(None)  # JSON array of selected column names
+  selected_columns: Optional[str] = Form(None),  # JSON array of selected column names
+  max_concurrency: int = Form(DEFAULT_MAX_CONCURRENCY),
 ):
   """Analyze multiple files and export results as spreadsheet."""
   # Get the schema template
-  if schema_template_id not in _schemas:
-    raise HTTPException(
-      status_code=status.HTTP_404_NOT_FOUND,
-      detail=f"Schema template '{schema_template_id}' not found",
-    )
-  
-  schema = _schemas[schema_template_id]
+  schema = get_schema_or_404(schema_template_id)
   start_time = datetime.now()
-  results = []
-  
-  # Process each file
-  for idx, file in enumerate(files):
-    try:
-      # Extract text from file
-      text_content = await extract_text_from_file(file)
-      
-      # Analyze the text
-      analysis_result = await ai_engine.analyze_text(
-        text=text_content,
-        schema=schema,
-        extract_customer_info=extract_customer_info,
-        fast_mode=False,  # Always use LLM, no fast mode
-      )
-      
-      # Convert to batch item result
-      item_result = BatchItemResult(
-        index=idx,
-        input_type=BatchInputType.FILE,
-        filename=file.filename,
-        customer_name=analysis_result.customer_name,
-        meeting_date=analysis_result.meeting_date,
-        categories={
-          name: {
-            'values': cat.values,
-            'confidence': cat.confidence,
-            'evidence': cat.evidence_text,
-          }
-          for name, cat in analysis_result.categories.items()
-        },
-        processing_time_ms=analysis_result.processing_time_ms,
-        word_count=analysis_result.word_count,
-      )
-      results.append(item_result)
-      
-    except Exception as e:
-      # Add error result
-      results.append(
-        BatchItemResult(
-          index=idx,
-          input_type=BatchInputType.FILE,
-          filename=file.filename,
-          processing_time_ms=0,
-          word_count=0,
-          error=str(e),
-        )
-      )
+
+  # Process all files concurrently
+  inputs = [(BatchInputType.FILE, file.filename, file) for file in files]
+  results = await _analyze_inputs(inputs, schema, extract_customer_info, max_concurrency)
   
   # Create spreadsheet
-  spreadsheet_data, filename = create_batch_spreadsheet(results, schema, export_format, selected_columns)
+  spreadsheet_data, filename = await _export_spreadsheet(
+    results, schema, export_format, selected_columns
+  )
   
   # Return file for download
-  media_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' if export_format == 'xlsx' else 'text/csv'
+  media_type = EXPORT_MEDIA_TYPES.get(export_format, EXPORT_MEDIA_TYPES['csv'])
   
   return StreamingResponse(
     BytesIO(spreadsheet_data),
@@ -148,124 +286,33 @@ async def batch_analyze_mixed(
   urls: Optional[str] = Form(None),   # JSON array of URLs
   extract_customer_info: bool = Form(True),
   export_format: str = Form('xlsx'),
-  selected_columns: Optional[str] = Form(None)  # JSON array of selected column names
+  selected_columns: Optional[str] = Form(None),  # JSON array of selected column names
+  max_concurrency: int = Form(DEFAULT_MAX_CONCURRENCY),
 ):
   """Analyze multiple texts and URLs, export results as spreadsheet."""
   # Get the schema template
-  if schema_template_id not in _schemas:
-    raise HTTPException(
-      status_code=status.HTTP_404_NOT_FOUND,
-      detail=f"Schema template '{schema_template_id}' not found",
-    )
-  
-  schema = _schemas[schema_template_id]
+  schema = get_schema_or_404(schema_template_id)
   start_time = datetime.now()
-  results = []
-  idx = 0
   
   # Parse JSON inputs
-  import json
-  text_list = json.loads(texts) if texts else []
-  url_list = json.loads(urls) if urls else []
-  
-  # Process texts
-  for text_content in text_list:
-    try:
-      # Analyze the text
-      analysis_result = await ai_engine.analyze_text(
-        text=text_content,
-        schema=schema,
-        extract_customer_info=extract_customer_info,
-        fast_mode=False,  # Always use LLM, no fast mode
-      )
-      
-      # Convert to batch item result
-      item_result = BatchItemResult(
-        index=idx,
-        input_type=BatchInputType.TEXT,
-        filename=f"Text {idx + 1}",
-        customer_name=analysis_result.customer_name,
-        meeting_date=analysis_result.meeting_date,
-        categories={
-          name: {
-            'values': cat.values,
-            'confidence': cat.confidence,
-            'evidence': cat.evidence_text,
-          }
-          for name, cat in analysis_result.categories.items()
-        },
-        processing_time_ms=analysis_result.processing_time_ms,
-        word_count=analysis_result.word_count,
-      )
-      results.append(item_result)
-      
-    except Exception as e:
-      # Add error result
-      results.append(
-        BatchItemResult(
-          index=idx,
-          input_type=BatchInputType.TEXT,
-          filename=f"Text {idx + 1}",
-          processing_time_ms=0,
-          word_count=0,
-          error=str(e),
-        )
-      )
-    idx += 1
+  text_list = _parse_json_list(texts, 'texts')
+  url_list = _parse_json_list(urls, 'urls')
   
-  # Process URLs
-  for url in url_list:
-    try:
-      # Extract text from URL
-      text_content = await extract_text_from_google_drive(url)
-      
-      # Analyze the text
-      analysis_result = await ai_engine.analyze_text(
-        text=text_content,
-        schema=schema,
-        extract_customer_info=extract_customer_info,
-        fast_mode=False,  # Always use LLM, no fast mode
-      )
-      
-      # Convert to batch item result
-      item_result = BatchItemResult(
-        index=idx,
-        input_type=BatchInputType.URL,
-        filename=url,
-        customer_name=analysis_result.customer_name,
-        meeting_date=analysis_result.meeting_date,
-        categories={
-          name: {
-            'values': cat.values,
-            'confidence': cat.confidence,
-            'evidence': cat.evidence_text,
-          }
-          for name, cat in analysis_result.categories.items()
-        },
-        processing_time_ms=analysis_result.processing_time_ms,
-        word_count=analysis_result.word_count,
-      )
-      results.append(item_result)
-      
-    except Exception as e:
-      # Add error result
-      results.append(
-        BatchItemResult(
-          index=idx,
-          input_type=BatchInputType.URL,
-          filename=url,
-          processing_time_ms=0,
-          word_count=0,
-          error=str(e),
-        )
-      )
-    idx += 1
+  # Process texts and URLs concurrently
+  inputs = [
+    (BatchInputType.TEXT, f"Text {idx + 1}", text_content)
+    for idx, text_content in enumerate(text_list)
+  ]
+  inputs += [(BatchInputType.URL, url, url) for url in url_list]
+  results = await _analyze_inputs(inputs, schema, extract_customer_info, max_concurrency)
   
   # Create spreadsheet
-  spreadsheet_data, filename = create_batch_spreadsheet(results, schema, export_format, selected_columns)
+  spreadsheet_data, filename = await _export_spreadsheet(
+    results, schema, export_format, selected_columns
+  )
   
   # Return file for download
-  media_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' if export_format == 'xlsx' else 'text/csv'
+  media_type = EXPORT_MEDIA_TYPES.get(export_format, EXPORT_MEDIA_TYPES['csv'])
   
   return StreamingResponse(
     BytesIO(spreadsheet_data),
@@ -276,7 +323,7 @@ async def batch_analyze_mixed(
   )
 
 
-@router.post('/analyze-all-with-preview')
+@router.post('/analyze-all-with-preview', response_class=OrjsonResponse)
 async def batch_analyze_all_with_preview(
   files: List[UploadFile] = File(default=[]),
   schema_template_id: str = Form(...),
@@ -285,173 +332,31 @@ async def batch_analyze_all_with_preview(
   extract_customer_info: bool = Form(True),
   export_format: str = Form('xlsx'),
   selected_columns: Optional[str] = Form(None),  # JSON array of selected column names
-  preview_only: bool = Form(False)
+  preview_only: bool = Form(False),
+  max_concurrency: int = Form(DEFAULT_MAX_CONCURRENCY),
 ):
   """Unified endpoint to analyze files, texts, and URLs with preview."""
   # Get the schema template
-  if schema_template_id not in _schemas:
-    raise HTTPException(
-      status_code=status.HTTP_404_NOT_FOUND,
-      detail=f"Schema template '{schema_template_id}' not found",
-    )
-  
-  schema = _schemas[schema_template_id]
+  schema = get_schema_or_404(schema_template_id)
   start_time = datetime.now()
-  results = []
-  idx = 0
   
   # Parse JSON inputs
-  import json
-  text_list = json.loads(texts) if texts else []
-  url_list = json.loads(urls) if urls else []
-  
-  # Process files
-  for file in files:
-    try:
-      # Extract text from file
-      text = await extract_text_from_file(file)
-      
-      # Analyze the text
-      analysis_result = await ai_engine.analyze_text(
-        text=text,
-        schema=schema,
-        extract_customer_info=extract_customer_info,
-        fast_mode=False,
-      )
-      
-      # Convert to batch item result
-      item_result = BatchItemResult(
-        index=idx,
-        input_type=BatchInputType.FILE,
-        filename=file.filename,
-        customer_name=analysis_result.customer_name,
-        meeting_date=analysis_result.meeting_date,
-        categories={
-          name: {
-            'values': cat.values,
-            'confidence': cat.confidence,
-            'evidence': cat.evidence_text,
-          }
-          for name, cat in analysis_result.categories.items()
-        },
-        processing_time_ms=analysis_result.processing_time_ms,
-        word_count=analysis_result.word_count,
-      )
-      results.append(item_result)
-      
-    except Exception as e:
-      # Add error result
-      results.append(
-        BatchItemResult(
-          index=idx,
-          input_type=BatchInputType.FILE,
-          filename=file.filename,
-          processing_time_ms=0,
-          word_count=0,
-          error=str(e),
-        )
-      )
-    idx += 1
-  
-  # Process texts
-  for text_content in text_list:
-    try:
-      # Analyze the text
-      analysis_result = await ai_engine.analyze_text(
-        text=text_content,
-        schema=schema,
-        extract_customer_info=extract_customer_info,
-        fast_mode=False,
-      )
-      
-      # Convert to batch item result
-      item_result = BatchItemResult(
-        index=idx,
-        input_type=BatchInputType.TEXT,
-        filename=f'Text Input {idx + 1}',
-        customer_name=analysis_result.customer_name,
-        meeting_date=analysis_result.meeting_date,
-        categories={
-          name: {
-            'values': cat.values,
-            'confidence': cat.confidence,
-            'evidence': cat.evidence_text,
-          }
-          for name, cat in analysis_result.categories.items()
-        },
-        processing_time_ms=analysis_result.processing_time_ms,
-        word_count=analysis_result.word_count,
-      )
-      results.append(item_result)
-      
-    except Exception as e:
-      # Add error result
-      results.append(
-        BatchItemResult(
-          index=idx,
-          input_type=BatchInputType.TEXT,
-          filename=f'Text Input {idx + 1}',
-          processing_time_ms=0,
-          word_count=0,
-          error=str(e),
-        )
-      )
-    idx += 1
-  
-  # Process URLs
-  for url in url_list:
-    try:
-      # Extract text from URL
-      text = await extract_text_from_google_drive(url)
-      
-      # Analyze the text
-      analysis_result = await ai_engine.analyze_text(
-        text=text,
-        schema=schema,
-        extract_customer_info=extract_customer_info,
-        fast_mode=False,
-      )
-      
-      # Convert to batch item result
-      item_result = BatchItemResult(
-        index=idx,
-        input_type=BatchInputType.URL,
-        filename=url,
-        customer_name=analysis_result.customer_name,
-        meeting_date=analysis_result.meeting_date,
-        categories={
-          name: {
-            'values': cat.values,
-            'confidence': cat.confidence,
-            'evidence': cat.evidence_text,
-          }
-          for name, cat in analysis_result.categories.items()
-        },
-        processing_time_ms=analysis_result.processing_time_ms,
-        word_count=analysis_result.word_count,
-      )
-      results.append(item_result)
-      
-    except Exception as e:
-      # Add error result
-      results.append(
-        BatchItemResult(
-          index=idx,
-          input_type=BatchInputType.URL,
-          filename=url,
-          processing_time_ms=0,
-          word_count=0,
-          error=str(e),
-        )
-      )
-    idx += 1
+  text_list = _parse_json_list(texts, 'texts')
+  url_list = _parse_json_list(urls, 'urls')
+  
+  # Process files, texts and URLs concurrently; indexes run across all three in that order
+  inputs = [(BatchInputType.FILE, file.filename, file) for file in files]
+  inputs += [
+    (BatchInputType.TEXT, f'Text Input {len(inputs) + i + 1}', text_content)
+    for i, text_content in enumerate(text_list)
+  ]
+  inputs += [(BatchInputType.URL, url, url) for url in url_list]
+  results = await _analyze_inputs(inputs, schema, extract_customer_info, max_concurrency)
   
   # Create spreadsheet
-  spreadsheet_data, filename = create_batch_spreadsheet(results, schema, export_format, selected_columns)
-  
-  # Convert to base64 for JSON response
-  import base64
-  spreadsheet_base64 = base64.b64encode(spreadsheet_data).decode('utf-8')
+  spreadsheet_data, filename = await _export_spreadsheet(
+    results, schema, export_format, selected_columns
+  )
   
   # Create table data for preview
   table_data = []
@@ -465,176 +370,66 @@ async def batch_analyze_all_with_preview(
       'word_count': result.word_count,
       'processing_time_ms': result.processing_time_ms,
       'error': result.error or '',
-      'categories': result.categories or {}
+      'categories': categories_to_dict(result.categories),
     }
     table_data.append(row)
   
-  return {
-    'filename': filename,
-    'spreadsheet_base64': spreadsheet_base64,
+  return OrjsonResponse({
+    **_download_info(spreadsheet_data, filename, export_format),
     'table_data': table_data,
     'total_processed': len(results),
     'processing_time_ms': int((datetime.now() - start_time).total_seconds() * 1000)
-  }
+  })
+
+
+def _schema_columns(schema) -> SchemaColumns:
+  """Column names for a schema, cached when the schema is a stored template."""
+  if _schemas.get(schema.template_id) is schema:
+    return get_schema_columns(schema.template_id)
+  return build_schema_columns(schema)
 
 
 def create_batch_spreadsheet(results: List[BatchItemResult], schema, export_format: str, selected_columns: Optional[str] = None) -> tuple[bytes, str]:
   """Create a spreadsheet from batch analysis results."""
-  # Parse selected columns if provided
-  import json
-  selected_cols_list = []
-  if selected_columns:
-    try:
-      selected_cols_list = json.loads(selected_columns)
-    except json.JSONDecodeError:
-      selected_cols_list = []
-  
-  # Define all possible columns with their display names
-  all_columns = [
-    'Index',
-    'Input Type', 
-    'Source',
-    'Customer Name',
-    'Meeting Date',
-    'Word Count',
-    'Processing Time (ms)',
-    'Error'
-  ]
-  
-  # Add category columns
-  category_columns = [category.name for category in schema.categories]
-  all_columns.extend(category_columns)
-  
-  # If no columns selected, use all columns
-  if not selected_cols_list:
-    columns_to_include = all_columns
-  else:
-    columns_to_include = [col for col in all_columns if col in selected_cols_list]
-  
-  # Prepare data for DataFrame
-  rows = []
-  
-  for result in results:
-    # Create full row with all possible columns
-    full_row = {
-      'Index': result.index + 1,
-      'Input Type': result.input_type,
-      'Source': result.filename or '',
-      'Customer Name': result.customer_name or '',
-      'Meeting Date': result.meeting_date or '',
-      'Word Count': result.word_count,
-      'Processing Time (ms)': result.processing_time_ms,
-      'Error': result.error or '',
-    }
-    
-    # Add category columns with proper formatting
-    for category in schema.categories:
-      # Format category name: convert to title case and ensure proper spacing
-      formatted_name = category.name
-      if result.categories and category.name in result.categories:
-        cat_data = result.categories[category.name]
-        full_row[formatted_name] = ', '.join(cat_data.get('values', []))
-      else:
-        full_row[formatted_name] = ''
-    
-    # Filter row to only include selected columns
-    filtered_row = {col: full_row.get(col, '') for col in columns_to_include if col in full_row}
-    rows.append(filtered_row)
-  
-  # Create DataFrame
-  df = pd.DataFrame(rows)
-  
-  # Export to desired format
-  output = BytesIO()
-  timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-  
-  if export_format == 'xlsx':
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-      df.to_excel(writer, index=False, sheet_name='Analysis Results')
-      
-      # Auto-adjust column widths
-      worksheet = writer.sheets['Analysis Results']
-      for column in df:
-        column_length = max(df[column].astype(str).map(len).max(), len(column))
-        col_idx = df.columns.get_loc(column)
-        if col_idx < 26:  # Excel columns A-Z
-          worksheet.column_dimensions[chr(65 + col_idx)].width = min(column_length + 2, 50)
-    
-    filename = f'batch_insights_{timestamp}.xlsx'
-  else:  # CSV
-    df.to_csv(output, index=False)
-    filename = f'batch_insights_{timestamp}.csv'
-  
-  output.seek(0)
-  return output.read(), filename
+  category_columns = list(_schema_columns(schema).category_columns)
+  return write_batch_spreadsheet(results, category_columns, export_format, selected_columns)
+
 
+async def _export_spreadsheet(
+  results: List[BatchItemResult], schema, export_format: str, selected_columns: Optional[str] = None
+) -> tuple[bytes, str]:
+  """Create the batch spreadsheet off the event loop.
 
-@router.post('/analyze-files-with-preview')
+  Large batches are written in a worker process so that serializing them does not hold the GIL
+  against other requests; smaller ones are not worth the cost of pickling the results across.
+  """
+  if len(results) < PROCESS_EXPORT_MIN_ROWS:
+    return await run_blocking(create_batch_spreadsheet, results, schema, export_format, selected_columns)
+  category_columns = list(_schema_columns(schema).category_columns)
+  return await run_in_process(
+    write_batch_spreadsheet, results, category_columns, export_format, selected_columns
+  )
+
+
+@router.post('/analyze-files-with-preview', response_class=OrjsonResponse)
 async def batch_analyze_files_with_preview(
   files: List[UploadFile] = File(...),
   schema_template_id: str = Form(...),
   extract_customer_info: bool = Form(True),
-  export_format: str = Form('xlsx')
+  export_format: str = Form('xlsx'),
+  max_concurrency: int = Form(DEFAULT_MAX_CONCURRENCY),
 ):
   """Analyze multiple files and return both preview data and download link."""
   # Get the schema template
-  if schema_template_id not in _schemas:
-    raise HTTPException(
-      status_code=status.HTTP_404_NOT_FOUND,
-      detail=f"Schema template '{schema_template_id}' not found",
-    )
-  
-  schema = _schemas[schema_template_id]
-  results = []
+  schema = get_schema_or_404(schema_template_id)
   
-  # Process each file
-  for idx, file in enumerate(files):
-    try:
-      # Extract text from file
-      text_content = await extract_text_from_file(file)
-      
-      # Analyze the text
-      analysis_result = await ai_engine.analyze_text(
-        text=text_content,
-        schema=schema,
-        extract_customer_info=extract_customer_info,
-        fast_mode=False,  # Always use LLM, no fast mode
-      )
-      
-      # Convert to batch item result
-      item_result = BatchItemResult(
-        index=idx,
-        input_type=BatchInputType.FILE,
-        filename=file.filename,
-        customer_name=analysis_result.customer_name,
-        meeting_date=analysis_result.meeting_date,
-        categories={
-          name: {
-            'values': cat.values,
-            'confidence': cat.confidence,
-            'evidence': cat.evidence_text,
-          }
-          for name, cat in analysis_result.categories.items()
-        },
-        processing_time_ms=analysis_result.processing_time_ms,
-        word_count=analysis_result.word_count,
-      )
-      results.append(item_result)
-      
-    except Exception as e:
-      # Add error result
-      results.append(
-        BatchItemResult(
-          index=idx,
-          input_type=BatchInputType.FILE,
-          filename=file.filename,
-          processing_time_ms=0,
-          word_count=0,
-          error=str(e),
-        )
-      )
+  # Process all files concurrently
+  inputs = [(BatchInputType.FILE, file.filename, file) for file in files]
+  results = await _analyze_inputs(inputs, schema, extract_customer_info, max_concurrency)
   
   # Create table data for preview
+  schema_columns = _schema_columns(schema)
+  preview_keys = schema_columns.preview_keys
   table_data = []
   for result in results:
     row = {
@@ -644,12 +439,10 @@ async def batch_analyze_files_with_preview(
     }
     
     # Add category columns
-    for category in schema.categories:
-      if result.categories and category.name in result.categories:
-        cat_data = result.categories[category.name]
-        row[category.name.lower().replace(' ', '_')] = ', '.join(cat_data.get('values', []))
-      else:
-        row[category.name.lower().replace(' ', '_')] = ''
+    categories = result.categories
+    for name, key in preview_keys:
+      category = categories.get(name)
+      row[key] = ', '.join(category.values) if category else ''
     
     if result.error:
       row['error'] = result.error
@@ -657,131 +450,44 @@ async def batch_analyze_files_with_preview(
     table_data.append(row)
   
   # Create spreadsheet
-  spreadsheet_data, filename = create_batch_spreadsheet(results, schema, export_format, selected_columns)
+  spreadsheet_data, filename = await _export_spreadsheet(results, schema, export_format)
   
   # Return preview data and download info
-  import base64
-  
-  return {
-    'filename': filename,
+  return OrjsonResponse({
+    **_download_info(spreadsheet_data, filename, export_format),
     'table_data': table_data,
-    'spreadsheet_base64': base64.b64encode(spreadsheet_data).decode('utf-8'),
-    'column_headers': ['Source', 'Customer Name', 'Meeting Date'] + [cat.name for cat in schema.categories]
-  }
+    'column_headers': schema_columns.preview_headers
+  })
 
 
-@router.post('/analyze-with-preview')
+@router.post('/analyze-with-preview', response_class=OrjsonResponse)
 async def batch_analyze_with_preview(
   schema_template_id: str = Form(...),
   texts: Optional[str] = Form(None),  # JSON array of texts
   urls: Optional[str] = Form(None),   # JSON array of URLs
   extract_customer_info: bool = Form(True),
-  export_format: str = Form('xlsx')
+  export_format: str = Form('xlsx'),
+  max_concurrency: int = Form(DEFAULT_MAX_CONCURRENCY),
 ):
   """Analyze multiple documents and return both preview data and download link."""
   # Get the schema template
-  if schema_template_id not in _schemas:
-    raise HTTPException(
-      status_code=status.HTTP_404_NOT_FOUND,
-      detail=f"Schema template '{schema_template_id}' not found",
-    )
-  
-  schema = _schemas[schema_template_id]
-  results = []
-  idx = 0
+  schema = get_schema_or_404(schema_template_id)
   
   # Parse JSON inputs
-  import json
-  text_list = json.loads(texts) if texts else []
-  url_list = json.loads(urls) if urls else []
-  
-  # Process texts
-  for text_content in text_list:
-    try:
-      analysis_result = await ai_engine.analyze_text(
-        text=text_content,
-        schema=schema,
-        extract_customer_info=extract_customer_info,
-        fast_mode=False,  # Always use LLM, no fast mode
-      )
-      
-      item_result = BatchItemResult(
-        index=idx,
-        input_type=BatchInputType.TEXT,
-        filename=f"Text {idx + 1}",
-        customer_name=analysis_result.customer_name,
-        meeting_date=analysis_result.meeting_date,
-        categories={
-          name: {
-            'values': cat.values,
-            'confidence': cat.confidence,
-            'evidence': cat.evidence_text,
-          }
-          for name, cat in analysis_result.categories.items()
-        },
-        processing_time_ms=analysis_result.processing_time_ms,
-        word_count=analysis_result.word_count,
-      )
-      results.append(item_result)
-      
-    except Exception as e:
-      results.append(
-        BatchItemResult(
-          index=idx,
-          input_type=BatchInputType.TEXT,
-          filename=f"Text {idx + 1}",
-          processing_time_ms=0,
-          word_count=0,
-          error=str(e),
-        )
-      )
-    idx += 1
+  text_list = _parse_json_list(texts, 'texts')
+  url_list = _parse_json_list(urls, 'urls')
   
-  # Process URLs
-  for url in url_list:
-    try:
-      text_content = await extract_text_from_google_drive(url)
-      
-      analysis_result = await ai_engine.analyze_text(
-        text=text_content,
-        schema=schema,
-        extract_customer_info=extract_customer_info,
-        fast_mode=False,  # Always use LLM, no fast mode
-      )
-      
-      item_result = BatchItemResult(
-        index=idx,
-        input_type=BatchInputType.URL,
-        filename=url,
-        customer_name=analysis_result.customer_name,
-        meeting_date=analysis_result.meeting_date,
-        categories={
-          name: {
-            'values': cat.values,
-            'confidence': cat.confidence,
-            'evidence': cat.evidence_text,
-          }
-          for name, cat in analysis_result.categories.items()
-        },
-        processing_time_ms=analysis_result.processing_time_ms,
-        word_count=analysis_result.word_count,
-      )
-      results.append(item_result)
-      
-    except Exception as e:
-      results.append(
-        BatchItemResult(
-          index=idx,
-          input_type=BatchInputType.URL,
-          filename=url,
-          processing_time_ms=0,
-          word_count=0,
-          error=str(e),
-        )
-      )
-    idx += 1
+  # Process texts and URLs concurrently
+  inputs = [
+    (BatchInputType.TEXT, f"Text {idx + 1}", text_content)
+    for idx, text_content in enumerate(text_list)
+  ]
+  inputs += [(BatchInputType.URL, url, url) for url in url_list]
+  results = await _analyze_inputs(inputs, schema, extract_customer_info, max_concurrency)
   
   # Create table data for preview
+  schema_columns = _schema_columns(schema)
+  preview_keys = schema_columns.preview_keys
   table_data = []
   for result in results:
     row = {
@@ -791,12 +497,10 @@ async def batch_analyze_with_preview(
     }
     
     # Add category columns
-    for category in schema.categories:
-      if result.categories and category.name in result.categories:
-        cat_data = result.categories[category.name]
-        row[category.name.lower().replace(' ', '_')] = ', '.join(cat_data.get('values', []))
-      else:
-        row[category.name.lower().replace(' ', '_')] = ''
+    categories = result.categories
+    for name, key in preview_keys:
+      category = categories.get(name)
+      row[key] = ', '.join(category.values) if category else ''
     
     if result.error:
       row['error'] = result.error
@@ -804,250 +508,11 @@ async def batch_analyze_with_preview(
     table_data.append(row)
   
   # Create spreadsheet
-  spreadsheet_data, filename = create_batch_spreadsheet(results, schema, export_format, selected_columns)
-  
-  # Store in temporary storage with UUID
-  import uuid
-  import base64
-  download_id = str(uuid.uuid4())
+  spreadsheet_data, filename = await _export_spreadsheet(results, schema, export_format)
   
   # Return preview data and download info
-  return {
-    'download_id': download_id,
-    'filename': filename,
-    'table_data': table_data,
-    'spreadsheet_base64': base64.b64encode(spreadsheet_data).decode('utf-8'),
-    'column_headers': ['Source', 'Customer Name', 'Meeting Date'] + [cat.name for cat in schema.categories]
-  }
-
-
-@router.post('/analyze-all-with-preview')
-async def batch_analyze_all_with_preview(
-  files: List[UploadFile] = File(default=[]),
-  texts: Optional[str] = Form(None),  # JSON array of texts
-  urls: Optional[str] = Form(None),   # JSON array of URLs
-  schema_template_id: str = Form(...),
-  extract_customer_info: bool = Form(True),
-  export_format: str = Form('xlsx')
-):
-  """Analyze all types of inputs (files, texts, URLs) and return both preview data and download link."""
-  # Get the schema template
-  if schema_template_id not in _schemas:
-    raise HTTPException(
-      status_code=status.HTTP_404_NOT_FOUND,
-      detail=f"Schema template '{schema_template_id}' not found",
-    )
-  
-  schema = _schemas[schema_template_id]
-  results = []
-  idx = 0
-  
-  # Parse JSON inputs
-  import json
-  text_list = json.loads(texts) if texts else []
-  url_list = json.loads(urls) if urls else []
-  
-  # Define batch size for concurrent processing
-  # Reduced to 2 to avoid overwhelming LLM endpoints
-  batch_size = 2
-  
-  # Process files concurrently
-  async def process_file(file, idx):
-    try:
-      # Extract text from file
-      text_content = await extract_text_from_file(file)
-      
-      # Analyze the text
-      analysis_result = await ai_engine.analyze_text(
-        text=text_content,
-        schema=schema,
-        extract_customer_info=extract_customer_info,
-        fast_mode=False,  # Always use LLM, no fast mode
-      )
-      
-      # Convert to batch item result
-      return BatchItemResult(
-        index=idx,
-        input_type=BatchInputType.FILE,
-        filename=file.filename,
-        customer_name=analysis_result.customer_name,
-        meeting_date=analysis_result.meeting_date,
-        categories={
-          name: {
-            'values': cat.values,
-            'confidence': cat.confidence,
-            'evidence': cat.evidence_text,
-          }
-          for name, cat in analysis_result.categories.items()
-        },
-        processing_time_ms=analysis_result.processing_time_ms,
-        word_count=analysis_result.word_count,
-      )
-      
-    except Exception as e:
-      # Return error result
-      return BatchItemResult(
-        index=idx,
-        input_type=BatchInputType.FILE,
-        filename=file.filename,
-        processing_time_ms=0,
-        word_count=0,
-        error=str(e),
-      )
-  
-  # Process all files concurrently with limited concurrency
-  file_tasks = []
-  for i, file in enumerate(files):
-    file_tasks.append(process_file(file, idx + i))
-  
-  # Process in batches of 3 to avoid overwhelming the LLM
-  batch_size = 3
-  for i in range(0, len(file_tasks), batch_size):
-    batch = file_tasks[i:i + batch_size]
-    batch_results = await asyncio.gather(*batch)
-    results.extend(batch_results)
-  
-  idx += len(files)
-  
-  # Process texts concurrently
-  async def process_text(text_content, text_idx, base_idx):
-    try:
-      # Analyze the text
-      analysis_result = await ai_engine.analyze_text(
-        text=text_content,
-        schema=schema,
-        extract_customer_info=extract_customer_info,
-        fast_mode=False,  # Always use LLM, no fast mode
-      )
-      
-      # Convert to batch item result
-      return BatchItemResult(
-        index=base_idx,
-        input_type=BatchInputType.TEXT,
-        filename=f"Text {text_idx + 1}",
-        customer_name=analysis_result.customer_name,
-        meeting_date=analysis_result.meeting_date,
-        categories={
-          name: {
-            'values': cat.values,
-            'confidence': cat.confidence,
-            'evidence': cat.evidence_text,
-          }
-          for name, cat in analysis_result.categories.items()
-        },
-        processing_time_ms=analysis_result.processing_time_ms,
-        word_count=analysis_result.word_count,
-      )
-      
-    except Exception as e:
-      # Return error result
-      return BatchItemResult(
-        index=base_idx,
-        input_type=BatchInputType.TEXT,
-        filename=f"Text {text_idx + 1}",
-        processing_time_ms=0,
-        word_count=0,
-        error=str(e),
-      )
-  
-  # Process all texts concurrently
-  text_tasks = []
-  for i, text_content in enumerate(text_list):
-    text_tasks.append(process_text(text_content, i, idx + i))
-  
-  # Process in batches
-  for i in range(0, len(text_tasks), batch_size):
-    batch = text_tasks[i:i + batch_size]
-    batch_results = await asyncio.gather(*batch)
-    results.extend(batch_results)
-  
-  idx += len(text_list)
-  
-  # Process URLs concurrently
-  async def process_url(url, url_idx, base_idx):
-    try:
-      # Extract text from URL
-      text_content = await extract_text_from_google_drive(url)
-      
-      # Analyze the text
-      analysis_result = await ai_engine.analyze_text(
-        text=text_content,
-        schema=schema,
-        extract_customer_info=extract_customer_info,
-        fast_mode=False,  # Always use LLM, no fast mode
-      )
-      
-      # Convert to batch item result
-      return BatchItemResult(
-        index=base_idx,
-        input_type=BatchInputType.URL,
-        filename=url,
-        customer_name=analysis_result.customer_name,
-        meeting_date=analysis_result.meeting_date,
-        categories={
-          name: {
-            'values': cat.values,
-            'confidence': cat.confidence,
-            'evidence': cat.evidence_text,
-          }
-          for name, cat in analysis_result.categories.items()
-        },
-        processing_time_ms=analysis_result.processing_time_ms,
-        word_count=analysis_result.word_count,
-      )
-      
-    except Exception as e:
-      # Return error result
-      return BatchItemResult(
-        index=base_idx,
-        input_type=BatchInputType.URL,
-        filename=url,
-        processing_time_ms=0,
-        word_count=0,
-        error=str(e),
-      )
-  
-  # Process all URLs concurrently
-  url_tasks = []
-  for i, url in enumerate(url_list):
-    url_tasks.append(process_url(url, i, idx + i))
-  
-  # Process in batches
-  for i in range(0, len(url_tasks), batch_size):
-    batch = url_tasks[i:i + batch_size]
-    batch_results = await asyncio.gather(*batch)
-    results.extend(batch_results)
-  
-  idx += len(url_list)
-  
-  # Create spreadsheet
-  spreadsheet_data, filename = create_batch_spreadsheet(results, schema, export_format, selected_columns)
-  
-  # Also create table data for preview
-  table_data = []
-  column_headers = ['Source', 'Customer Name', 'Meeting Date'] + [cat.name for cat in schema.categories]
-  
-  for result in results:
-    row_data = {
-      'source': result.filename,
-      'customer_name': result.customer_name or '',
-      'meeting_date': result.meeting_date or '',
-    }
-    
-    # Add category values
-    for cat in schema.categories:
-      if result.categories and cat.name in result.categories:
-        values = result.categories[cat.name].get('values', [])
-        row_data[cat.name.lower().replace(' ', '_')] = ', '.join(values) if values else ''
-      else:
-        row_data[cat.name.lower().replace(' ', '_')] = ''
-    
-    table_data.append(row_data)
-  
-  # Return both preview data and downloadable file
-  return {
-    'filename': filename,
+  return OrjsonResponse({
+    **_download_info(spreadsheet_data, filename, export_format),
     'table_data': table_data,
-    'spreadsheet_base64': base64.b64encode(spreadsheet_data).decode('utf-8'),
-    'column_headers': column_headers
-  }
\ No newline at end of file
+    'column_headers': schema_columns.preview_headers
+  })
@@ -1,22 +1,26 @@
 """API endpoints for insights extraction."""
 
+import asyncio
+import csv
 import io
-from typing import List, Optional
-from uuid import uuid4
+import re
+import tempfile
 from datetime import datetime
-import pandas as pd
-from io import BytesIO
+from functools import partial
+from pathlib import PurePath
+from typing import AsyncIterator, BinaryIO, Callable, Dict, Iterator, List, Optional
+from uuid import uuid4
 
 import docx
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile, status
 from fastapi.responses import StreamingResponse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+from starlette.background import BackgroundTask
 
-from server.models.document_models import (
-  AnalysisSession,
-  ProcessingRequest,
-  QuickAnalysisResult,
-  TextAnalysisRequest,
-)
+from server.config import get_settings
 from server.models.batch_models import (
   BatchAnalysisRequest,
   BatchAnalysisResult,
@@ -24,26 +28,54 @@ from server.models.batch_models import (
   BatchInputType,
   BatchItemResult,
 )
-from server.routers.schema import _schemas
+from server.models.document_models import (
+  AnalysisSession,
+  ProcessingRequest,
+  QuickAnalysisResult,
+  TextAnalysisRequest,
+)
+from server.routers.schema import _schemas, get_schema_or_404
 from server.services.ai_engine import ai_engine
+from server.services.databricks_client import get_client
+from server.utils.blocking import run_blocking
+from server.utils.memory_store import MemoryStore
 
 router = APIRouter(prefix='/insights', tags=['Insights Extraction'])
 
+# Maximum number of batch inputs analyzed at once
+BATCH_MAX_CONCURRENCY = 8
+
+# Spreadsheets up to this size are spooled in memory before streaming; larger ones spill to disk
+SPREADSHEET_SPOOL_MAX_BYTES = 16 << 20
+SPREADSHEET_CHUNK_BYTES = 64 << 10
+
+# File ID in a Google Drive share URL (https://drive.google.com/file/d/FILE_ID/view)
+DRIVE_FILE_ID_RE = re.compile(r'/d/([a-zA-Z0-9_-]+)')
+
+# Leading spreadsheet columns; each schema category then adds Values/Confidence/Evidence columns
+SPREADSHEET_BASE_COLUMNS = (
+  'Index',
+  'Input Type',
+  'Filename',
+  'Customer Name',
+  'Meeting Date',
+  'Word Count',
+  'Processing Time (ms)',
+  'Error',
+)
+
+# Sessions kept in memory before the least recently used ones are dropped
+SESSION_STORE_SIZE = 10_000
+
 # In-memory storage for development (will be replaced with Delta Tables)
-_sessions: dict[str, AnalysisSession] = {}
+_sessions: MemoryStore[AnalysisSession] = MemoryStore(SESSION_STORE_SIZE)
 
 
 @router.post('/analyze-text', response_model=QuickAnalysisResult)
 async def analyze_text(request: TextAnalysisRequest) -> QuickAnalysisResult:
   """Quickly analyze text content with a given schema."""
   # Get the schema template
-  if request.schema_template_id not in _schemas:
-    raise HTTPException(
-      status_code=status.HTTP_404_NOT_FOUND,
-      detail=f"Schema template '{request.schema_template_id}' not found",
-    )
-
-  schema = _schemas[request.schema_template_id]
+  schema = get_schema_or_404(request.schema_template_id)
 
   # Analyze the text
   try:
@@ -76,13 +108,7 @@ async def analyze_document(
     )
 
   # Get the schema template
-  if schema_template_id not in _schemas:
-    raise HTTPException(
-      status_code=status.HTTP_404_NOT_FOUND,
-      detail=f"Schema template '{schema_template_id}' not found",
-    )
-
-  schema = _schemas[schema_template_id]
+  schema = get_schema_or_404(schema_template_id)
 
   # Extract text content based on source
   try:
@@ -167,9 +193,8 @@ async def start_analysis_session(session_id: str) -> dict:
       status_code=status.HTTP_400_BAD_REQUEST, detail=f'Session is already {session.status}'
     )
 
-  # Update session status
+  # Update session status; the stored session is updated in place
   session.status = 'running'
-  _sessions[session_id] = session
 
   # TODO: Start background processing of documents
   # For now, just return success
@@ -194,20 +219,43 @@ async def delete_analysis_session(session_id: str) -> dict:
   return {'message': f"Analysis session '{session.session_name}' deleted successfully"}
 
 
+def _read_txt_upload(upload: BinaryIO) -> str:
+  """Decode a .txt upload straight from its file object, without an intermediate bytes copy."""
+  upload.seek(0)
+  reader = io.TextIOWrapper(upload, encoding='utf-8', errors='ignore')
+  try:
+    return reader.read()
+  finally:
+    reader.detach()  # leave the upload open; the request closes it
+
+
+def _read_docx_upload(upload: BinaryIO) -> str:
+  """Join the paragraphs of a .docx upload, parsed directly from its file object."""
+  upload.seek(0)
+  doc = docx.Document(upload)
+  return '\n'.join([paragraph.text for paragraph in doc.paragraphs])
+
+
+# Upload readers by lower-cased file extension
+UPLOAD_READERS: dict[str, Callable[[BinaryIO], str]] = {
+  '.txt': _read_txt_upload,
+  '.docx': _read_docx_upload,
+}
+
+
 async def extract_text_from_file(file: UploadFile) -> str:
-  """Extract text content from uploaded file."""
-  content = await file.read()
-
-  if file.filename.endswith('.txt'):
-    return content.decode('utf-8', errors='ignore')
-  elif file.filename.endswith('.docx'):
-    doc = docx.Document(io.BytesIO(content))
-    return '\n'.join([paragraph.text for paragraph in doc.paragraphs])
-  else:
+  """Extract text content from uploaded file.
+
+  Uploads arrive as spooled temporary files (in memory while small, on disk beyond that), so the
+  file is read in the I/O pool rather than copied into a bytes object first.
+  """
+  reader = UPLOAD_READERS.get(PurePath(file.filename or '').suffix.lower())
+  if reader is None:
     raise HTTPException(
       status_code=status.HTTP_400_BAD_REQUEST,
       detail='Unsupported file type. Please upload .txt or .docx files.',
     )
+  return await run_blocking(reader, file.file)
 
 
 async def extract_text_from_google_drive(google_drive_url: str) -> str:
@@ -219,9 +267,7 @@ async def extract_text_from_google_drive(google_drive_url: str) -> str:
   # 3. Extract text based on file type
 
   # Extract file ID from URL
-  import re
-
-  file_id_match = re.search(r'/d/([a-zA-Z0-9-_]+)', google_drive_url)
+  file_id_match = DRIVE_FILE_ID_RE.search(google_drive_url)
   if file_id_match:
     file_id = file_id_match.group(1)
     # Return placeholder text that indicates the feature is not implemented
@@ -244,23 +290,21 @@ async def extract_text_from_google_drive(google_drive_url: str) -> str:
 @router.get('/test-ai')
 async def test_ai_connection() -> dict:
   """Test the AI engine connection and capabilities."""
-  import os
-
-  from databricks.sdk import WorkspaceClient
-
   # Environment diagnostics
+  settings = get_settings()
   env_info = {
-    'databricks_host': os.getenv('DATABRICKS_HOST', 'Not set'),
-    'databricks_token_present': bool(os.getenv('DATABRICKS_TOKEN')),
-    'databricks_auth_type': os.getenv('DATABRICKS_AUTH_TYPE', 'Not set'),
+    'databricks_host': settings.databricks_host or 'Not set',
+    'databricks_token_present': bool(settings.databricks_token),
+    'databricks_auth_type': settings.databricks_auth_type or 'Not set',
   }
 
   # Test Databricks client initialization
   databricks_status = {'initialized': False, 'error': None}
   try:
-    client = WorkspaceClient()
-    # Test basic connectivity
-    user_info = client.current_user.me()
+    # The shared client is built once per process; the connectivity check is a blocking HTTP
+    # call, so it runs off the event loop
+    client = await run_blocking(get_client)
+    user_info = await run_blocking(client.current_user.me)
     databricks_status['initialized'] = True
     databricks_status['user'] = user_info.user_name
   except Exception as e:
@@ -284,14 +328,13 @@ async def test_ai_connection() -> dict:
         detail='No default schema available for testing',
       )
 
-    # Test direct Foundation Model query first
-    direct_query_result = await ai_engine._query_databricks_model(
-      'What company is mentioned in this text: Meeting with Acme Corp on March 15, 2024', 50
-    )
-
-    # Test the AI analysis
-    result = await ai_engine.analyze_text(
-      text=test_text, schema=default_schema, extract_customer_info=True
+    # The direct Foundation Model query and the full analysis are independent, so run them
+    # concurrently; the check takes as long as the slower of the two
+    direct_query_result, result = await asyncio.gather(
+      ai_engine._query_databricks_model(
+        'What company is mentioned in this text: Meeting with Acme Corp on March 15, 2024', 50
+      ),
+      ai_engine.analyze_text(text=test_text, schema=default_schema, extract_customer_info=True),
     )
 
     return {
@@ -327,6 +370,88 @@ async def test_ai_connection() -> dict:
     }
 
 
+async def _analyze_input(
+  idx: int,
+  input_item: BatchInput,
+  schema,
+  extract_customer_info: bool,
+  upload: Optional[UploadFile] = None,
+) -> BatchItemResult:
+  """Extract and analyze one batch input; failures become an error result."""
+  try:
+    # Extract text based on input type
+    if input_item.input_type == BatchInputType.TEXT:
+      text_content = input_item.text
+    elif input_item.input_type == BatchInputType.FILE:
+      # Multipart uploads are read here, inside the bounded pipeline; JSON callers send the
+      # file's text as the content
+      text_content = await extract_text_from_file(upload) if upload else input_item.text
+    elif input_item.input_type == BatchInputType.URL:
+      # Extract from Google Drive or other URLs
+      text_content = await extract_text_from_google_drive(input_item.text)
+    else:
+      raise ValueError(f"Unknown input type: {input_item.input_type}")
+
+    # Analyze the text
+    analysis_result = await ai_engine.analyze_text(
+      text=text_content,
+      schema=schema,
+      extract_customer_info=extract_customer_info,
+      fast_mode=False,
+    )
+    return BatchItemResult.from_analysis(
+      idx, input_item.input_type, input_item.filename, analysis_result
+    )
+
+  except Exception as e:
+    return BatchItemResult.from_error(idx, input_item.input_type, input_item.filename, e)
+
+
+async def _process_inputs(
+  inputs: List[BatchInput],
+  schema,
+  extract_customer_info: bool,
+  uploads: Optional[Dict[int, UploadFile]] = None,
+) -> AsyncIterator[BatchItemResult]:
+  """Analyze batch inputs concurrently and yield each result as soon as it is ready.
+
+  At most BATCH_MAX_CONCURRENCY inputs are in flight at once. Results arrive in completion
+  order; their index gives the input position.
+
+  Args:
+    inputs: Inputs to analyze.
+    schema: Schema template to analyze against.
+    extract_customer_info: Whether to extract customer name and meeting date.
+    uploads: Uploaded files for FILE inputs, keyed by input index.
+  """
+  semaphore = asyncio.BoundedSemaphore(BATCH_MAX_CONCURRENCY)
+  uploads = uploads or {}
+
+  async def analyze_bounded(idx, input_item):
+    async with semaphore:
+      return await _analyze_input(
+        idx, input_item, schema, extract_customer_info, uploads.get(idx)
+      )
+
+  tasks = [analyze_bounded(idx, input_item) for idx, input_item in enumerate(inputs)]
+  for next_result in asyncio.as_completed(tasks):
+    yield await next_result
+
+
+async def _collect_results(
+  inputs: List[BatchInput],
+  schema,
+  extract_customer_info: bool,
+  uploads: Optional[Dict[int, UploadFile]] = None,
+) -> List[BatchItemResult]:
+  """Run _process_inputs to completion and return the results in input order."""
+  results = [
+    result async for result in _process_inputs(inputs, schema, extract_customer_info, uploads)
+  ]
+  results.sort(key=lambda result: result.index)
+  return results
+
+
 @router.post('/batch-analyze')
 async def batch_analyze(
   inputs: List[UploadFile] = File(None),
@@ -338,86 +463,39 @@ async def batch_analyze(
 ):
   """Analyze multiple inputs (text, files, URLs) and export results as spreadsheet."""
   # Get the schema template
-  if request.schema_template_id not in _schemas:
+  schema = get_schema_or_404(schema_template_id)
+  start_time = datetime.now()
+  
+  # One index order across the form fields: uploaded files, then texts, then URLs. Files are
+  # read inside the pipeline, so only their names are recorded here.
+  files = inputs or []
+  batch_inputs = [
+    BatchInput(input_type=BatchInputType.FILE, content='', filename=file.filename)
+    for file in files
+  ]
+  batch_inputs += [
+    BatchInput(input_type=BatchInputType.TEXT, content=text_content) for text_content in texts or []
+  ]
+  batch_inputs += [
+    BatchInput(input_type=BatchInputType.URL, content=url, filename=url) for url in urls or []
+  ]
+  if not batch_inputs:
     raise HTTPException(
-      status_code=status.HTTP_404_NOT_FOUND,
-      detail=f"Schema template '{request.schema_template_id}' not found",
+      status_code=status.HTTP_400_BAD_REQUEST,
+      detail='Provide at least one file, text or URL to analyze',
     )
   
-  schema = _schemas[request.schema_template_id]
-  start_time = datetime.now()
-  results = []
-  
-  # Process each input
-  for idx, input_item in enumerate(request.inputs):
-    try:
-      # Extract text based on input type
-      if input_item.input_type == BatchInputType.TEXT:
-        text_content = input_item.content
-      elif input_item.input_type == BatchInputType.FILE:
-        # Assume content is base64 encoded file content
-        # In production, this would handle file uploads properly
-        text_content = input_item.content  # Placeholder
-      elif input_item.input_type == BatchInputType.URL:
-        # Extract from Google Drive or other URLs
-        text_content = await extract_text_from_google_drive(input_item.content)
-      else:
-        raise ValueError(f"Unknown input type: {input_item.input_type}")
-      
-      # Analyze the text
-      analysis_result = await ai_engine.analyze_text(
-        text=text_content,
-        schema=schema,
-        extract_customer_info=request.extract_customer_info,
-        fast_mode=False,
-      )
-      
-      # Convert to batch item result
-      item_result = BatchItemResult(
-        index=idx,
-        input_type=input_item.input_type,
-        filename=input_item.filename,
-        customer_name=analysis_result.customer_name,
-        meeting_date=analysis_result.meeting_date,
-        categories={
-          name: {
-            'values': cat.values,
-            'confidence': cat.confidence,
-            'evidence': cat.evidence_text,
-          }
-          for name, cat in analysis_result.categories.items()
-        },
-        processing_time_ms=analysis_result.processing_time_ms,
-        word_count=analysis_result.word_count,
-      )
-      results.append(item_result)
-      
-    except Exception as e:
-      # Add error result
-      results.append(
-        BatchItemResult(
-          index=idx,
-          input_type=input_item.input_type,
-          filename=input_item.filename,
-          processing_time_ms=0,
-          word_count=0,
-          error=str(e),
-        )
-      )
+  results = await _collect_results(
+    batch_inputs, schema, extract_customer_info, uploads=dict(enumerate(files))
+  )
   
   # Calculate stats
   successful_items = sum(1 for r in results if r.error is None)
   failed_items = len(results) - successful_items
   total_time = int((datetime.now() - start_time).total_seconds() * 1000)
   
-  # Create spreadsheet
-  spreadsheet_data, filename = create_spreadsheet(results, schema, request.export_format)
-  
-  # Store spreadsheet data temporarily (in production, use a proper storage)
-  import tempfile
-  temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=f'.{request.export_format}')
-  temp_file.write(spreadsheet_data)
-  temp_file.close()
+  # The spreadsheet itself is served by /batch-analyze/download; only its name is suggested here
+  filename = _spreadsheet_filename(export_format)
   
   return BatchAnalysisResult(
     total_items=len(results),
@@ -429,142 +507,147 @@ async def batch_analyze(
   )
 
 
-def create_spreadsheet(results: List[BatchItemResult], schema, export_format: str) -> tuple[bytes, str]:
-  """Create a spreadsheet from batch analysis results."""
-  # Prepare data for DataFrame
-  rows = []
-  
+def _spreadsheet_layout(schema) -> tuple[List[str], List[str]]:
+  """Return the spreadsheet header and the schema's category names, in column order."""
+  # Category names and headers depend only on the schema, so resolve them once, not per row
+  category_names = [category.name for category in schema.categories]
+  header = list(SPREADSHEET_BASE_COLUMNS)
+  for name in category_names:
+    header += [f'{name} - Values', f'{name} - Confidence', f'{name} - Evidence']
+  return header, category_names
+
+
+def _spreadsheet_rows(
+  results: List[BatchItemResult], category_names: List[str]
+) -> Iterator[list]:
+  """Yield one plain row per result, in header order."""
   for result in results:
-    row = {
-      'Index': result.index + 1,
-      'Input Type': result.input_type,
-      'Filename': result.filename or '',
-      'Customer Name': result.customer_name or '',
-      'Meeting Date': result.meeting_date or '',
-      'Word Count': result.word_count,
-      'Processing Time (ms)': result.processing_time_ms,
-      'Error': result.error or '',
-    }
+    row = [
+      result.index + 1,
+      result.input_type,
+      result.filename or '',
+      result.customer_name or '',
+      result.meeting_date or '',
+      result.word_count,
+      result.processing_time_ms,
+      result.error or '',
+    ]
     
     # Add category columns
-    for category in schema.categories:
-      if result.categories and category.name in result.categories:
-        cat_data = result.categories[category.name]
-        row[f'{category.name} - Values'] = ', '.join(cat_data.get('values', []))
-        row[f'{category.name} - Confidence'] = cat_data.get('confidence', 0)
-        row[f'{category.name} - Evidence'] = ' | '.join(cat_data.get('evidence', []))[:200]  # Limit evidence length
+    categories = result.categories
+    for name in category_names:
+      cat_result = categories.get(name)
+      if cat_result:
+        row += [
+          ', '.join(cat_result.values),
+          cat_result.confidence,
+          ' | '.join(cat_result.evidence_text)[:200],  # Limit evidence length
+        ]
       else:
-        row[f'{category.name} - Values'] = ''
-        row[f'{category.name} - Confidence'] = 0
-        row[f'{category.name} - Evidence'] = ''
+        row += ['', 0, '']
     
-    rows.append(row)
-  
-  # Create DataFrame
-  df = pd.DataFrame(rows)
-  
-  # Export to desired format
-  output = BytesIO()
+    yield row
+
+
+def _spreadsheet_filename(export_format: str) -> str:
+  """Timestamped download filename for a spreadsheet in the given format."""
   timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+  extension = 'xlsx' if export_format == 'xlsx' else 'csv'
+  return f'insights_analysis_{timestamp}.{extension}'
+
+
+def iter_csv_chunks(results: List[BatchItemResult], schema) -> Iterator[bytes]:
+  """Render batch analysis results as CSV in UTF-8 chunks of about SPREADSHEET_CHUNK_BYTES.
+
+  Rows are built as they are written, so only the current chunk of CSV text is held in memory.
+  """
+  header, category_names = _spreadsheet_layout(schema)
+  buffer = io.StringIO()
+  writer = csv.writer(buffer, lineterminator='\n')
+  writer.writerow(header)
+  for row in _spreadsheet_rows(results, category_names):
+    writer.writerow(row)
+    if buffer.tell() >= SPREADSHEET_CHUNK_BYTES:
+      yield buffer.getvalue().encode('utf-8')
+      buffer.seek(0)
+      buffer.truncate()
+  yield buffer.getvalue().encode('utf-8')
+
+
+def write_spreadsheet(
+  results: List[BatchItemResult], schema, export_format: str, output: BinaryIO
+) -> str:
+  """Write batch analysis results as a spreadsheet into a binary file object.
+
+  Returns:
+    Suggested filename for the spreadsheet.
+  """
+  filename = _spreadsheet_filename(export_format)
   
   if export_format == 'xlsx':
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-      df.to_excel(writer, index=False, sheet_name='Analysis Results')
-      
-      # Auto-adjust column widths
-      worksheet = writer.sheets['Analysis Results']
-      for column in df:
-        column_length = max(df[column].astype(str).map(len).max(), len(column))
-        col_idx = df.columns.get_loc(column)
-        worksheet.column_dimensions[chr(65 + col_idx)].width = min(column_length + 2, 50)
+    header, category_names = _spreadsheet_layout(schema)
+    rows = list(_spreadsheet_rows(results, category_names))
+    
+    # Write-only workbooks stream rows out instead of keeping a cell object per value; column
+    # widths have to be set before the first row is appended.
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet('Analysis Results')
+    # Widths from the header and the cell values, measured a whole column at a time
+    column_values = zip(*rows) if rows else ((),) * len(header)
+    for col_idx, (column, values) in enumerate(zip(header, column_values), start=1):
+      column_length = max(len(column), max(map(len, map(str, values)), default=0))
+      worksheet.column_dimensions[get_column_letter(col_idx)].width = min(column_length + 2, 50)
     
-    filename = f'insights_analysis_{timestamp}.xlsx'
+    header_font = Font(bold=True)
+    header_cells = []
+    for column in header:
+      cell = WriteOnlyCell(worksheet, value=column)
+      cell.font = header_font
+      header_cells.append(cell)
+    worksheet.append(header_cells)
+    for row in rows:
+      worksheet.append(row)
+    workbook.save(output)
   else:  # CSV
-    df.to_csv(output, index=False)
-    filename = f'insights_analysis_{timestamp}.csv'
+    output.writelines(iter_csv_chunks(results, schema))
   
-  output.seek(0)
-  return output.read(), filename
+  return filename
 
 
 @router.post('/batch-analyze/download')
 async def batch_analyze_download(request: BatchAnalysisRequest):
   """Analyze multiple inputs and return spreadsheet file for download."""
   # Get the schema template
-  if request.schema_template_id not in _schemas:
-    raise HTTPException(
-      status_code=status.HTTP_404_NOT_FOUND,
-      detail=f"Schema template '{request.schema_template_id}' not found",
-    )
-  
-  schema = _schemas[request.schema_template_id]
+  schema = get_schema_or_404(request.schema_template_id)
   start_time = datetime.now()
-  results = []
+  results = await _collect_results(request.inputs, schema, request.extract_customer_info)
   
-  # Process each input (same logic as batch_analyze)
-  for idx, input_item in enumerate(request.inputs):
-    try:
-      # Extract text based on input type
-      if input_item.input_type == BatchInputType.TEXT:
-        text_content = input_item.content
-      elif input_item.input_type == BatchInputType.FILE:
-        text_content = input_item.content  # Placeholder
-      elif input_item.input_type == BatchInputType.URL:
-        text_content = await extract_text_from_google_drive(input_item.content)
-      else:
-        raise ValueError(f"Unknown input type: {input_item.input_type}")
-      
-      # Analyze the text
-      analysis_result = await ai_engine.analyze_text(
-        text=text_content,
-        schema=schema,
-        extract_customer_info=request.extract_customer_info,
-        fast_mode=False,
-      )
-      
-      # Convert to batch item result
-      item_result = BatchItemResult(
-        index=idx,
-        input_type=input_item.input_type,
-        filename=input_item.filename,
-        customer_name=analysis_result.customer_name,
-        meeting_date=analysis_result.meeting_date,
-        categories={
-          name: {
-            'values': cat.values,
-            'confidence': cat.confidence,
-            'evidence': cat.evidence_text,
-          }
-          for name, cat in analysis_result.categories.items()
-        },
-        processing_time_ms=analysis_result.processing_time_ms,
-        word_count=analysis_result.word_count,
-      )
-      results.append(item_result)
-      
-    except Exception as e:
-      # Add error result
-      results.append(
-        BatchItemResult(
-          index=idx,
-          input_type=input_item.input_type,
-          filename=input_item.filename,
-          processing_time_ms=0,
-          word_count=0,
-          error=str(e),
-        )
-      )
+  # CSV needs no column widths, so rows are rendered while the response is being sent
+  if request.export_format != 'xlsx':
+    return StreamingResponse(
+      iter_csv_chunks(results, schema),
+      media_type='text/csv',
+      headers={
+        'Content-Disposition': f'attachment; filename="{_spreadsheet_filename("csv")}"'
+      },
+    )
   
-  # Create spreadsheet
-  spreadsheet_data, filename = create_spreadsheet(results, schema, request.export_format)
+  # Write the spreadsheet to a spooled file (in memory while small, on disk beyond that) and
+  # stream it out in chunks instead of holding a second full copy as bytes
+  spool = tempfile.SpooledTemporaryFile(max_size=SPREADSHEET_SPOOL_MAX_BYTES)
+  try:
+    filename = await run_blocking(write_spreadsheet, results, schema, request.export_format, spool)
+  except BaseException:
+    spool.close()
+    raise
+  spool.seek(0)
   
   # Return file for download
-  media_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' if request.export_format == 'xlsx' else 'text/csv'
-  
   return StreamingResponse(
-    BytesIO(spreadsheet_data),
-    media_type=media_type,
+    iter(partial(spool.read, SPREADSHEET_CHUNK_BYTES), b''),
+    media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
     headers={
       'Content-Disposition': f'attachment; filename="{filename}"'
-    }
+    },
+    background=BackgroundTask(spool.close),
   )
\ No newline at end of file
@@ -1,11 +1,14 @@
 """API endpoints for schema management."""
 
+import logging
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
 from uuid import uuid4
 
 from fastapi import APIRouter, HTTPException, status
 
+from server.models.batch_models import BASE_EXPORT_COLUMNS
 from server.models.schema_models import (
   DEFAULT_PRODUCT_FEEDBACK_SCHEMA,
   DEFAULT_VECTOR_SEARCH_SCHEMA,
@@ -16,16 +19,85 @@ from server.models.schema_models import (
   SchemaValidationResponse,
   UpdateSchemaRequest,
 )
+from server.utils.memory_store import MemoryStore
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix='/schema', tags=['Schema Management'])
 
-# In-memory storage for development (will be replaced with Delta Tables)
-_schemas: dict[str, SchemaTemplate] = {
+# User templates kept in memory before the least recently used ones are dropped
+SCHEMA_STORE_SIZE = 10_000
+
+DEFAULT_SCHEMAS = {
   'default_product_feedback': DEFAULT_PRODUCT_FEEDBACK_SCHEMA,
   'default_vector_search': DEFAULT_VECTOR_SEARCH_SCHEMA,
 }
 
 
+def _forget_schema_columns(template_id: str) -> None:
+  """Drop cached column names once their template is evicted from the store."""
+  get_schema_columns.cache_clear()
+
+
+# In-memory storage for development (will be replaced with Delta Tables). The built-in templates
+# are pinned so eviction only ever drops user templates.
+_schemas: MemoryStore[SchemaTemplate] = MemoryStore(
+  SCHEMA_STORE_SIZE, pinned=DEFAULT_SCHEMAS, on_evict=_forget_schema_columns
+)
+_schemas.update(DEFAULT_SCHEMAS)
+
+
+def get_schema_or_404(template_id: str) -> SchemaTemplate:
+  """Return the stored schema template, or raise a 404 HTTPException.
+
+  Templates live in the in-process _schemas store as already-validated models, so this is a single
+  lookup; there is nothing to re-parse per request and no separate cache to invalidate.
+  """
+  schema = _schemas.get(template_id)
+  if schema is None:
+    raise HTTPException(
+      status_code=status.HTTP_404_NOT_FOUND,
+      detail=f"Schema template '{template_id}' not found",
+    )
+  return schema
+
+
+# Leading batch preview table headers; each schema category then adds its own column
+PREVIEW_BASE_HEADERS = ('Source', 'Customer Name', 'Meeting Date')
+
+
+class SchemaColumns(NamedTuple):
+  """Column names derived from a schema template."""
+
+  base_columns: tuple[str, ...]
+  category_columns: tuple[str, ...]
+  # (category name, snake_case key) pairs used by the batch preview rows
+  preview_keys: tuple[tuple[str, str], ...]
+  # Column headers of the batch preview table
+  preview_headers: tuple[str, ...]
+
+
+def build_schema_columns(schema: SchemaTemplate) -> SchemaColumns:
+  """Derive the export/preview column names for a schema template."""
+  category_columns = tuple(category.name for category in schema.categories)
+  return SchemaColumns(
+    base_columns=tuple(BASE_EXPORT_COLUMNS),
+    category_columns=category_columns,
+    preview_keys=tuple((name, name.lower().replace(' ', '_')) for name in category_columns),
+    preview_headers=PREVIEW_BASE_HEADERS + category_columns,
+  )
+
+
+@lru_cache(maxsize=128)
+def get_schema_columns(template_id: str) -> SchemaColumns:
+  """Return the column names for a stored schema template, or raise a 404 HTTPException.
+
+  Cached per template ID; the template update and delete endpoints and store evictions clear the
+  cache.
+  """
+  return build_schema_columns(get_schema_or_404(template_id))
+
+
 @router.get('/templates', response_model=List[SchemaTemplate])
 async def get_schema_templates(user_id: Optional[str] = None) -> List[SchemaTemplate]:
   """Get all schema templates, optionally filtered by user."""
@@ -55,17 +127,18 @@ async def create_schema_template(
   request: CreateSchemaRequest, user_id: Optional[str] = None
 ) -> SchemaTemplate:
   """Create a new schema template."""
-  print(f'Received schema creation request: {request}')
-  print(f'Template name: {request.template_name}')
-  print(f'Categories count: {len(request.categories)}')
+  logger.debug('Received schema creation request: %r', request)
+  logger.debug(
+    'Template name: %s, categories count: %d', request.template_name, len(request.categories)
+  )
 
   try:
     # Validate the schema (simplified validation without AI)
-    validation_result = await validate_schema_categories(request.categories)
-    print(f'Validation result: {validation_result.is_valid}')
+    validation_result = validate_schema_categories(request.categories)
+    logger.debug('Validation result: %s', validation_result.is_valid)
 
     if not validation_result.is_valid:
-      print(f'Validation errors: {validation_result.errors}')
+      logger.debug('Validation errors: %r', validation_result.errors)
       raise HTTPException(
         status_code=status.HTTP_400_BAD_REQUEST,
         detail={
@@ -74,9 +147,10 @@ async def create_schema_template(
         },
       )
   except Exception as e:
-    print(f'Error during schema validation: {e}')
     # If validation fails, proceed anyway for basic schemas
-    print('Proceeding with schema creation despite validation issues')
+    logger.warning(
+      'Error during schema validation, proceeding with schema creation anyway: %s', e
+    )
 
   # Create new template
   template_id = str(uuid4())
@@ -124,7 +198,7 @@ async def update_schema_template(
 
   if request.categories is not None:
     # Validate the new categories
-    validation_result = await validate_schema_categories(request.categories)
+    validation_result = validate_schema_categories(request.categories)
     if not validation_result.is_valid:
       raise HTTPException(
         status_code=status.HTTP_400_BAD_REQUEST,
@@ -137,6 +211,7 @@ async def update_schema_template(
 
   template.updated_at = datetime.now()
   _schemas[template_id] = template
+  get_schema_columns.cache_clear()
 
   return template
 
@@ -164,19 +239,20 @@ async def delete_schema_template(template_id: str, user_id: Optional[str] = None
     )
 
   del _schemas[template_id]
+  get_schema_columns.cache_clear()
   return {'message': f"Schema template '{template.template_name}' deleted successfully"}
 
 
 @router.post('/validate', response_model=SchemaValidationResponse)
 async def validate_schema(request: CreateSchemaRequest) -> SchemaValidationResponse:
   """Validate a schema before saving."""
-  return await validate_schema_categories(request.categories)
+  return validate_schema_categories(request.categories)
 
 
-async def validate_schema_categories(categories: List) -> SchemaValidationResponse:
+def validate_schema_categories(categories: List) -> SchemaValidationResponse:
   """Validate schema categories for common issues."""
   errors = []
-  category_names = []
+  category_names = set()
 
   for i, category in enumerate(categories):
     # Check for duplicate category names
@@ -187,7 +263,7 @@ async def validate_schema_categories(categories: List) -> SchemaValidationRespon
         )
       )
     else:
-      category_names.append(category.name)
+      category_names.add(category.name)
 
     # Check category name is not empty
     if not category.name.strip():
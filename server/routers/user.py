@@ -1,8 +1,10 @@
 """User router for Databricks user information."""
 
-from fastapi import APIRouter, HTTPException
+from databricks.sdk import WorkspaceClient
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
+from server.services.databricks_client import get_client
 from server.services.user_service import UserService
 
 router = APIRouter()
@@ -24,11 +26,23 @@ class UserWorkspaceInfo(BaseModel):
   workspace: dict
 
 
+def get_workspace_client() -> WorkspaceClient:
+  """Return the shared WorkspaceClient, reporting configuration errors as a 500 with detail.
+
+  Raises:
+    HTTPException: 500 if the client cannot be built, e.g. missing or invalid credentials.
+  """
+  try:
+    return get_client()
+  except Exception as e:
+    raise HTTPException(status_code=500, detail=f'Failed to connect to Databricks: {str(e)}')
+
+
 @router.get('/me', response_model=UserInfo)
-async def get_current_user():
+async def get_current_user(client: WorkspaceClient = Depends(get_workspace_client)):
   """Get current user information from Databricks."""
   try:
-    service = UserService()
+    service = UserService(client)
     user_info = service.get_user_info()
 
     return UserInfo(
@@ -42,10 +56,10 @@ async def get_current_user():
 
 
 @router.get('/me/workspace', response_model=UserWorkspaceInfo)
-async def get_user_workspace_info():
+async def get_user_workspace_info(client: WorkspaceClient = Depends(get_workspace_client)):
   """Get user information along with workspace details."""
   try:
-    service = UserService()
+    service = UserService(client)
     info = service.get_user_workspace_info()
 
     return UserWorkspaceInfo(
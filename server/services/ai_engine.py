@@ -1,19 +1,314 @@
 """AI engine for customer insights extraction."""
 
 import asyncio
-import json
-import os
+import hashlib
+import logging
 import re
+import string
 from datetime import datetime
-from typing import List, Optional, Tuple
-from dateutil import parser as date_parser
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
-import spacy
-from databricks.sdk import WorkspaceClient
-from databricks.sdk.service.serving import ChatMessage, ChatMessageRole
+import httpx
+import orjson
+from dateutil import parser as date_parser
 
+from server.config import get_settings
 from server.models.document_models import CategoryResult, ExtractedEntity, QuickAnalysisResult
 from server.models.schema_models import CategoryValueType, SchemaTemplate
+from server.services import fast_extractors
+from server.services.databricks_client import (
+  get_client,
+  query_serving_endpoint,
+  stream_serving_json,
+)
+from server.utils.json_extract import extract_first_json, extract_json_lenient
+from server.utils.memory_store import MemoryStore
+from server.utils.rate_limit import (
+  call_with_retry,
+  get_endpoint_router,
+  is_rate_limit_error,
+)
+
+logger = logging.getLogger(__name__)
+
+# Model responses kept for repeated prompts
+RESPONSE_CACHE_SIZE = 50
+
+# How long the preferred endpoint gets to answer before the next one is asked in parallel
+HEDGE_DELAY_SECS = 30.0
+
+# Characters of a document sent for customer info extraction: the name and date almost always
+# appear near the top, with the tail kept for sign-offs and trailing dates
+CUSTOMER_INFO_HEAD_CHARS = 2048
+CUSTOMER_INFO_TAIL_CHARS = 512
+
+# Customer info extraction prompt; built once, only the document text is substituted per call
+CUSTOMER_INFO_PROMPT_TMPL = string.Template("""Extract the customer name and meeting date from this text.
+
+Text: $text
+
+Return a JSON object with these fields:
+- customer_name: The company or customer name (e.g., "7-Eleven", "a16z", "ActiveFence")
+- meeting_date: The date in format "MMM DD, YYYY" (e.g., "Nov 12, 2024", "Mar 11, 2025")
+
+IMPORTANT: Always format dates as "MMM DD, YYYY" where:
+- MMM is the 3-letter month abbreviation (Jan, Feb, Mar, Apr, May, Jun, Jul, Aug, Sep, Oct, Nov, Dec)
+- DD is the 2-digit day (01-31)
+- YYYY is the 4-digit year
+
+If a field is not found, use empty string "".
+
+Example: {"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}""")
+
+# Multi-category extraction prompt; one request covers every category of a schema
+COMBINED_CATEGORIES_PROMPT_TMPL = string.Template("""Extract the following categories from the customer meeting notes.
+
+Categories:
+$categories
+
+Text: "$text"
+
+Return ONLY a JSON object keyed by category name, for example:
+{"Category Name": {"values": ["value"], "evidence": ["quote"], "confidence": 0.9}}
+Use an empty "values" list for a category the document does not discuss.""")
+
+# Single-category prompts, used for categories the combined request did not answer
+PREDEFINED_CATEGORY_PROMPT_TMPL = string.Template("""Extract $name from the document.
+
+Options: $options
+
+Definition: $guidance
+
+Text: "$text"
+
+Return JSON: $reply_format""")
+PREDEFINED_REPLY_FORMAT = '{"values": ["option"], "evidence": ["quote"], "confidence": 0.9}'
+PREDEFINED_REPLY_FORMAT_NO_CONFIDENCE = '{"values": ["option"], "evidence": ["quote"]}'
+INFERRED_CATEGORY_PROMPT_TMPL = string.Template("""$guidance
+
+Text: "$text"
+
+$reply_format""")
+INFERRED_REPLY_FORMAT = 'JSON: {"values": ["value"], "evidence": ["text"], "confidence": 0.9}'
+INFERRED_INDUSTRY_REPLY_FORMAT = 'Return JSON only: {"values": ["industry"], "evidence": ["text"]}'
+
+# Output tokens budgeted per category in a combined request, and the most categories one combined
+# request covers; larger schemas are split into several combined requests sent concurrently
+COMBINED_TOKENS_PER_CATEGORY = 400
+COMBINED_MAX_CATEGORIES = 10
+
+# Regex-only fallback patterns, compiled once at import. Lists are tried in order and the first
+# pattern that yields a usable match wins, so they are kept separate rather than joined into one
+# alternation (which would prefer the leftmost match in the text instead).
+# Unanchored company patterns cap each word at 48 letters and match words possessively, so no
+# start position backtracks further than one word; a scan stays linear however long the document
+# or any single token is. Candidates of 50 or more characters are rejected anyway.
+FALLBACK_COMPANY_RES = tuple(
+  re.compile(pattern, re.MULTILINE)
+  for pattern in (
+    # Numbers-based names like "7-11" or "7-Eleven" (check first to avoid partial matches)
+    r'(?<!\d)(\d++[-\s]?Eleven)',
+    r'(?<!\d)(\d{1,2}[-\s]\d{1,2})(?!\d)',  # Pattern for "7-11" (not dates)
+    # Company names ending with Corp, Inc, etc (e.g., TechCorp, DataCorp)
+    r'([A-Z][a-zA-Z]{0,48}(?:Corp|Inc|LLC|Ltd))(?:\.)?',
+    # Company with suffix (Corp, Inc, etc) with space
+    r'([A-Z][a-zA-Z]{1,48}+\s++(?:Corp|Inc|LLC|Ltd))(?:\.)?',
+    # "Meeting with X" where X is 1-3 words ending before "on"
+    r'(?:meeting with|call with|discussion with)\s+([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+){0,2})(?=\s+on\s)',
+    # "Meeting with X" at end of sentence
+    r'(?:meeting with|call with|discussion with)\s+([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+){0,2})(?=[.,]|$)',
+    # "X discussion" or "X meeting" where X is a company name
+    r'([A-Z][a-zA-Z]{1,48}+(?:\s++[A-Z][a-zA-Z]{1,48}+){0,2})\s+(?:discussion|meeting|call)',
+    # Company at start of line before colon/dash
+    r'^([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+){0,2})\s*[-–:]',
+    # After "Customer:" or "Client:" label
+    r'(?:Customer|Client):\s*([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+){0,2})',
+    # Before "team", "customer", "client"
+    r'([A-Z][a-zA-Z]{1,48}+(?:\s++[A-Z][a-zA-Z]{1,48}+){0,2})\s+(?:team|customer|client)',
+    # Standalone capitalized words that might be company names (fallback)
+    r'^([A-Z][a-zA-Z]+)(?:\s|$)',
+  )
+)
+FALLBACK_NON_COMPANY_WORDS = (
+  'attendees',
+  'notes',
+  'tldr',
+  'eng',
+  'raw',
+  'context',
+  'very',
+  'but',
+  'with',
+)
+FALLBACK_DATE_RES = tuple(
+  re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+  for pattern in (
+    r'(\d{1,2}/\d{1,2}/\d{4})',
+    r'(\d{1,2}-\d{1,2}-\d{4})',
+    r'((January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4})',
+    r'((Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4})',
+    r'(\d{4}[-/]\d{1,2}[-/]\d{1,2})',  # ISO format
+    r'^((Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4})',  # Start of line dates
+  )
+)
+PAIN_POINT_RES = tuple(
+  re.compile(pattern, re.IGNORECASE)
+  for pattern in (
+    r'(?:frustrated|struggling|issues?|problems?) (?:with|about|regarding) ([^.,]+)',
+    r'(slow (?:performance|response|processing|loading|speed))',
+    r'((?:lack|lacking|missing|need|needs) (?:of |for |better )?[^.,]+)',
+    r'((?:difficult|hard|challenging) to [^.,]+)',
+    r'((?:can\'t|cannot|unable to) [^.,]+)',
+    r'(takes? (?:too long|hours|forever|ages))',
+    r'((?:poor|bad|terrible) [^.,]+)',
+  )
+)
+PAIN_POINT_PREFIX_RE = re.compile(r'^(with|about|regarding|of|for)\s+')
+FEATURE_REQUEST_RES = tuple(
+  re.compile(pattern, re.IGNORECASE)
+  for pattern in (
+    r'(?:need|needs?|want|wants?) (?:to have |for |better |improved |new )?([^.,]+)',
+    r'(?:would like|we\'d like) (?:to have |to see |better )?([^.,]+)',
+    r'(?:looking for|interested in) ([^.,]+)',
+    r'(?:it would be (?:great|nice|helpful) (?:to have|if)) ([^.,]+)',
+    r'(?:feature request|request):\s*([^.,]+)',
+    r'(?:wishlist|wish list):\s*([^.,]+)',
+  )
+)
+FEATURE_REQUEST_PREFIX_RE = re.compile(r'^(to |for |if |have |see )\s*')
+USE_CASE_RES = tuple(
+  re.compile(pattern, re.IGNORECASE)
+  for pattern in (
+    r'(?:use|using|used) (?:it |this |that )?(?:for|to) ([^.,]+)',
+    r'(?:helps?|helping) (?:us |them )?(?:with|to) ([^.,]+)',
+    r'(?:solution for|platform for) ([^.,]+)',
+    r'(?:enables?|enabling) ([^.,]+)',
+  )
+)
+FALLBACK_CATEGORY_COMPANY_RES = tuple(
+  re.compile(pattern)
+  for pattern in (
+    r'\b([A-Z][a-zA-Z]+(?:\s+(?:Corp|Inc|Ltd|LLC|Co|Company))?)\b',
+    r'meeting with ([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*)',
+    r'client ([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*)',
+  )
+)
+SATISFACTION_KEYWORDS = {
+  'very satisfied': ['very happy', 'love', 'excellent', 'fantastic'],
+  'satisfied': ['happy', 'pleased', 'good', 'works well'],
+  'neutral': ['okay', 'average', 'fine'],
+  'dissatisfied': ['frustrated', 'struggling', 'issues', 'problems', 'slow'],
+  'very dissatisfied': ['very frustrated', 'angry', 'terrible', 'awful'],
+}
+SENTIMENT_WORDS = ('happy', 'satisfied', 'frustrated', 'disappointed', 'pleased', 'concerned')
+INDUSTRY_KEYWORDS = {
+  'e-commerce': ['e-commerce', 'ecommerce', 'online retail', 'online store', 'marketplace'],
+  'financial services': ['financial', 'banking', 'fintech', 'insurance', 'trading', 'payments'],
+  'healthcare': ['healthcare', 'medical', 'hospital', 'health', 'pharma', 'clinical'],
+  'technology': ['software', 'saas', 'tech company', 'it company', 'technology', 'platform'],
+  'retail': ['retail', 'store', 'shops', 'merchandising', 'pos', 'point of sale'],
+  'manufacturing': ['manufacturing', 'factory', 'production', 'assembly', 'industrial'],
+  'media': ['media', 'entertainment', 'streaming', 'content', 'publishing', 'broadcasting'],
+}
+
+# Definitions sent with predefined-value categories, keyed by category name
+PREDEFINED_CATEGORY_GUIDANCE = {
+  'Usage Pattern': (
+    "Describes the data processing frequency for the customer's use case, such as 'Real Time' or "
+    "'Batch'."
+  ),
+  'Product': (
+    'The specific Databricks product or feature that is the main topic of discussion in the '
+    "meeting. This can include 'Vector Search,' 'Embedding FT' (Fine-Tuning), or 'Unstructured'."
+  ),
+  'Search Tags': (
+    'The primary application of the search technology being discussed. This could be for '
+    "'RAG' (Retrieval-Augmented Generation), general 'Search,' or 'Matching' data records."
+  ),
+  'Unstructured Tags': (
+    "Highlights use cases involving the processing of unstructured data, often for 'RAG' or "
+    "'Automation' of tasks like document parsing."
+  ),
+  'End User Tags': (
+    "Specifies whether the end-users of the application being built are 'Internal' to the "
+    "customer's company or 'External' clients."
+  ),
+  'Production Status': (
+    "Indicates whether the customer's application or the specific use case being discussed is "
+    "live and operational in a production environment. Return 'Production' only if it's live in "
+    'production, otherwise return empty array.'
+  ),
+}
+# Instructions sent with AI-inferred categories, keyed by category name
+INFERRED_CATEGORY_GUIDANCE = {
+  'Industry': (
+    "Read the document and identify the customer's PRIMARY industry sector. Return only ONE "
+    'industry that best describes their main business.'
+  ),
+  'Use Case': (
+    'Read the document and understand what specific business problem or application they want to '
+    "solve. Focus on the business value they're trying to create."
+  ),
+}
+
+# Endpoints tried first for categories the default endpoint tends to get wrong, in order of
+# preference; only the first healthy one is moved to the front
+PREFERRED_CATEGORY_ENDPOINTS = {
+  'Search Tags': ('databricks-claude-3-7-sonnet', 'databricks-gemini-2-5-pro'),
+  'Unstructured Tags': ('databricks-claude-3-7-sonnet', 'databricks-gemini-2-5-pro'),
+}
+
+# spaCy pipeline components not needed for entity recognition, and documents per nlp.pipe batch
+# on CPU and on GPU, where larger batches keep the device busy
+SPACY_UNUSED_COMPONENTS = ('tagger', 'parser', 'attribute_ruler', 'lemmatizer')
+SPACY_BATCH_SIZE = 64
+SPACY_GPU_BATCH_SIZE = 128
+
+# Rescue patterns for customer info replies that are not valid JSON, tried in order
+CUSTOMER_NAME_FIELD_RES = (
+  re.compile(r'customer_name["\']?\s*:\s*["\']([^"\']+)["\']', re.IGNORECASE),
+  re.compile(r'"customer_name"\s*:\s*"([^"]+)"'),
+)
+MEETING_DATE_FIELD_RES = (
+  re.compile(r'meeting_date["\']?\s*:\s*["\']([^"\']+)["\']', re.IGNORECASE),
+  re.compile(r'"meeting_date"\s*:\s*"([^"]+)"'),
+)
+# Dates already in the "MMM DD, YYYY" display format, which is 11 or 12 characters long
+DISPLAY_DATE_RE = re.compile(r'^[A-Z][a-z]{2} \d{1,2}, \d{4}$')
+DISPLAY_DATE_FORMAT = '%b %d, %Y'
+DISPLAY_DATE_LENGTHS = (11, 12)
+# Numeric dates matched exactly before falling back to dateutil, with their ISO formatters
+NUMERIC_DATE_FORMATS = (
+  (re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{4})$'), lambda m: f"{m.group(3)}-{m.group(1).zfill(2)}-{m.group(2).zfill(2)}"),
+  (re.compile(r'^(\d{1,2})-(\d{1,2})-(\d{4})$'), lambda m: f"{m.group(3)}-{m.group(1).zfill(2)}-{m.group(2).zfill(2)}"),
+  (re.compile(r'^(\d{4})/(\d{1,2})/(\d{1,2})$'), lambda m: f"{m.group(1)}-{m.group(2).zfill(2)}-{m.group(3).zfill(2)}"),
+  (re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})$'), lambda m: f"{m.group(1)}-{m.group(2).zfill(2)}-{m.group(3).zfill(2)}"),
+)
+DATE_PREFIXES = ('date:', 'meeting date:', 'on', 'meeting on')
+# Every full month name starts with its abbreviation, so the abbreviations alone cover both
+MONTH_ABBREVIATIONS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+# Capitalized word runs, used as ORG entities when spaCy is unavailable
+ENTITY_NAME_RE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+
+# Characters split at a time when counting words
+WORD_COUNT_CHUNK_CHARS = 1 << 16
+
+
+def count_words(text: str) -> int:
+  """Count whitespace-separated words, like len(text.split()) without building the whole list.
+
+  The text is split a slice at a time, so peak memory is bounded by one slice's words instead of
+  one string object per word in the document. A word cut in two by a slice boundary is counted
+  once.
+  """
+  count = 0
+  for start in range(0, len(text), WORD_COUNT_CHUNK_CHARS):
+    piece = text[start : start + WORD_COUNT_CHUNK_CHARS]
+    count += len(piece.split())
+    if start and not text[start - 1].isspace() and not piece[0].isspace():
+      count -= 1
+  return count
 
 
 class AIInsightsEngine:
@@ -22,12 +317,11 @@ class AIInsightsEngine:
   def __init__(self):
     """Initialize the AI engine."""
     # Simple cache to avoid repeated calls
-    self._cache = {}
-    self._cache_max_size = 50
+    self._cache: MemoryStore[str] = MemoryStore(RESPONSE_CACHE_SIZE)
     
     # Initialize Databricks client
     try:
-      self.databricks_client = WorkspaceClient()
+      self.databricks_client = get_client()
       # Use available foundation model endpoints
       # Note: These endpoints have rate limits and may have availability issues
       self.available_endpoints = [
@@ -41,9 +335,9 @@ class AIInsightsEngine:
       self.llm_available = True  # Always try to use LLM
       self.consecutive_failures = 0  # Track consecutive failures
       self.max_consecutive_failures = 5  # Allow more failures before disabling
-      print(f'Initialized Databricks AI engine with endpoints: {self.available_endpoints}')
+      logger.info('Initialized Databricks AI engine with endpoints: %s', self.available_endpoints)
     except Exception as e:
-      print(f'Warning: Could not initialize Databricks client: {e}')
+      logger.warning('Could not initialize Databricks client: %s', e)
       self.databricks_client = None
       self.model_endpoint = None
       self.available_endpoints = []
@@ -51,12 +345,28 @@ class AIInsightsEngine:
       self.consecutive_failures = 0
       self.max_consecutive_failures = 5
 
-    # Initialize spaCy for NER (we'll use a simple fallback if model not available)
-    self.nlp = None
+    # spaCy is loaded by the nlp property on first use
+    self.nlp_batch_size = SPACY_BATCH_SIZE
+
+  @cached_property
+  def nlp(self):
+    """spaCy pipeline for NER, loaded on first use; None if the model is not installed.
+
+    Importing spaCy and loading the model take about a second, so both wait until entities are
+    first requested; workers that never run NER never pay for them.
+    """
+    import spacy  # deferred with the model load; slow to import
+
+    # Run spaCy on the GPU when CuPy and a CUDA device are present; must happen before loading.
+    # Returns False without side effects on CPU-only hosts.
+    if spacy.prefer_gpu():
+      self.nlp_batch_size = SPACY_GPU_BATCH_SIZE
+    # Only the entity recognizer is used, so the other components are never loaded or run
     try:
-      self.nlp = spacy.load('en_core_web_sm')
+      return spacy.load('en_core_web_sm', exclude=SPACY_UNUSED_COMPONENTS)
     except OSError:
-      print("Warning: spaCy model 'en_core_web_sm' not found. Using fallback entity extraction.")
+      logger.warning("spaCy model 'en_core_web_sm' not found. Using fallback entity extraction.")
+      return None
 
   async def analyze_text(
     self,
@@ -72,20 +382,45 @@ class AIInsightsEngine:
     customer_name = None
     meeting_date = None
     if extract_customer_info:
-      print(f"Extracting customer info from text (first 200 chars): {text[:200]}...")
-      # Use LLM for customer info extraction
-      customer_name, meeting_date = await self._extract_customer_info(text)
-      print(f"Extracted customer_name: {customer_name}, meeting_date: {meeting_date}")
+      logger.debug('Extracting customer info from text (first 200 chars): %s...', text[:200])
+      # Try the regex extractors first and only ask the LLM for whatever they missed
+      customer_name, meeting_date = fast_extractors.extract_customer_info(text)
+      if meeting_date:
+        meeting_date = self._format_date_consistently(meeting_date)
+      if not (customer_name and meeting_date):
+        llm_customer, llm_date = await self._extract_customer_info(text)
+        customer_name = customer_name or llm_customer
+        meeting_date = meeting_date or llm_date
+      logger.debug('Extracted customer_name: %s, meeting_date: %s', customer_name, meeting_date)
+
+    # Answer what the regex extractors can, then ask for the remaining categories in combined LLM
+    # calls of at most COMBINED_MAX_CATEGORIES each, issued concurrently
+    results = {}
+    pending = []
+    for category in schema.categories:
+      fast_result = self._process_fast_category(text, category)
+      if fast_result:
+        results[category.name] = fast_result
+      else:
+        pending.append(category)
+    groups = [
+      pending[start:start + COMBINED_MAX_CATEGORIES]
+      for start in range(0, len(pending), COMBINED_MAX_CATEGORIES)
+    ]
+    for group_results in await asyncio.gather(
+      *(self._process_all_categories(text, group, fast_mode) for group in groups)
+    ):
+      results.update(group_results)
 
-    # Process each category in the schema
     categories = {}
     for category in schema.categories:
-      print(f"\nProcessing category: {category.name} (type: {category.value_type})")
-      print(f"Category description: {category.description}")
-      if category.value_type == CategoryValueType.PREDEFINED and hasattr(category, 'possible_values'):
-        print(f"Predefined values: {category.possible_values}")
-      category_result = await self._process_category(text, category, fast_mode)
-      print(f"Result for {category.name}: values={category_result.values}, confidence={category_result.confidence}")
+      category_result = results[category.name]
+      logger.debug(
+        'Result for %s: values=%s, confidence=%s',
+        category.name,
+        category_result.values,
+        category_result.confidence,
+      )
       categories[category.name] = category_result
 
     # Calculate processing time
@@ -96,76 +431,74 @@ class AIInsightsEngine:
       meeting_date=meeting_date,
       categories=categories,
       processing_time_ms=int(processing_time),
-      word_count=len(text.split()),
+      word_count=count_words(text),
+    )
+
+  async def analyze_text_batch(
+    self,
+    texts: List[str],
+    schema: SchemaTemplate,
+    extract_customer_info: bool = True,
+    fast_mode: bool = False,
+    max_concurrency: int = 8,
+  ) -> List[Union[QuickAnalysisResult, Exception]]:
+    """Analyze several documents against the same schema.
+
+    Databricks chat serving endpoints take a single conversation per request, so there is no
+    array-input call to fold the documents into. Instead the requests are issued together, at
+    most max_concurrency at a time, and the endpoint batches them server-side. Identical texts
+    (the same file uploaded twice, say) are analyzed once and share the result.
+
+    Args:
+      texts: Document texts to analyze.
+      schema: Schema template to extract.
+      extract_customer_info: Whether to extract customer name and meeting date.
+      fast_mode: Passed through to analyze_text.
+      max_concurrency: Maximum number of documents in flight at once.
+
+    Returns:
+      One entry per text, in input order: the analysis result, or the exception it raised.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def analyze_one(text: str) -> QuickAnalysisResult:
+      async with semaphore:
+        return await self.analyze_text(text, schema, extract_customer_info, fast_mode)
+
+    unique_texts = list(dict.fromkeys(texts))
+    outcomes = await asyncio.gather(
+      *(analyze_one(text) for text in unique_texts), return_exceptions=True
     )
+    for outcome in outcomes:
+      if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+        raise outcome
+    outcome_by_text = dict(zip(unique_texts, outcomes))
+    return [outcome_by_text[text] for text in texts]
 
   async def _extract_customer_info(self, text: str) -> Tuple[Optional[str], Optional[str]]:
     """Extract customer name and meeting date from text using LLM."""
-    prompt = f"""Extract the customer name and meeting date from this text.
-
-Text: {text}
-
-Return a JSON object with these fields:
-- customer_name: The company or customer name (e.g., "7-Eleven", "a16z", "ActiveFence")
-- meeting_date: The date in format "MMM DD, YYYY" (e.g., "Nov 12, 2024", "Mar 11, 2025")
-
-IMPORTANT: Always format dates as "MMM DD, YYYY" where:
-- MMM is the 3-letter month abbreviation (Jan, Feb, Mar, Apr, May, Jun, Jul, Aug, Sep, Oct, Nov, Dec)
-- DD is the 2-digit day (01-31)
-- YYYY is the 4-digit year
-
-If a field is not found, use empty string "".
-
-Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
+    # Long documents are cut down to their head and tail so the prompt stays small
+    if len(text) > CUSTOMER_INFO_HEAD_CHARS + CUSTOMER_INFO_TAIL_CHARS:
+      text = f'{text[:CUSTOMER_INFO_HEAD_CHARS]}\n...\n{text[-CUSTOMER_INFO_TAIL_CHARS:]}'
+    prompt = CUSTOMER_INFO_PROMPT_TMPL.substitute(text=text)
     
-    print(f"Customer extraction prompt length: {len(prompt)} chars")
-    response = await self._query_databricks_model(prompt, max_tokens=500)
-    print(f"Customer extraction response: {response[:200] if response else 'None'}...")
+    logger.debug('Customer extraction prompt length: %s chars', len(prompt))
+    # Only the JSON object is needed, so stop reading as soon as it closes
+    response = await self._query_databricks_model(prompt, max_tokens=500, stream_json=True)
+    logger.debug('Customer extraction response: %s...', response[:200] if response else 'None')
     
     if not response:
-      print("WARNING: No response from LLM for customer extraction")
+      logger.warning('No response from LLM for customer extraction')
       return None, None
     
     try:
-      import json
-      # Extract JSON from response (LLM might include extra text)
-      # Handle markdown code blocks that Gemini often uses
-      if '```json' in response:
-        json_text = response.split('```json')[1].split('```')[0].strip()
-        print(f"Extracted JSON from markdown: {json_text}")
-      elif '```' in response:
-        # Sometimes just ``` without json
-        json_text = response.split('```')[1].split('```')[0].strip()
-        print(f"Extracted from code block: {json_text}")
-      else:
-        # More robust JSON extraction that handles nested objects and arrays
-        # Find the first { and try to match to the last }
-        start_idx = response.find('{')
-        if start_idx == -1:
-          raise ValueError("No JSON found in response")
-        
-        # Try to extract complete JSON by balancing braces
-        brace_count = 0
-        end_idx = start_idx
-        for i in range(start_idx, len(response)):
-          if response[i] == '{':
-            brace_count += 1
-          elif response[i] == '}':
-            brace_count -= 1
-            if brace_count == 0:
-              end_idx = i + 1
-              break
-        
-        if brace_count != 0:
-          # JSON might be truncated, try to extract what we can
-          json_text = response[start_idx:].strip()
-          # Try to fix common truncation issues
-          if json_text.count('{') > json_text.count('}'):
-            json_text += '}' * (json_text.count('{') - json_text.count('}'))
-        else:
-          json_text = response[start_idx:end_idx].strip()
-      
-      data = json.loads(json_text)
+      # Extract JSON from response (LLM might include extra text or markdown code fences); a
+      # truncated object is closed off so the fields that did arrive are still usable
+      json_text = extract_json_lenient(response)
+      if json_text is None:
+        raise ValueError("No JSON found in response")
+
+      data = orjson.loads(json_text)
       
       # Get values and clean them
       customer = data.get('customer_name', '').strip()
@@ -181,24 +514,22 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
       if date:
         date = self._format_date_consistently(date)
       
-      print(f"Successfully extracted - Customer: '{customer}', Date: '{date}'")
+      logger.debug("Successfully extracted - Customer: '%s', Date: '%s'", customer, date)
       return customer, date
     except Exception as e:
-      print(f"ERROR parsing customer extraction JSON: {e}")
-      print(f"Response preview: {response[:500]}")
+      logger.warning('Could not parse customer extraction JSON: %s', e)
+      logger.debug('Response preview: %s', response[:500])
       
       # Try to extract from response text even if JSON parsing failed
-      import re
-      
       # Look for customer_name in various formats
-      customer_match = re.search(r'customer_name["\']?\s*:\s*["\']([^"\']+)["\']', response, re.IGNORECASE)
-      if not customer_match:
-        customer_match = re.search(r'"customer_name"\s*:\s*"([^"]+)"', response)
-      
-      # Look for meeting_date in various formats  
-      date_match = re.search(r'meeting_date["\']?\s*:\s*["\']([^"\']+)["\']', response, re.IGNORECASE)
-      if not date_match:
-        date_match = re.search(r'"meeting_date"\s*:\s*"([^"]+)"', response)
+      customer_match = next(
+        filter(None, (pattern.search(response) for pattern in CUSTOMER_NAME_FIELD_RES)), None
+      )
+
+      # Look for meeting_date in various formats
+      date_match = next(
+        filter(None, (pattern.search(response) for pattern in MEETING_DATE_FIELD_RES)), None
+      )
       
       customer = customer_match.group(1).strip() if customer_match else None
       date = date_match.group(1).strip() if date_match else None
@@ -209,7 +540,7 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
       if date in ["", "null", "None", "N/A", "NA"]:
         date = None
         
-      print(f"Extracted from regex parsing - Customer: '{customer}', Date: '{date}'")
+      logger.debug("Extracted from regex parsing - Customer: '%s', Date: '%s'", customer, date)
       # Format date consistently if found
       if date:
         date = self._format_date_consistently(date)
@@ -217,79 +548,34 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
 
   def _format_date_consistently(self, date_str: str) -> str:
     """Format date to consistent MMM DD, YYYY format."""
-    if not date_str or date_str.strip() == "":
+    stripped = date_str.strip() if date_str else ""
+    if not stripped:
       return ""
-    
+
     try:
-      from dateutil import parser as date_parser
-      
-      # Parse the date string
-      parsed_date = date_parser.parse(date_str, fuzzy=True)
-      
+      # The LLM is asked for this format already, and strptime checks it several times faster
+      # than dateutil's fuzzy parser; anything else goes through dateutil
+      parsed_date = None
+      if len(stripped) in DISPLAY_DATE_LENGTHS:
+        try:
+          parsed_date = datetime.strptime(stripped, DISPLAY_DATE_FORMAT)
+        except ValueError:
+          pass
+      if parsed_date is None:
+        parsed_date = date_parser.parse(date_str, fuzzy=True)
+
       # Format as MMM DD, YYYY
-      formatted = parsed_date.strftime("%b %d, %Y")
-      print(f"Formatted date '{date_str}' -> '{formatted}'")
+      formatted = parsed_date.strftime(DISPLAY_DATE_FORMAT)
+      logger.debug("Formatted date '%s' -> '%s'", date_str, formatted)
       return formatted
       
     except Exception as e:
-      print(f"Could not parse date '{date_str}': {e}")
+      logger.debug("Could not parse date '%s': %s", date_str, e)
       # If parsing fails, return the original if it looks like it's already in correct format
-      import re
-      if re.match(r'^[A-Z][a-z]{2} \d{1,2}, \d{4}$', date_str.strip()):
-        return date_str.strip()
+      if len(stripped) in DISPLAY_DATE_LENGTHS and DISPLAY_DATE_RE.match(stripped):
+        return stripped
       return date_str
 
-  async def _extract_customer_info_fallback(self, text: str) -> Tuple[Optional[str], Optional[str]]:
-    """Fallback method for extracting customer info - kept for compatibility."""
-    customer_name = None
-    meeting_date = None
-    
-    # Look for company patterns
-    company_patterns = [
-        r'(?:meeting with|call with|discussion with)\s+([A-Z]\w+(?:\s+[A-Z]\w+)*)',
-        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:team|customer|client)',
-        r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*[-–:]',
-        r'(\w+\s+Fisher|\w+\s+Corp|\w+\s+Inc|\w+\s+LLC|\w+\s+Ltd)',  # Common company suffixes
-        r'^(\w+(?:\s+\w+)*)\s*\|',  # Company name before pipe character
-    ]
-
-    for pattern in company_patterns:
-      match = re.search(pattern, text, re.MULTILINE | re.IGNORECASE)
-      if match:
-        candidate = match.group(1).strip()
-        # Filter out common non-company words
-        if not any(
-          word in candidate.lower()
-          for word in ['attendees', 'notes', 'tldr', 'eng', 'raw', 'context']
-        ):
-          customer_name = candidate
-          break
-
-    if not meeting_date:
-      # Look for date patterns
-      date_patterns = [
-        r'(\d{1,2}\/\d{1,2}\/\d{4})',
-        r'(\d{1,2}-\d{1,2}-\d{4})',
-        r'((January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4})',
-        r'((Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4})',
-        r'(\d{4}[-/]\d{1,2}[-/]\d{1,2})',  # ISO format
-        r'^((Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4})',  # Start of line dates
-      ]
-
-      for pattern in date_patterns:
-        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-        if match:
-          date_str = match.group(1)
-          # Parse and format the date consistently
-          formatted_date = self._format_date_consistently(date_str)
-          if formatted_date:
-            meeting_date = formatted_date
-          else:
-            meeting_date = date_str  # Fallback to original if parsing fails
-          break
-
-    return customer_name, meeting_date
-
   def _parse_and_format_date(self, date_str: str) -> Optional[str]:
     """Parse a date string and return it in ISO format (YYYY-MM-DD)."""
     if not date_str:
@@ -297,20 +583,13 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
     
     # Remove common prefixes
     cleaned = date_str.strip()
-    for prefix in ['Date:', 'Meeting date:', 'On', 'Meeting on']:
-      if cleaned.lower().startswith(prefix.lower()):
+    for prefix in DATE_PREFIXES:
+      if cleaned.lower().startswith(prefix):
         cleaned = cleaned[len(prefix):].strip()
     
     # Try manual patterns first for exact matches
-    patterns = [
-      (r'^(\d{1,2})/(\d{1,2})/(\d{4})$', lambda m: f"{m.group(3)}-{m.group(1).zfill(2)}-{m.group(2).zfill(2)}"),
-      (r'^(\d{1,2})-(\d{1,2})-(\d{4})$', lambda m: f"{m.group(3)}-{m.group(1).zfill(2)}-{m.group(2).zfill(2)}"),
-      (r'^(\d{4})/(\d{1,2})/(\d{1,2})$', lambda m: f"{m.group(1)}-{m.group(2).zfill(2)}-{m.group(3).zfill(2)}"),
-      (r'^(\d{4})-(\d{1,2})-(\d{1,2})$', lambda m: f"{m.group(1)}-{m.group(2).zfill(2)}-{m.group(3).zfill(2)}"),
-    ]
-    
-    for pattern, formatter in patterns:
-      match = re.match(pattern, cleaned)
+    for pattern, formatter in NUMERIC_DATE_FORMATS:
+      match = pattern.match(cleaned)
       if match:
         try:
           return formatter(match)
@@ -320,9 +599,7 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
     # Try parsing with dateutil parser with stricter settings
     try:
       # Only parse if the string looks like a date
-      if any(month in cleaned for month in ['January', 'February', 'March', 'April', 'May', 'June', 
-                                              'July', 'August', 'September', 'October', 'November', 'December',
-                                              'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']):
+      if any(month in cleaned for month in MONTH_ABBREVIATIONS):
         parsed_date = date_parser.parse(cleaned, fuzzy=False)
         return parsed_date.strftime('%Y-%m-%d')
     except:
@@ -336,53 +613,21 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
     meeting_date = None
 
     # Look for company patterns using regex only
-    company_patterns = [
-      # Numbers-based names like "7-11" or "7-Eleven" (check first to avoid partial matches)
-      r'(\d+[-\s]?Eleven)',
-      r'(?<!\d)(\d{1,2}[-\s]\d{1,2})(?!\d)',  # Pattern for "7-11" (not dates)
-      # Company names ending with Corp, Inc, etc (e.g., TechCorp, DataCorp)
-      r'([A-Z][a-zA-Z]*(?:Corp|Inc|LLC|Ltd))(?:\.)?',
-      # Company with suffix (Corp, Inc, etc) with space
-      r'([A-Z][a-zA-Z]+\s+(?:Corp|Inc|LLC|Ltd))(?:\.)?',
-      # "Meeting with X" where X is 1-3 words ending before "on"
-      r'(?:meeting with|call with|discussion with)\s+([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+){0,2})(?=\s+on\s)',
-      # "Meeting with X" at end of sentence
-      r'(?:meeting with|call with|discussion with)\s+([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+){0,2})(?=[.,]|$)',
-      # "X discussion" or "X meeting" where X is a company name
-      r'([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+){0,2})\s+(?:discussion|meeting|call)',
-      # Company at start of line before colon/dash
-      r'^([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+){0,2})\s*[-–:]',
-      # After "Customer:" or "Client:" label
-      r'(?:Customer|Client):\s*([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+){0,2})',
-      # Before "team", "customer", "client"
-      r'([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+){0,2})\s+(?:team|customer|client)',
-      # Standalone capitalized words that might be company names (fallback)
-      r'^([A-Z][a-zA-Z]+)(?:\s|$)',
-    ]
-
-    for pattern in company_patterns:
-      match = re.search(pattern, text, re.MULTILINE)
+    for pattern in FALLBACK_COMPANY_RES:
+      match = pattern.search(text)
       if match:
         candidate = match.group(1).strip()
         # Filter out common non-company words and overly long matches
-        if (not any(word in candidate.lower() for word in ['attendees', 'notes', 'tldr', 'eng', 'raw', 'context', 'very', 'but', 'with']) 
+        candidate_lower = candidate.lower()
+        if (not any(word in candidate_lower for word in FALLBACK_NON_COMPANY_WORDS)
             and len(candidate.split()) <= 4  # Company names are usually 1-4 words
             and len(candidate) < 50):  # Reasonable length
           customer_name = candidate
           break
 
     # Look for date patterns using regex only
-    date_patterns = [
-      r'(\d{1,2}/\d{1,2}/\d{4})',
-      r'(\d{1,2}-\d{1,2}-\d{4})',
-      r'((January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4})',
-      r'((Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4})',
-      r'(\d{4}[-/]\d{1,2}[-/]\d{1,2})',  # ISO format
-      r'^((Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4})',  # Start of line dates
-    ]
-
-    for pattern in date_patterns:
-      match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+    for pattern in FALLBACK_DATE_RES:
+      match = pattern.search(text)
       if match:
         date_str = match.group(1)
         # Parse and format the date consistently
@@ -397,40 +642,34 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
 
   async def _process_category_fallback(self, text: str, category) -> CategoryResult:
     """Process category using fast fallback methods without AI."""
-    print(f"Processing category '{category.name}' with fallback methods")
+    logger.debug("Processing category '%s' with fallback methods", category.name)
 
     if category.value_type == CategoryValueType.PREDEFINED:
       # Enhanced keyword matching for predefined categories
       found_values = []
       evidence = []
+      text_lower = text.lower()
+      is_satisfaction = category.name.lower() in ['satisfaction', 'satisfaction level']
 
       for value in category.possible_values:
         value_lower = value.lower()
-        text_lower = text.lower()
 
         # Direct match
-        if value_lower in text_lower:
+        idx = text_lower.find(value_lower)
+        if idx != -1:
           found_values.append(value)
           # Find context around the keyword
-          idx = text_lower.find(value_lower)
           start = max(0, idx - 50)
           end = min(len(text), idx + len(value) + 50)
           evidence.append(text[start:end].strip())
 
         # Semantic matching for satisfaction levels
-        elif category.name.lower() in ['satisfaction', 'satisfaction level']:
-          satisfaction_map = {
-            'very satisfied': ['very happy', 'love', 'excellent', 'fantastic'],
-            'satisfied': ['happy', 'pleased', 'good', 'works well'],
-            'neutral': ['okay', 'average', 'fine'],
-            'dissatisfied': ['frustrated', 'struggling', 'issues', 'problems', 'slow'],
-            'very dissatisfied': ['very frustrated', 'angry', 'terrible', 'awful'],
-          }
-          if value_lower in satisfaction_map:
-            for keyword in satisfaction_map[value_lower]:
-              if keyword in text_lower:
+        elif is_satisfaction:
+          if value_lower in SATISFACTION_KEYWORDS:
+            for keyword in SATISFACTION_KEYWORDS[value_lower]:
+              idx = text_lower.find(keyword)
+              if idx != -1:
                 found_values.append(value)
-                idx = text_lower.find(keyword)
                 start = max(0, idx - 50)
                 end = min(len(text), idx + len(keyword) + 50)
                 evidence.append(text[start:end].strip())
@@ -449,29 +688,20 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
       found_values = []
       evidence = []
       category_lower = category.name.lower()
+      text_lower = text.lower()
 
       # Pain points extraction
       if any(pattern in category_lower for pattern in ['pain', 'challenge', 'issue', 'problem']):
-        pain_patterns = [
-          r'(?:frustrated|struggling|issues?|problems?) (?:with|about|regarding) ([^.,]+)',
-          r'(slow (?:performance|response|processing|loading|speed))',
-          r'((?:lack|lacking|missing|need|needs) (?:of |for |better )?[^.,]+)',
-          r'((?:difficult|hard|challenging) to [^.,]+)',
-          r'((?:can\'t|cannot|unable to) [^.,]+)',
-          r'(takes? (?:too long|hours|forever|ages))',
-          r'((?:poor|bad|terrible) [^.,]+)',
-        ]
-
-        for pattern in pain_patterns:
-          matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in PAIN_POINT_RES:
+          matches = pattern.findall(text)
           for match in matches:
             value = match.strip()
             # Clean up the match
-            value = re.sub(r'^(with|about|regarding|of|for)\s+', '', value)
+            value = PAIN_POINT_PREFIX_RE.sub('', value)
             if len(value) > 5 and len(value) < 100:  # Reasonable length
               found_values.append(value)
               # Find context
-              idx = text.lower().find(match.lower())
+              idx = text_lower.find(match.lower())
               if idx >= 0:
                 start = max(0, idx - 30)
                 end = min(len(text), idx + len(match) + 30)
@@ -483,21 +713,13 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
       elif any(
         pattern in category_lower for pattern in ['feature', 'request', 'need', 'requirement']
       ):
-        request_patterns = [
-          r'(?:need|needs?|want|wants?) (?:to have |for |better |improved |new )?([^.,]+)',
-          r'(?:would like|we\'d like) (?:to have |to see |better )?([^.,]+)',
-          r'(?:looking for|interested in) ([^.,]+)',
-          r'(?:it would be (?:great|nice|helpful) (?:to have|if)) ([^.,]+)',
-          r'(?:feature request|request):\s*([^.,]+)',
-          r'(?:wishlist|wish list):\s*([^.,]+)',
-        ]
-
-        for pattern in request_patterns:
-          matches = re.findall(pattern, text, re.IGNORECASE)
+        sentences = text.split('.')
+        for pattern in FEATURE_REQUEST_RES:
+          matches = pattern.findall(text)
           for match in matches:
             value = match.strip()
             # Clean up the match
-            value = re.sub(r'^(to |for |if |have |see )\s*', '', value)
+            value = FEATURE_REQUEST_PREFIX_RE.sub('', value)
             # Skip if too short or contains only common words
             if len(value) > 8 and not all(
               word in ['the', 'a', 'an', 'to', 'it', 'that', 'this']
@@ -505,7 +727,6 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
             ):
               found_values.append(value)
               # Find evidence
-              sentences = text.split('.')
               for sentence in sentences:
                 if match.lower() in sentence.lower():
                   evidence.append(sentence.strip())
@@ -515,59 +736,26 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
 
       # Industry extraction
       elif 'industry' in category_lower:
-        industry_keywords = {
-          'e-commerce': ['e-commerce', 'ecommerce', 'online retail', 'online store', 'marketplace'],
-          'financial services': [
-            'financial',
-            'banking',
-            'fintech',
-            'insurance',
-            'trading',
-            'payments',
-          ],
-          'healthcare': ['healthcare', 'medical', 'hospital', 'health', 'pharma', 'clinical'],
-          'technology': [
-            'software',
-            'saas',
-            'tech company',
-            'it company',
-            'technology',
-            'platform',
-          ],
-          'retail': ['retail', 'store', 'shops', 'merchandising', 'pos', 'point of sale'],
-          'manufacturing': ['manufacturing', 'factory', 'production', 'assembly', 'industrial'],
-          'media': ['media', 'entertainment', 'streaming', 'content', 'publishing', 'broadcasting'],
-        }
-
-        text_lower = text.lower()
-        for industry, keywords in industry_keywords.items():
+        for industry, keywords in INDUSTRY_KEYWORDS.items():
           for keyword in keywords:
-            if keyword in text_lower:
-              if industry not in found_values:
-                found_values.append(industry)
-                idx = text_lower.find(keyword)
-                start = max(0, idx - 50)
-                end = min(len(text), idx + len(keyword) + 50)
-                evidence.append(text[start:end].strip())
-                break
+            idx = text_lower.find(keyword)
+            if idx != -1:
+              found_values.append(industry)
+              start = max(0, idx - 50)
+              end = min(len(text), idx + len(keyword) + 50)
+              evidence.append(text[start:end].strip())
+              break
 
       # Use case extraction
       elif 'use case' in category_lower:
-        use_case_patterns = [
-          r'(?:use|using|used) (?:it |this |that )?(?:for|to) ([^.,]+)',
-          r'(?:helps?|helping) (?:us |them )?(?:with|to) ([^.,]+)',
-          r'(?:solution for|platform for) ([^.,]+)',
-          r'(?:enables?|enabling) ([^.,]+)',
-        ]
-
-        for pattern in use_case_patterns:
-          matches = re.findall(pattern, text, re.IGNORECASE)
+        sentences = text.split('.')
+        for pattern in USE_CASE_RES:
+          matches = pattern.findall(text)
           for match in matches:
             value = match.strip()
             if len(value) > 10 and len(value) < 80:
               found_values.append(value)
               # Find context
-              sentences = text.split('.')
               for sentence in sentences:
                 if match.lower() in sentence.lower():
                   evidence.append(sentence.strip())
@@ -578,16 +766,9 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
       # Customer/company extraction (for backward compatibility)
       elif any(pattern in category_lower for pattern in ['customer', 'company', 'client']):
         # Look for company names with common patterns
-        company_patterns = [
-          r'\b([A-Z][a-zA-Z]+(?:\s+(?:Corp|Inc|Ltd|LLC|Co|Company))?)\b',
-          r'meeting with ([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*)',
-          r'client ([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*)',
-        ]
-
         companies_found = set()
-        for pattern in company_patterns:
-          matches = re.findall(pattern, text)
-          companies_found.update(matches)
+        for pattern in FALLBACK_CATEGORY_COMPANY_RES:
+          companies_found.update(pattern.findall(text))
 
         # Filter out common non-company words
         skip_words = [
@@ -615,18 +796,10 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
         if category.description:
           desc_lower = category.description.lower()
           if 'satisfaction' in desc_lower or 'sentiment' in desc_lower:
-            sentiment_words = [
-              'happy',
-              'satisfied',
-              'frustrated',
-              'disappointed',
-              'pleased',
-              'concerned',
-            ]
-            for word in sentiment_words:
-              if word in text.lower():
+            for word in SENTIMENT_WORDS:
+              idx = text_lower.find(word)
+              if idx != -1:
                 found_values.append(word)
-                idx = text.lower().find(word)
                 start = max(0, idx - 30)
                 end = min(len(text), idx + len(word) + 30)
                 evidence.append(text[start:end].strip())
@@ -640,14 +813,18 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
       )
 
   async def _process_category(self, text: str, category, fast_mode: bool = False) -> CategoryResult:
-    """Process a single category using AI only."""
+    """Process a single category, trying the regex extractors before the LLM."""
+    fast_result = self._process_fast_category(text, category)
+    if fast_result:
+      return fast_result
+
     # Always use LLM, no fallback
     result = None
     
     # Try extraction, with one retry if we get empty result
     for attempt in range(2):
       if attempt > 0:
-        print(f"\nRetrying extraction for {category.name} (attempt {attempt + 1}/2)")
+        logger.debug('Retrying extraction for %s (attempt %s/2)', category.name, attempt + 1)
         
       if category.value_type == CategoryValueType.PREDEFINED:
         result = await self._process_predefined_category(text, category)
@@ -660,17 +837,131 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
       
       # Otherwise, we'll retry once
       if attempt == 0:
-        print(f"Got empty result for {category.name}, will retry once")
+        logger.debug('Got empty result for %s, will retry once', category.name)
         await asyncio.sleep(1)  # Brief pause before retry
     
     return result
 
-  async def _query_databricks_model(self, prompt: str, max_tokens: int = 500) -> Optional[str]:
-    """Query the Databricks Foundation Model endpoint."""
+  async def _process_all_categories(
+    self, text: str, categories: list, fast_mode: bool = False
+  ) -> dict:
+    """Extract several categories with a single LLM request.
+
+    Categories missing or malformed in the combined answer are extracted individually with
+    _process_category, concurrently.
+
+    Returns:
+      Mapping of category name to CategoryResult, for every category passed in.
+    """
+    category_lines = []
+    for category in categories:
+      description = category.description or f'Infer {category.name} from the document.'
+      line = f"- {category.name}: {description.rstrip('.')}."
+      if category.value_type == CategoryValueType.PREDEFINED and category.possible_values:
+        line += f" Choose only from: {', '.join(category.possible_values)}."
+      category_lines.append(line)
+    prompt = COMBINED_CATEGORIES_PROMPT_TMPL.substitute(
+      categories='\n'.join(category_lines), text=text
+    )
+
+    if logger.isEnabledFor(logging.DEBUG):
+      logger.debug(
+        '=== COMBINED CATEGORY EXTRACTION: %s ===', [category.name for category in categories]
+      )
+    logger.debug('Sending prompt to LLM (length: %s chars)', len(prompt))
+    response_text = await self._query_databricks_model(
+      prompt, max_tokens=COMBINED_TOKENS_PER_CATEGORY * len(categories)
+    )
+
+    data = {}
+    json_text = extract_first_json(response_text) if response_text else None
+    if json_text:
+      # extract_first_json only returns text orjson has already parsed
+      parsed = orjson.loads(json_text)
+      if isinstance(parsed, dict):
+        data = parsed
+    else:
+      logger.debug('No JSON found in combined category response')
+
+    results = {}
+    missing = []
+    for category in categories:
+      entry = data.get(category.name)
+      if isinstance(entry, dict) and isinstance(entry.get('values', []), list):
+        evidence = entry.get('evidence', [])
+        try:
+          results[category.name] = CategoryResult(
+            category_name=category.name,
+            values=[str(value) for value in entry.get('values', []) if value],
+            confidence=entry.get('confidence', 0.5),
+            evidence_text=[str(e) for e in evidence] if isinstance(evidence, list) else [],
+            model_used=self.model_endpoint,
+          )
+          continue
+        except ValueError as e:
+          logger.warning('Invalid combined result for %s: %s', category.name, e)
+      logger.debug('%s missing from combined response, extracting it on its own', category.name)
+      missing.append(category)
+
+    fallback_results = await asyncio.gather(
+      *(self._process_category(text, category, fast_mode) for category in missing)
+    )
+    for category, result in zip(missing, fallback_results):
+      results[category.name] = result
+    return results
+
+  def _process_fast_category(self, text: str, category) -> Optional[CategoryResult]:
+    """Answer customer name / meeting date categories with a regex match, if one is found."""
+    extractor = fast_extractors.FAST_CATEGORY_EXTRACTORS.get(category.name.strip().lower())
+    if not extractor:
+      return None
+    value = extractor(text)
+    if not value:
+      return None
+    logger.debug('Fast extractor matched %s: %s', category.name, value)
+    evidence = value
+    if extractor is fast_extractors.find_meeting_date:
+      value = self._format_date_consistently(value)
+    return CategoryResult(
+      category_name=category.name,
+      values=[value],
+      confidence=fast_extractors.FAST_CONFIDENCE,
+      evidence_text=[evidence],
+      model_used='regex',
+    )
+
+  @staticmethod
+  def _response_cache_key(prompt: str, max_tokens: int, stream_json: bool) -> str:
+    """Digest of a model request, fed in pieces so the prompt is not copied into a larger string.
+
+    Streamed requests cache only the JSON value rather than the whole reply, so they are keyed
+    separately from plain requests for the same prompt.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(prompt.encode())
+    digest.update(max_tokens.to_bytes(4, 'little'))
+    digest.update(b'\x01' if stream_json else b'\x00')
+    return digest.hexdigest()
+
+  async def _query_databricks_model(
+    self,
+    prompt: str,
+    max_tokens: int = 500,
+    stream_json: bool = False,
+    preferred_endpoints: Sequence[str] = (),
+  ) -> Optional[str]:
+    """Query the Databricks Foundation Model endpoint.
+
+    With stream_json, the reply is streamed and only its first JSON object or array is returned,
+    as soon as it is complete. The first of preferred_endpoints that is healthy is tried ahead of
+    the usual order, for this call only.
+    """
     # TEMPORARY: Use mock responses for testing while LLMs are rate limited
-    if os.getenv('USE_MOCK_LLM', 'false').lower() == 'true':
-      print("  Using mock LLM response for testing")
-      if "customer" in prompt.lower():
+    if get_settings().use_mock_llm:
+      logger.debug('Using mock LLM response for testing')
+      if prompt.startswith('Extract the following categories'):
+        return '{}'
+      elif "customer" in prompt.lower():
         return '{"customer_name": "ACME Corp", "meeting_date": "2025-01-15"}'
       elif "predefined" in prompt.lower():
         return '{"values": ["Vector Search"], "evidence": ["needs Vector Search"], "confidence": 0.9}'
@@ -678,393 +969,265 @@ Example: {{"customer_name": "7-Eleven", "meeting_date": "Nov 12, 2024"}}"""
         return '{"values": ["product catalog search"], "evidence": ["for their product catalog"], "confidence": 0.8}'
     
     if not self.databricks_client or not self.available_endpoints:
-      print('Databricks client or endpoints not available')
+      logger.warning('Databricks client or endpoints not available')
       return None
     
     # Check cache first - make cache key more specific
     # Include more context to prevent cache collisions
-    import hashlib
-    cache_key = hashlib.md5(f"{prompt}_{max_tokens}".encode()).hexdigest()
+    cache_key = self._response_cache_key(prompt, max_tokens, stream_json)
     if cache_key in self._cache:
       cached_response = self._cache[cache_key]
       # Don't use cached empty responses
       if cached_response and cached_response.strip():
-        print("  Using cached response")
+        logger.debug('Using cached response')
         return cached_response
       else:
-        print("  Removing empty cached response")
+        logger.debug('Removing empty cached response')
         del self._cache[cache_key]
 
-    # Try each endpoint until one works
-    for endpoint_idx, endpoint in enumerate(self.available_endpoints):
-      print(f'\nTrying LLM endpoint {endpoint_idx + 1}/{len(self.available_endpoints)}: {endpoint}')
-      
-      # Retry logic for rate limits
-      for retry in range(3):
-        try:
-          # Create ChatMessage for the user prompt
-          messages = [ChatMessage(role=ChatMessageRole.USER, content=prompt)]
-
-          # Query with a reasonable timeout
-          print(f'  Attempt {retry + 1}/3: Sending request...')
-          
-          # Make the synchronous call in a thread to avoid blocking
-          import asyncio
-          response = await asyncio.wait_for(
-            asyncio.to_thread(
-              self.databricks_client.serving_endpoints.query,
-              name=endpoint, 
-              messages=messages, 
-              max_tokens=max_tokens, 
-              temperature=0.1
-            ),
-            timeout=120.0  # 120 second timeout to give LLM more time
-          )
+    # Try each healthy endpoint, in priority order, until one works. The first two are hedged: if
+    # the preferred endpoint has not answered within HEDGE_DELAY_SECS, the next one is asked as
+    # well, the first usable reply wins and the other request is cancelled. The rest are tried
+    # one at a time.
+    candidates = get_endpoint_router().candidates(self.available_endpoints)
+    preferred = next((endpoint for endpoint in preferred_endpoints if endpoint in candidates), None)
+    if preferred:
+      logger.debug('Prioritizing %s', preferred)
+      candidates.remove(preferred)
+      candidates.insert(0, preferred)
+    messages = [{'role': 'user', 'content': prompt}]
+
+    def attempt(endpoint_idx: int):
+      endpoint = candidates[endpoint_idx]
+      logger.debug('Trying LLM endpoint %s/%s: %s', endpoint_idx + 1, len(candidates), endpoint)
+      # Only the last candidate waits out Retry-After delays and retries
+      is_last = endpoint_idx == len(candidates) - 1
+      max_attempts = get_settings().serving_max_attempts if is_last else 1
+      return self._query_endpoint(endpoint, messages, max_tokens, stream_json, max_attempts)
+
+    content = None
+    tasks = [asyncio.create_task(attempt(0))]
+    try:
+      if len(candidates) > 1:
+        done, _ = await asyncio.wait(tasks, timeout=HEDGE_DELAY_SECS)
+        if not done:
+          logger.debug('No reply after %.0fs, also asking the next endpoint', HEDGE_DELAY_SECS)
+          tasks.append(asyncio.create_task(attempt(1)))
+      pending = set(tasks)
+      while pending and not content:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        content = next((task.result() for task in done if task.result()), None)
+    finally:
+      # Cancel the slower hedged request, or both if this call itself was cancelled
+      for task in tasks:
+        task.cancel()
+
+    endpoint_idx = len(tasks)
+    while not content and endpoint_idx < len(candidates):
+      content = await attempt(endpoint_idx)
+      endpoint_idx += 1
+
+    if content:
+      # Reset failure counter on success
+      self.consecutive_failures = 0
+      self.llm_available = True
 
-          print(f'  ✓ Success with {endpoint}!')
-
-          # Extract the response content
-          if response.choices and len(response.choices) > 0:
-            content = response.choices[0].message.content
-            print(f'  Response length: {len(content)} chars')
-            print(f'  Response preview: {content[:200]}...')
-            if len(content) < 500:
-              print(f'  Full response: {content}')
-            
-            # If content is empty, try next endpoint instead of returning empty
-            if not content or not content.strip():
-              print(f'  Empty response from {endpoint}, trying next endpoint...')
-              break  # Try next endpoint
-            
-            # Reset failure counter on success
-            self.consecutive_failures = 0
-            self.llm_available = True
-            # Update primary endpoint for future calls
-            if endpoint_idx > 0:
-              self.available_endpoints[0], self.available_endpoints[endpoint_idx] = (
-                self.available_endpoints[endpoint_idx], self.available_endpoints[0]
-              )
-            
-            # Cache the response
-            self._cache[cache_key] = content
-            if len(self._cache) > self._cache_max_size:
-              # Remove oldest entry
-              self._cache.pop(next(iter(self._cache)))
-            
-            return content
-          else:
-            print('  No choices found in response')
-            break  # Don't retry for empty responses
-
-        except asyncio.TimeoutError:
-          print(f'  Timeout after 120 seconds')
-          self.consecutive_failures += 1
-          break  # Don't retry timeouts, try next endpoint
-        except Exception as e:
-          error_str = str(e)[:200]
-          print(f'  Error: {error_str}')
-          
-          # Check for rate limit error
-          if 'REQUEST_LIMIT_EXCEEDED' in error_str or 'rate limit' in error_str.lower():
-            if retry < 2:
-              wait_time = (retry + 1) * 10  # 10s, 20s
-              print(f'  Rate limited. Waiting {wait_time} seconds before retry...')
-              await asyncio.sleep(wait_time)
-              continue
-            else:
-              print('  Rate limited after 3 attempts. Trying next endpoint.')
-              break
-          
-          # If it's an upstream error or endpoint not found, try next
-          if 'upstream' in error_str.lower() or 'not found' in error_str.lower():
-            break
-          
-          # For other errors, don't retry
-          self.consecutive_failures += 1
-          break
-    
-    print('\nAll LLM endpoints failed.')
+      # Cache the response; the store drops the least recently used entry once full
+      self._cache[cache_key] = content
+
+      return content
+
+    logger.warning('All LLM endpoints failed.')
     # Mark LLM as unavailable after multiple failures
     if self.consecutive_failures >= self.max_consecutive_failures:
       self.llm_available = False
-      print('  Disabling LLM usage due to repeated failures')
+      logger.warning('Disabling LLM usage due to repeated failures')
     return None
 
-  async def _process_predefined_category(self, text: str, category) -> CategoryResult:
-    """Process a category with predefined values using document comprehension."""
-    
-    # Simple definitions for Vector Search schema categories
-    if category.name == "Usage Pattern":
-      guidance = "Describes the data processing frequency for the customer's use case, such as 'Real Time' or 'Batch'."
-
-    elif category.name == "Product":
-      guidance = "The specific Databricks product or feature that is the main topic of discussion in the meeting. This can include 'Vector Search,' 'Embedding FT' (Fine-Tuning), or 'Unstructured'."
-
-    elif category.name == "Search Tags":  
-      guidance = "The primary application of the search technology being discussed. This could be for 'RAG' (Retrieval-Augmented Generation), general 'Search,' or 'Matching' data records."
-
-    elif category.name == "Unstructured Tags":
-      guidance = "Highlights use cases involving the processing of unstructured data, often for 'RAG' or 'Automation' of tasks like document parsing."
-
-    elif category.name == "End User Tags":
-      guidance = "Specifies whether the end-users of the application being built are 'Internal' to the customer's company or 'External' clients."
-
-    elif category.name == "Production Status":
-      guidance = "Indicates whether the customer's application or the specific use case being discussed is live and operational in a production environment. Return 'Production' only if it's live in production, otherwise return empty array."
-
-    else:
-      guidance = f"Analyze the document and select appropriate options for {category.name} based on the content."
-    
-    # Special formatting for different categories
-    if category.name == "Usage Pattern":
-      prompt = f"""Extract {category.name} from the document.
-
-Options: {', '.join(category.possible_values)}
+  async def _query_endpoint(
+    self,
+    endpoint: str,
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+    stream_json: bool,
+    max_attempts: int,
+  ) -> Optional[str]:
+    """Send one chat request to a serving endpoint and record the outcome with the router.
+
+    Returns:
+      The reply text, or None if the endpoint failed or answered with nothing.
+    """
+    router = get_endpoint_router()
+    try:
+      logger.debug('Sending request...')
+
+      # Call the endpoint's REST API over the shared keep-alive HTTP client; call_with_retry
+      # paces requests through the endpoint's limiter. A throttled endpoint is routed around
+      # straight away unless it is allowed more than one attempt.
+      query = stream_serving_json if stream_json else query_serving_endpoint
+      response = await call_with_retry(
+        lambda: asyncio.wait_for(
+          query(endpoint, messages, max_tokens=max_tokens, temperature=0.1),
+          timeout=120.0,  # 120 second timeout to give LLM more time
+        ),
+        endpoint,
+        max_attempts=max_attempts,
+      )
 
-Definition: {guidance}
+      logger.debug('Success with %s!', endpoint)
+      router.record_success(endpoint)
 
-Text: "{text}"
+      # Extract the response content
+      if stream_json:
+        content = response
+      else:
+        choices = response.get('choices')
+        if not choices:
+          logger.debug('No choices found in response')
+          return None
+        content = (choices[0].get('message') or {}).get('content') or ''
+      logger.debug('Response length: %s chars', len(content))
+      logger.debug('Response preview: %s...', content[:200])
+      if len(content) < 500:
+        logger.debug('Full response: %s', content)
+
+      # If content is empty, try next endpoint instead of returning empty
+      if not content or not content.strip():
+        logger.debug('Empty response from %s, trying next endpoint...', endpoint)
+        return None
+
+      return content
+
+    except (asyncio.TimeoutError, httpx.TimeoutException):
+      logger.warning('Timeout after 120 seconds from %s', endpoint)
+      self.consecutive_failures += 1
+      router.record_throttled(endpoint)
+      router.record_failure(endpoint)
+    except Exception as e:
+      error_str = str(e)[:200]
+      logger.warning('Error from %s: %s', endpoint, error_str)
 
-Return JSON: {{"values": ["option"], "evidence": ["quote"]}}"""
-    else:
-      prompt = f"""Extract {category.name} from the document.
+      if is_rate_limit_error(e):
+        logger.warning('Rate limited by %s. Trying next endpoint.', endpoint)
+        router.record_throttled(endpoint)
+        return None
 
-Options: {', '.join(category.possible_values)}
+      router.record_failure(endpoint)
 
-Definition: {guidance}
+      # If it's an upstream error or endpoint not found, try next
+      if 'upstream' in error_str.lower() or 'not found' in error_str.lower():
+        return None
 
-Text: "{text}"
+      # For other errors, count the failure and move on
+      self.consecutive_failures += 1
+    return None
 
-Return JSON: {{"values": ["option"], "evidence": ["quote"], "confidence": 0.9}}"""
+  async def _process_predefined_category(self, text: str, category) -> CategoryResult:
+    """Process a category with predefined values using document comprehension."""
+    
+    # Simple definitions for Vector Search schema categories
+    guidance = PREDEFINED_CATEGORY_GUIDANCE.get(category.name) or (
+      f'Analyze the document and select appropriate options for {category.name} based on the '
+      'content.'
+    )
+    
+    # Usage Pattern answers are not asked for a confidence
+    prompt = PREDEFINED_CATEGORY_PROMPT_TMPL.substitute(
+      name=category.name,
+      options=', '.join(category.possible_values),
+      guidance=guidance,
+      text=text,
+      reply_format=(
+        PREDEFINED_REPLY_FORMAT_NO_CONFIDENCE
+        if category.name == 'Usage Pattern'
+        else PREDEFINED_REPLY_FORMAT
+      ),
+    )
 
     # Try Databricks Foundation Model first
-    print(f"\n=== PREDEFINED CATEGORY EXTRACTION: {category.name} ===")
-    print(f"Sending prompt to LLM (length: {len(prompt)} chars)")
+    logger.debug('=== PREDEFINED CATEGORY EXTRACTION: %s ===', category.name)
+    logger.debug('Sending prompt to LLM (length: %s chars)', len(prompt))
     
     # For problematic categories, try a different model first
-    if category.name in ["Search Tags", "Unstructured Tags"]:
-      print(f"⚠️  {category.name} is problematic, trying different model order...")
-      # Temporarily reorder endpoints to try Claude or Gemini Pro first
-      original_endpoints = self.available_endpoints.copy()
-      # Move claude or gemini-pro to front if available
-      for priority_model in ['databricks-claude-3-7-sonnet', 'databricks-gemini-2-5-pro']:
-        if priority_model in self.available_endpoints:
-          self.available_endpoints.remove(priority_model)
-          self.available_endpoints.insert(0, priority_model)
-          print(f"Prioritizing {priority_model} for {category.name}")
-          break
-      
-      response_text = await self._query_databricks_model(prompt, max_tokens=1000)
-      
-      # Restore original order
-      self.available_endpoints = original_endpoints
-    else:
-      response_text = await self._query_databricks_model(prompt, max_tokens=1000)
-
-    if response_text:
-      try:
-        print(f'Raw Foundation Model response: {response_text[:500]}...')
-        
-        # Check if response is empty or just whitespace
-        if not response_text.strip():
-          print("ERROR: LLM returned empty response")
-          raise ValueError("Empty response from LLM")
-
-        # Extract JSON from response (in case there's extra text)
-        json_text = ''
-        if '```json' in response_text:
-          json_text = response_text.split('```json')[1].split('```')[0].strip()
-          print(f'Extracted JSON: {json_text}')
-        else:
-          # More robust JSON extraction that handles nested objects and arrays
-          start_idx = response_text.find('{')
-          if start_idx == -1:
-            print(f'No JSON pattern found in response: {response_text[:200]}')
-            raise ValueError('No valid JSON found in response')
-          
-          # Try to extract complete JSON by balancing braces
-          brace_count = 0
-          end_idx = start_idx
-          for i in range(start_idx, len(response_text)):
-            if response_text[i] == '{':
-              brace_count += 1
-            elif response_text[i] == '}':
-              brace_count -= 1
-              if brace_count == 0:
-                end_idx = i + 1
-                break
-          
-          if brace_count != 0:
-            # JSON might be truncated, try to extract what we can
-            json_text = response_text[start_idx:].strip()
-            # Fix unterminated strings
-            lines = json_text.split('\n')
-            for i in range(len(lines)):
-              line = lines[i].strip()
-              # Count quotes in the line
-              quote_count = line.count('"')
-              if quote_count % 2 == 1:  # Odd number of quotes means unterminated string
-                if line.endswith(','):
-                  lines[i] = line[:-1] + '"'  # Close the string before comma
-                else:
-                  lines[i] = line + '"'  # Just close the string
-            json_text = '\n'.join(lines)
-            
-            # Remove trailing comma if present
-            json_text = json_text.rstrip().rstrip(',')
-            # Try to fix common truncation issues
-            if json_text.count('[') > json_text.count(']'):
-              json_text += ']' * (json_text.count('[') - json_text.count(']'))
-            if json_text.count('{') > json_text.count('}'):
-              json_text += '}' * (json_text.count('{') - json_text.count('}'))
-            print(f'Extracted JSON (with truncation fix): {json_text}')
-          else:
-            json_text = response_text[start_idx:end_idx].strip()
-            print(f'Extracted JSON: {json_text}')
-        
-        result_data = json.loads(json_text)
-
-        print(f'Parsed JSON data successfully: {result_data}')
-
-        # Validate extracted values
-        extracted_values = result_data.get('values', [])
-        if not extracted_values or (len(extracted_values) == 1 and not extracted_values[0]):
-          print(f"WARNING: No valid values extracted for {category.name}")
-          extracted_values = []
-        
-        print(f"Successfully extracted {len(extracted_values)} values for {category.name}: {extracted_values}")
-        
-        return CategoryResult(
-          category_name=category.name,
-          values=extracted_values,
-          confidence=result_data.get('confidence', 0.5),
-          evidence_text=result_data.get('evidence', []),
-          model_used=self.model_endpoint,
-        )
-      except json.JSONDecodeError as e:
-        print(f'JSON parsing error: {e}')
-        print(f'Attempted to parse: {json_text if "json_text" in locals() else "N/A"}')
-      except Exception as e:
-        print(f'Error parsing Databricks model response: {e}')
-        print(f'Response was: {response_text[:200]}...')
-
-    # No fallback - return empty result if LLM fails
-    print(f"\n!!! WARNING: Failed to extract {category.name} - returning empty result")
-    print(f"Category type: {category.value_type}")
-    if hasattr(category, 'possible_values'):
-      print(f"Possible values: {category.possible_values}")
-    return CategoryResult(
-      category_name=category.name,
-      values=[],
-      confidence=0.0,
-      evidence_text=[],
-      model_used="none",
-      error="LLM extraction failed - no response or parsing error"
+    preferred_endpoints = PREFERRED_CATEGORY_ENDPOINTS.get(category.name, ())
+    response_text = await self._query_databricks_model(
+      prompt, max_tokens=1000, preferred_endpoints=preferred_endpoints
     )
 
+    return self._category_result_from_response(category, response_text)
+
   async def _process_inferred_category(self, text: str, category) -> CategoryResult:
     """Process a category where values should be inferred by AI using document comprehension."""
     
-    # Simple guidance focusing on document understanding  
-    if category.name == "Industry":
-      guidance = "Read the document and identify the customer's PRIMARY industry sector. Return only ONE industry that best describes their main business."
-    elif category.name == "Use Case":
-      guidance = "Read the document and understand what specific business problem or application they want to solve. Focus on the business value they're trying to create."
-    else:
-      guidance = f"Read the document and understand what they describe related to {category.name}."
+    # Simple guidance focusing on document understanding
+    guidance = INFERRED_CATEGORY_GUIDANCE.get(category.name) or (
+      f'Read the document and understand what they describe related to {category.name}.'
+    )
     
     # Special handling for Industry to ensure single value
-    if category.name == "Industry":
-      prompt = f"""{guidance}
+    prompt = INFERRED_CATEGORY_PROMPT_TMPL.substitute(
+      guidance=guidance,
+      text=text,
+      reply_format=(
+        INFERRED_INDUSTRY_REPLY_FORMAT if category.name == 'Industry' else INFERRED_REPLY_FORMAT
+      ),
+    )
 
-Text: "{text}"
+    # Try Databricks Foundation Model first
+    logger.debug('=== INFERRED CATEGORY EXTRACTION: %s ===', category.name)
+    logger.debug('Prompt for %s (first 500 chars):\n%s...', category.name, prompt[:500])
+    logger.debug('Full prompt length: %s chars', len(prompt))
+    response_text = await self._query_databricks_model(prompt, max_tokens=1000)
 
-Return JSON only: {{"values": ["industry"], "evidence": ["text"]}}"""
-    else:
-      prompt = f"""{guidance}
+    return self._category_result_from_response(category, response_text)
 
-Text: "{text}"
+  def _category_result_from_response(
+    self, category, response_text: Optional[str]
+  ) -> CategoryResult:
+    """Parse a category extraction reply into a CategoryResult.
 
-JSON: {{"values": ["value"], "evidence": ["text"], "confidence": 0.9}}"""
+    Shared by the predefined and inferred category paths, which ask for the same JSON shape.
 
-    # Try Databricks Foundation Model first
-    print(f"\n=== INFERRED CATEGORY EXTRACTION: {category.name} ===")
-    print(f"Prompt for {category.name} (first 500 chars):\n{prompt[:500]}...")
-    print(f"Full prompt length: {len(prompt)} chars")
-    response_text = await self._query_databricks_model(prompt, max_tokens=1000)
+    Args:
+      category: The schema category the reply is for.
+      response_text: The model reply, or None if every endpoint failed.
 
+    Returns:
+      The extracted values, or an empty result with an error if the reply held no usable JSON.
+    """
     if response_text:
       try:
-        print(f'Raw Foundation Model response (inferred): {response_text[:500]}...')
+        logger.debug('Raw Foundation Model response: %s...', response_text[:500])
         
         # Check if response is empty or just whitespace
         if not response_text.strip():
-          print("ERROR: LLM returned empty response")
+          logger.warning('LLM returned empty response')
           raise ValueError("Empty response from LLM")
 
-        # Extract JSON from response (in case there's extra text)
-        json_text = ''
-        if '```json' in response_text:
-          json_text = response_text.split('```json')[1].split('```')[0].strip()
-          print(f'Extracted JSON (inferred): {json_text}')
-        else:
-          # More robust JSON extraction that handles nested objects and arrays
-          start_idx = response_text.find('{')
-          if start_idx == -1:
-            print(f'No JSON pattern found in response (inferred): {response_text[:200]}')
-            raise ValueError('No valid JSON found in response')
-          
-          # Try to extract complete JSON by balancing braces
-          brace_count = 0
-          end_idx = start_idx
-          for i in range(start_idx, len(response_text)):
-            if response_text[i] == '{':
-              brace_count += 1
-            elif response_text[i] == '}':
-              brace_count -= 1
-              if brace_count == 0:
-                end_idx = i + 1
-                break
-          
-          if brace_count != 0:
-            # JSON might be truncated, try to extract what we can
-            json_text = response_text[start_idx:].strip()
-            # Fix unterminated strings
-            lines = json_text.split('\n')
-            for i in range(len(lines)):
-              line = lines[i].strip()
-              # Count quotes in the line
-              quote_count = line.count('"')
-              if quote_count % 2 == 1:  # Odd number of quotes means unterminated string
-                if line.endswith(','):
-                  lines[i] = line[:-1] + '"'  # Close the string before comma
-                else:
-                  lines[i] = line + '"'  # Just close the string
-            json_text = '\n'.join(lines)
-            
-            # Remove trailing comma if present
-            json_text = json_text.rstrip().rstrip(',')
-            # Try to fix common truncation issues
-            if json_text.count('[') > json_text.count(']'):
-              json_text += ']' * (json_text.count('[') - json_text.count(']'))
-            if json_text.count('{') > json_text.count('}'):
-              json_text += '}' * (json_text.count('{') - json_text.count('}'))
-            print(f'Extracted JSON (inferred, with truncation fix): {json_text}')
-          else:
-            json_text = response_text[start_idx:end_idx].strip()
-            print(f'Extracted JSON (inferred): {json_text}')
+        # Extract JSON from response (in case there's extra text); a truncated object is closed
+        # off so the values that did arrive are still usable
+        json_text = extract_json_lenient(response_text)
+        if json_text is None:
+          logger.debug('No JSON pattern found in response: %s', response_text[:200])
+          raise ValueError('No valid JSON found in response')
+        logger.debug('Extracted JSON: %s', json_text)
         
-        result_data = json.loads(json_text)
+        result_data = orjson.loads(json_text)
 
-        print(f'Parsed JSON data successfully (inferred): {result_data}')
+        logger.debug('Parsed JSON data successfully: %s', result_data)
 
         # Validate extracted values
         extracted_values = result_data.get('values', [])
         if not extracted_values or (len(extracted_values) == 1 and not extracted_values[0]):
-          print(f"WARNING: No valid values extracted for {category.name}")
+          logger.warning('No valid values extracted for %s', category.name)
           extracted_values = []
         
-        print(f"Successfully extracted {len(extracted_values)} values for {category.name}: {extracted_values}")
+        logger.debug(
+          'Successfully extracted %s values for %s: %s',
+          len(extracted_values),
+          category.name,
+          extracted_values,
+        )
         
         return CategoryResult(
           category_name=category.name,
@@ -1073,18 +1236,18 @@ JSON: {{"values": ["value"], "evidence": ["text"], "confidence": 0.9}}"""
           evidence_text=result_data.get('evidence', []),
           model_used=self.model_endpoint,
         )
-      except json.JSONDecodeError as e:
-        print(f'JSON parsing error (inferred): {e}')
-        print(f'Attempted to parse: {json_text if "json_text" in locals() else "N/A"}')
+      except orjson.JSONDecodeError as e:
+        logger.warning('JSON parsing error for %s: %s', category.name, e)
+        logger.debug('Attempted to parse: %s', json_text if "json_text" in locals() else "N/A")
       except Exception as e:
-        print(f'Error parsing Databricks model response for inferred category: {e}')
-        print(f'Response was: {response_text[:200]}...')
+        logger.warning('Error parsing Databricks model response for %s: %s', category.name, e)
+        logger.debug('Response was: %s...', response_text[:200])
 
     # No fallback - return empty result if LLM fails
-    print(f"\n!!! WARNING: Failed to extract {category.name} - returning empty result")
-    print(f"Category type: {category.value_type}")
+    logger.warning('Failed to extract %s - returning empty result', category.name)
+    logger.debug('Category type: %s', category.value_type)
     if hasattr(category, 'possible_values'):
-      print(f"Possible values: {category.possible_values}")
+      logger.debug('Possible values: %s', category.possible_values)
     return CategoryResult(
       category_name=category.name,
       values=[],
@@ -1096,26 +1259,19 @@ JSON: {{"values": ["value"], "evidence": ["text"], "confidence": 0.9}}"""
 
   def extract_entities(self, text: str) -> List[ExtractedEntity]:
     """Extract named entities from text."""
-    entities = []
+    return self.extract_entities_batch([text])[0]
 
-    if self.nlp:
-      doc = self.nlp(text)
-      for ent in doc.ents:
-        entities.append(
-          ExtractedEntity(
-            entity_text=ent.text,
-            entity_type=ent.label_,
-            confidence=0.8,  # spaCy doesn't provide confidence scores by default
-            start_pos=ent.start_char,
-            end_pos=ent.end_char,
-          )
-        )
-    else:
+  def extract_entities_batch(self, texts: List[str]) -> List[List[ExtractedEntity]]:
+    """Extract named entities from several texts, one list per text.
+
+    spaCy runs the documents through nlp.pipe in batches, which is much faster than calling
+    nlp() once per text. CPU-bound; call it through run_blocking from async code.
+    """
+    if not self.nlp:
       # Fallback: simple regex-based entity extraction
       # Extract potential company names (capitalized words)
-      company_pattern = r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b'
-      for match in re.finditer(company_pattern, text):
-        entities.append(
+      return [
+        [
           ExtractedEntity(
             entity_text=match.group(),
             entity_type='ORG',
@@ -1123,9 +1279,24 @@ JSON: {{"values": ["value"], "evidence": ["text"], "confidence": 0.9}}"""
             start_pos=match.start(),
             end_pos=match.end(),
           )
-        )
+          for match in ENTITY_NAME_RE.finditer(text)
+        ]
+        for text in texts
+      ]
 
-    return entities
+    return [
+      [
+        ExtractedEntity(
+          entity_text=ent.text,
+          entity_type=ent.label_,
+          confidence=0.8,  # spaCy doesn't provide confidence scores by default
+          start_pos=ent.start_char,
+          end_pos=ent.end_char,
+        )
+        for ent in doc.ents
+      ]
+      for doc in self.nlp.pipe(texts, batch_size=self.nlp_batch_size)
+    ]
 
 
 # Global instance
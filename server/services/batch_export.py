@@ -0,0 +1,89 @@
+"""Spreadsheet export for batch analysis results.
+
+Kept free of router and AI engine imports so large exports can run in a worker process that only
+has to import this module and the batch models.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+import xlsxwriter
+
+from server.models.batch_models import BASE_EXPORT_COLUMNS, BatchItemResult, batch_results_to_rows
+
+
+def write_batch_spreadsheet(
+  results: List[BatchItemResult],
+  category_columns: Sequence[str],
+  export_format: str,
+  selected_columns: Optional[str] = None,
+) -> tuple[bytes, str]:
+  """Write batch analysis results to an xlsx or csv spreadsheet.
+
+  Args:
+    results: Per-item batch results.
+    category_columns: Schema category names, one column each after the base columns.
+    export_format: 'xlsx', or anything else for csv.
+    selected_columns: JSON array of the column names to include; all columns when empty.
+
+  Returns:
+    Tuple of (file content, suggested filename).
+  """
+  # Parse selected columns into a set once; anything that is not a column name is ignored
+  selected = set()
+  if selected_columns:
+    try:
+      parsed = json.loads(selected_columns)
+    except json.JSONDecodeError:
+      parsed = []
+    if isinstance(parsed, list):
+      selected = {col for col in parsed if isinstance(col, str)}
+
+  # Define all possible columns with their display names
+  all_columns = BASE_EXPORT_COLUMNS + list(category_columns)
+
+  # If no columns selected, use all columns
+  columns_to_include = [col for col in all_columns if col in selected] if selected else all_columns
+
+  # Build one tuple per result holding only the selected columns
+  columns_to_include, rows = batch_results_to_rows(results, category_columns, columns_to_include)
+
+  # Export to desired format
+  output = io.BytesIO()
+  timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+  if export_format == 'xlsx':
+    # constant_memory flushes each row to disk as soon as the next one starts instead of holding
+    # the whole cell grid in memory, so rows must be written strictly top to bottom. pandas'
+    # to_excel writes column by column, so rows are written with xlsxwriter directly.
+    # Cell text comes from documents and LLM output, so never let a leading '=' become a formula.
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True, 'strings_to_formulas': False})
+    worksheet = workbook.add_worksheet('Analysis Results')
+    # Formats are created once per workbook and shared by every cell that uses them
+    header_format = workbook.add_format({'bold': True, 'border': 1})
+
+    # Auto-adjust column widths from the header and the cell values
+    column_values = zip(*rows) if rows else ((),) * len(columns_to_include)
+    for col_idx, (column, values) in enumerate(zip(columns_to_include, column_values)):
+      column_length = max(len(column), max(map(len, map(str, values)), default=0))
+      worksheet.set_column(col_idx, col_idx, min(column_length + 2, 50))
+
+    worksheet.write_row(0, 0, columns_to_include, header_format)
+    for row_idx, row in enumerate(rows, start=1):
+      worksheet.write_row(row_idx, 0, row)
+    workbook.close()
+
+    filename = f'batch_insights_{timestamp}.xlsx'
+  else:  # CSV
+    text_output = io.TextIOWrapper(output, encoding='utf-8', newline='')
+    writer = csv.writer(text_output, lineterminator='\n')
+    writer.writerow(columns_to_include)
+    writer.writerows(rows)
+    text_output.detach()  # flush into output without closing it
+    filename = f'batch_insights_{timestamp}.csv'
+
+  output.seek(0)
+  return output.read(), filename
@@ -0,0 +1,137 @@
+"""Shared Databricks workspace client."""
+
+from functools import lru_cache
+from typing import Any, Dict, List
+
+import httpx
+import orjson
+from databricks.sdk import WorkspaceClient
+
+from server.config import get_settings
+from server.utils.json_extract import IncrementalJsonScanner
+
+# Model serving requests can take a while on long documents
+SERVING_TIMEOUT_SECS = 120.0
+# Pooled connections; raised to the serving concurrency cap if that is configured higher
+SERVING_MAX_CONNECTIONS = 16
+
+
+@lru_cache(maxsize=1)
+def get_client() -> WorkspaceClient:
+  """Return the process-wide WorkspaceClient.
+
+  Building a WorkspaceClient re-reads the environment, resolves authentication and creates a new
+  HTTP session, so callers share one instance and reuse its pooled keep-alive connections.
+  Construction errors are not cached; the next call tries again.
+
+  Returns:
+    The shared WorkspaceClient.
+  """
+  return WorkspaceClient()
+
+
+@lru_cache(maxsize=1)
+def get_serving_http_client() -> httpx.AsyncClient:
+  """Return the process-wide async HTTP client for model serving invocations.
+
+  Requests go out on the event loop over pooled keep-alive connections, instead of through the
+  SDK's synchronous session on a worker thread. The pool holds at least as many connections as
+  calls allowed in flight, so calls admitted by the concurrency cap never wait for a connection.
+  Closed by close_serving_http_client() at shutdown.
+
+  Returns:
+    The shared AsyncClient.
+  """
+  max_connections = max(SERVING_MAX_CONNECTIONS, get_settings().serving_max_concurrency)
+  return httpx.AsyncClient(
+    timeout=SERVING_TIMEOUT_SECS,
+    limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+  )
+
+
+async def close_serving_http_client() -> None:
+  """Close the shared serving HTTP client, if one was created."""
+  if get_serving_http_client.cache_info().currsize:
+    await get_serving_http_client().aclose()
+    get_serving_http_client.cache_clear()
+
+
+async def query_serving_endpoint(
+  endpoint: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float
+) -> Dict[str, Any]:
+  """Send a chat request to a model serving endpoint's REST invocations API.
+
+  Authentication headers come from the shared WorkspaceClient's config, which caches and refreshes
+  its token, so every auth type the SDK supports works here too.
+
+  Args:
+    endpoint: Serving endpoint name.
+    messages: Chat messages as {'role': ..., 'content': ...} dicts.
+    max_tokens: Maximum number of tokens to generate.
+    temperature: Sampling temperature.
+
+  Returns:
+    The parsed chat completion response.
+
+  Raises:
+    httpx.HTTPStatusError: The endpoint answered with an error status.
+  """
+  config = get_client().config
+  response = await get_serving_http_client().post(
+    f'{config.host.rstrip("/")}/serving-endpoints/{endpoint}/invocations',
+    content=orjson.dumps(
+      {'messages': messages, 'max_tokens': max_tokens, 'temperature': temperature}
+    ),
+    headers={**config.authenticate(), 'Content-Type': 'application/json'},
+  )
+  response.raise_for_status()
+  return orjson.loads(response.content)
+
+
+async def stream_serving_json(
+  endpoint: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float
+) -> str:
+  """Stream a chat completion and return as soon as its first JSON object or array is complete.
+
+  The reply is read as server-sent events and scanned as it arrives, so callers that only want a
+  JSON payload do not wait for trailing prose, and leaving early stops the generation.
+
+  Args:
+    endpoint: Serving endpoint name.
+    messages: Chat messages as {'role': ..., 'content': ...} dicts.
+    max_tokens: Maximum number of tokens to generate.
+    temperature: Sampling temperature.
+
+  Returns:
+    The JSON text. If the reply was cut short, the unfinished value closed off; if it holds no
+    JSON at all, the whole reply.
+
+  Raises:
+    httpx.HTTPStatusError: The endpoint answered with an error status.
+  """
+  config = get_client().config
+  scanner = IncrementalJsonScanner()
+  pieces = []
+  async with get_serving_http_client().stream(
+    'POST',
+    f'{config.host.rstrip("/")}/serving-endpoints/{endpoint}/invocations',
+    content=orjson.dumps(
+      {'messages': messages, 'max_tokens': max_tokens, 'temperature': temperature, 'stream': True}
+    ),
+    headers={**config.authenticate(), 'Content-Type': 'application/json'},
+  ) as response:
+    response.raise_for_status()
+    async for line in response.aiter_lines():
+      if not line.startswith('data:'):
+        continue
+      data = line[5:].strip()
+      if data == '[DONE]':
+        break
+      for choice in orjson.loads(data).get('choices') or ():
+        piece = (choice.get('delta') or {}).get('content')
+        if piece:
+          pieces.append(piece)
+          json_text = scanner.feed(piece)
+          if json_text is not None:
+            return json_text
+  return scanner.partial() or ''.join(pieces)
@@ -0,0 +1,85 @@
+"""Deterministic regex extractors tried before falling back to the LLM.
+
+Customer names and meeting dates usually appear in a predictable place near the top of meeting
+notes ("March 11, 2025 | 7-Eleven - Vector Search", "Meeting with Acme Corp on ..."). A single
+regex scan of the document head is far cheaper than an LLM round trip, so the engine tries these
+first and only asks the model when they miss.
+"""
+
+import re
+from typing import Callable, Dict, Optional, Tuple
+
+# Only the head of the document is scanned; dates and customer names further down are more likely
+# to be references to other meetings than the meeting itself.
+HEAD_CHARS = 500
+
+# Confidence reported for categories filled from a regex match.
+FAST_CONFIDENCE = 0.95
+
+_MONTH = (
+  r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?'
+  r'|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)'
+)
+
+DATE_RE = re.compile(
+  rf'\b{_MONTH}\.?\s+\d{{1,2}}(?:st|nd|rd|th)?,?\s+\d{{4}}\b'  # March 11, 2025 / Mar 11 2025
+  r'|\b\d{4}-\d{2}-\d{2}\b'  # 2025-03-11
+  r'|\b\d{1,2}/\d{1,2}/\d{4}\b',  # 03/11/2025
+  re.IGNORECASE,
+)
+
+CUSTOMER_RES = (
+  # "Meeting with Acme Corp on March 15"
+  re.compile(r'\b(?:[Mm]eeting|[Cc]all|[Dd]iscussion) with ([A-Z0-9][\w&.\- ]{0,48}?) on '),
+  # Header line "March 11, 2025 | 7-Eleven - Vector Search, Embedding FT"
+  re.compile(r'^[^\n|]*\d{4}\s*\|\s*([A-Za-z0-9][\w&.\- ]{0,48}?)\s+[-–:]\s', re.MULTILINE),
+)
+
+
+def find_meeting_date(text: str) -> Optional[str]:
+  """Find the first date in the head of the document.
+
+  Args:
+    text: Document text.
+
+  Returns:
+    The matched date string as written in the document, or None.
+  """
+  match = DATE_RE.search(text, 0, HEAD_CHARS)
+  return match.group(0) if match else None
+
+
+def find_customer_name(text: str) -> Optional[str]:
+  """Find the customer name in a "Meeting with X on" phrase or a "date | X - topic" header.
+
+  Args:
+    text: Document text.
+
+  Returns:
+    The customer name, or None.
+  """
+  head = text[:HEAD_CHARS]
+  for pattern in CUSTOMER_RES:
+    match = pattern.search(head)
+    if match:
+      return match.group(1).strip()
+  return None
+
+
+# Schema categories (lower-cased name) that can be answered by a fast extractor.
+FAST_CATEGORY_EXTRACTORS: Dict[str, Callable[[str], Optional[str]]] = {
+  'customer name': find_customer_name,
+  'meeting date': find_meeting_date,
+}
+
+
+def extract_customer_info(text: str) -> Tuple[Optional[str], Optional[str]]:
+  """Run both fast extractors.
+
+  Args:
+    text: Document text.
+
+  Returns:
+    Tuple of (customer_name, meeting_date); either may be None.
+  """
+  return find_customer_name(text), find_meeting_date(text)
@@ -3,13 +3,15 @@
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.service.iam import User
 
+from server.services.databricks_client import get_client
+
 
 class UserService:
   """Service for managing Databricks user operations."""
 
-  def __init__(self):
+  def __init__(self, client: WorkspaceClient | None = None):
     """Initialize the user service with Databricks workspace client."""
-    self.client = WorkspaceClient()
+    self.client = client or get_client()
 
   def get_current_user(self) -> User:
     """Get the current authenticated user."""
@@ -0,0 +1 @@
+"""Shared utilities for the server and helper scripts."""
@@ -0,0 +1,67 @@
+"""Executors for synchronous file parsing and spreadsheet serialization.
+
+Parsing .docx uploads and writing xlsx/csv exports are blocking calls; running them on the event
+loop thread stalls every other request. They get their own thread pool rather than the loop's
+default executor, which the model serving calls in the AI engine already keep busy. CPU-bound work
+large enough to be worth pickling its arguments goes to a small process pool instead, where it
+does not compete for the GIL.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, TypeVar
+
+T = TypeVar('T')
+
+_io_pool = ThreadPoolExecutor(
+  max_workers=min(32, (os.cpu_count() or 1) * 4), thread_name_prefix='blocking-io'
+)
+
+PROCESS_POOL_WORKERS = 2
+
+
+@lru_cache(maxsize=1)
+def _get_process_pool() -> ProcessPoolExecutor:
+  """Create the process pool on first use.
+
+  Workers are spawned rather than forked: the server process runs threads (the pool above, the
+  SDK's HTTP connections) that a fork would copy in an arbitrary state.
+  """
+  return ProcessPoolExecutor(
+    max_workers=PROCESS_POOL_WORKERS, mp_context=multiprocessing.get_context('spawn')
+  )
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+  """Run a synchronous function in the I/O pool without blocking the event loop.
+
+  Args:
+    func: Function to call.
+    *args: Positional arguments for func.
+    **kwargs: Keyword arguments for func.
+
+  Returns:
+    The function's return value.
+  """
+  loop = asyncio.get_running_loop()
+  return await loop.run_in_executor(_io_pool, partial(func, *args, **kwargs))
+
+
+async def run_in_process(func: Callable[..., T], *args: Any) -> T:
+  """Run a CPU-bound function in the worker process pool.
+
+  func must be a module-level function and its arguments picklable. Spawned workers import
+  func's module from scratch, so keep it light on import-time side effects.
+
+  Args:
+    func: Function to call.
+    *args: Positional arguments for func.
+
+  Returns:
+    The function's return value.
+  """
+  loop = asyncio.get_running_loop()
+  return await loop.run_in_executor(_get_process_pool(), func, *args)
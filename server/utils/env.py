@@ -0,0 +1,18 @@
+"""Environment loading helpers."""
+
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=None)
+def load_env(path: str = '.env.local') -> bool:
+  """Load environment variables from a dotenv file once per process.
+
+  Variables already present in the environment are left untouched. Repeated
+  calls with the same path are served from the cache without re-reading the file.
+
+  Returns:
+    True if the file was found and at least one variable was set.
+  """
+  return load_dotenv(path, override=False)
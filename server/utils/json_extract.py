@@ -0,0 +1,165 @@
+"""Helpers for pulling JSON payloads out of free-form LLM output."""
+
+import re
+from typing import List, Optional, Tuple
+
+import orjson
+
+_CLOSERS = {'{': '}', '[': ']'}
+# Characters that can change bracket or string state; everything else is skipped in C
+_STRUCTURAL_RE = re.compile(r'[][{}"\\]')
+
+
+def extract_first_json(s: str) -> Optional[str]:
+  """Extract the first valid JSON object or array embedded in ``s``.
+
+  One pass finds the outermost balanced bracket spans, then each is parsed with orjson until one
+  succeeds. The spans do not overlap, so hostile input (deep nesting, many unclosed brackets) is
+  handled in linear time, and orjson's nesting limit turns overly deep values into a parse
+  failure rather than a RecursionError. A valid value nested inside a bracketed span that is not
+  itself valid JSON is not found.
+
+  Args:
+    s: Text that may contain a JSON value surrounded by prose or markdown.
+
+  Returns:
+    The JSON substring, which parses with orjson, or None if no object or array was found.
+  """
+  for start, end in _bracket_spans(s):
+    candidate = s[start:end]
+    try:
+      orjson.loads(candidate)
+      return candidate
+    except orjson.JSONDecodeError:
+      pass
+  return None
+
+
+def extract_json_lenient(s: str) -> Optional[str]:
+  """Extract the first JSON object or array in ``s``, closing it off if it was cut short.
+
+  Args:
+    s: LLM output that may contain a complete or truncated JSON value.
+
+  Returns:
+    The JSON text, or None if no value was started. A value truncated mid-token may still fail
+    to parse.
+  """
+  json_text = extract_first_json(s)
+  if json_text is None:
+    scanner = IncrementalJsonScanner()
+    json_text = scanner.feed(s) or scanner.partial()
+  return json_text
+
+
+def _bracket_spans(s: str) -> List[Tuple[int, int]]:
+  """Return the outermost balanced bracket spans in ``s`` as (start, end) pairs, in order.
+
+  Brackets inside string literals are ignored. A mismatched closer discards every bracket still
+  open, as none of them can start valid JSON; brackets never closed yield no span, but balanced
+  spans nested inside them still count.
+  """
+  spans: List[Tuple[int, int]] = []
+  stack: List[Tuple[str, int]] = []
+  in_string = False
+  escaped_pos = -1
+  for match in _STRUCTURAL_RE.finditer(s):
+    ch, i = match.group(), match.start()
+    if not stack:
+      # Skip prose or markdown before a value starts
+      if ch in _CLOSERS:
+        stack.append((_CLOSERS[ch], i))
+    elif in_string:
+      if i == escaped_pos:
+        pass
+      elif ch == '\\':
+        escaped_pos = i + 1
+      elif ch == '"':
+        in_string = False
+    elif ch == '"':
+      in_string = True
+    elif ch in _CLOSERS:
+      stack.append((_CLOSERS[ch], i))
+    elif ch != '\\':
+      closer, start = stack.pop()
+      if closer != ch:
+        stack.clear()
+        continue
+      # Spans closed earlier inside this one are no longer outermost
+      while spans and spans[-1][0] > start:
+        spans.pop()
+      spans.append((start, i + 1))
+  return spans
+
+
+class IncrementalJsonScanner:
+  """Find the first JSON object or array in text that arrives in pieces, e.g. a streamed reply.
+
+  Tracks string, escape and bracket state across calls to feed(), so each character is looked at
+  once and a caller can stop reading as soon as the value closes.
+  """
+
+  def __init__(self) -> None:
+    self._parts: List[str] = []
+    self._stack: List[str] = []
+    self._in_string = False
+    self._escape = False
+
+  def feed(self, chunk: str) -> Optional[str]:
+    """Scan the next piece of text.
+
+    Args:
+      chunk: Text following everything fed so far.
+
+    Returns:
+      The JSON text once its outermost bracket closes, otherwise None.
+    """
+    begin = 0 if self._stack else -1
+    for i, ch in enumerate(chunk):
+      if not self._stack:
+        # Skip prose or markdown before the value starts
+        if ch in _CLOSERS:
+          begin = i
+          self._stack.append(_CLOSERS[ch])
+      elif self._in_string:
+        if self._escape:
+          self._escape = False
+        elif ch == '\\':
+          self._escape = True
+        elif ch == '"':
+          self._in_string = False
+      elif ch == '"':
+        self._in_string = True
+      elif ch in _CLOSERS:
+        self._stack.append(_CLOSERS[ch])
+      elif ch == '}' or ch == ']':
+        if self._stack.pop() != ch:
+          # Mismatched bracket: not JSON, look for the next value instead
+          self._stack.clear()
+          self._parts.clear()
+          begin = -1
+        elif not self._stack:
+          self._parts.append(chunk[begin : i + 1])
+          return ''.join(self._parts)
+    if begin != -1:
+      self._parts.append(chunk[begin:])
+    return None
+
+  def partial(self) -> Optional[str]:
+    """Return the unfinished value closed off, for output that was cut short.
+
+    An open string is terminated, a dangling comma dropped and every open bracket closed. A value
+    truncated mid-token (e.g. a bare key) still fails to parse and is left to the caller.
+
+    Returns:
+      The repaired JSON text, or None if no value was started.
+    """
+    if not self._stack:
+      return None
+    text = ''.join(self._parts)
+    if self._in_string:
+      text = (text[:-1] if self._escape else text) + '"'
+    text = text.rstrip()
+    if text.endswith(','):
+      text = text[:-1]
+    return text + ''.join(reversed(self._stack))
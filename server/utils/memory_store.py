@@ -0,0 +1,99 @@
+"""Bounded in-process key/value store for templates and sessions.
+
+Stands in for the Delta table the routers will eventually persist to. Entries are kept in least
+recently used order and the oldest ones are dropped once the store is full, so a long-running
+worker cannot grow without limit. Routers only use the mapping interface, so the backing store can
+be swapped for a shared one later without touching the endpoints.
+
+Every operation is synchronous and never awaits, so concurrent requests on the event loop cannot
+interleave inside one; no lock is needed. Like the plain dicts it replaces, the contents are
+per process and are not shared between uvicorn workers.
+"""
+
+from collections import OrderedDict
+from itertools import islice
+from typing import (
+  Callable,
+  Generic,
+  ItemsView,
+  Iterable,
+  Iterator,
+  KeysView,
+  MutableMapping,
+  Optional,
+  TypeVar,
+  ValuesView,
+)
+
+V = TypeVar('V')
+
+
+class MemoryStore(MutableMapping[str, V], Generic[V]):
+  """LRU-bounded mapping from string IDs to values.
+
+  Reads and writes both mark an entry as recently used. Pinned keys (e.g. built-in templates) are
+  never evicted and do not count toward maxsize.
+  """
+
+  def __init__(
+    self,
+    maxsize: int,
+    pinned: Iterable[str] = (),
+    on_evict: Optional[Callable[[str], None]] = None,
+  ):
+    """Create an empty store.
+
+    Args:
+      maxsize: Maximum number of unpinned entries to keep.
+      pinned: Keys that are never evicted.
+      on_evict: Called with the key of each entry dropped to make room.
+    """
+    self.maxsize = maxsize
+    self._pinned = frozenset(pinned)
+    self._on_evict = on_evict
+    self._data: OrderedDict[str, V] = OrderedDict()
+
+  def __getitem__(self, key: str) -> V:
+    value = self._data[key]
+    self._data.move_to_end(key)
+    return value
+
+  def __setitem__(self, key: str, value: V) -> None:
+    self._data[key] = value
+    self._data.move_to_end(key)
+    self._evict()
+
+  def __delitem__(self, key: str) -> None:
+    del self._data[key]
+
+  def __iter__(self) -> Iterator[str]:
+    return iter(self._data)
+
+  def __len__(self) -> int:
+    return len(self._data)
+
+  def __contains__(self, key: object) -> bool:
+    # Membership checks do not count as use
+    return key in self._data
+
+  # Listing the store does not count as use either; the mixin views would go through __getitem__
+  # and reorder the dict while iterating it.
+  def keys(self) -> KeysView[str]:
+    return self._data.keys()
+
+  def values(self) -> ValuesView[V]:
+    return self._data.values()
+
+  def items(self) -> ItemsView[str, V]:
+    return self._data.items()
+
+  def _evict(self) -> None:
+    """Drop the least recently used unpinned entries until the store fits in maxsize."""
+    excess = len(self._data) - len(self._pinned & self._data.keys()) - self.maxsize
+    if excess <= 0:
+      return
+    unpinned = (key for key in self._data if key not in self._pinned)
+    for key in list(islice(unpinned, excess)):
+      del self._data[key]
+      if self._on_evict:
+        self._on_evict(key)
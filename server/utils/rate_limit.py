@@ -0,0 +1,194 @@
+"""Rate limiting, retry and endpoint health helpers for Databricks model serving calls."""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+
+import httpx
+from aiolimiter import AsyncLimiter
+from databricks.sdk.errors import RequestLimitExceeded, TemporarilyUnavailable, TooManyRequests
+
+from server.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Errors worth retrying: throttling (429) and transient unavailability (503)
+RETRYABLE_ERRORS = (TooManyRequests, RequestLimitExceeded, TemporarilyUnavailable)
+RETRYABLE_STATUS_CODES = (429, 503)
+
+# Seconds a throttled or timed-out endpoint is skipped in favour of the others
+THROTTLE_COOLDOWN_SECS = 30.0
+# Consecutive failures that open an endpoint's circuit breaker, and how long it stays open
+BREAKER_FAILURES = 3
+BREAKER_OPEN_SECS = 60.0
+BASE_DELAY_SECS = 1.0
+MAX_DELAY_SECS = 30.0
+
+
+@lru_cache(maxsize=None)
+def get_serving_limiter(endpoint: str) -> AsyncLimiter:
+  """Return the process-wide limiter shared by every call to one serving endpoint.
+
+  Foundation Model endpoints are rate limited independently, so each gets its own budget.
+
+  Args:
+    endpoint: Serving endpoint name.
+
+  Returns:
+    An AsyncLimiter allowing SERVING_REQUESTS_PER_MINUTE requests per minute.
+  """
+  return AsyncLimiter(get_settings().serving_requests_per_minute, time_period=60)
+
+
+@lru_cache(maxsize=1)
+def get_serving_semaphore() -> asyncio.BoundedSemaphore:
+  """Return the process-wide cap on serving endpoint calls in flight at once.
+
+  The limiter above paces how often calls start; this bounds how many run together, however many
+  batch requests are fanning out at the same time.
+
+  Returns:
+    A BoundedSemaphore with SERVING_MAX_CONCURRENCY slots.
+  """
+  return asyncio.BoundedSemaphore(max(1, get_settings().serving_max_concurrency))
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+  """Return True for throttling or transient errors, including ones only identifiable by text."""
+  if isinstance(error, RETRYABLE_ERRORS):
+    return True
+  if isinstance(error, httpx.HTTPStatusError):
+    return error.response.status_code in RETRYABLE_STATUS_CODES
+  message = str(error)
+  return 'REQUEST_LIMIT_EXCEEDED' in message or 'rate limit' in message.lower()
+
+
+def _retry_after_secs(error: Exception) -> Optional[float]:
+  """Retry-After delay carried by an SDK error or an HTTP error response, if any."""
+  if isinstance(error, httpx.HTTPStatusError):
+    try:
+      return float(error.response.headers['Retry-After'])
+    except (KeyError, ValueError):
+      return None
+  return getattr(error, 'retry_after_secs', None)
+
+
+def _backoff_delay(attempt: int, retry_after: Optional[float]) -> float:
+  """Seconds to wait before the next attempt.
+
+  Honors the server's Retry-After value when present, otherwise uses full-jitter exponential
+  backoff so concurrent callers do not retry in lockstep.
+  """
+  if retry_after:
+    return retry_after + random.uniform(0, BASE_DELAY_SECS)
+  return random.uniform(0, min(MAX_DELAY_SECS, BASE_DELAY_SECS * 2**attempt))
+
+
+async def call_with_retry(
+  call: Callable[[], Awaitable[T]], endpoint: str, max_attempts: Optional[int] = None
+) -> T:
+  """Run a serving endpoint call under the endpoint's rate limiter, retrying throttled attempts.
+
+  Each attempt holds a slot of the shared concurrency cap and acquires one from the endpoint's
+  limiter; the slot is released while waiting to retry. Throttling errors are retried after the
+  Retry-After delay reported by the endpoint (or a jittered exponential backoff); any other error,
+  or the last throttling error, is raised to the caller.
+
+  Args:
+    call: Zero-argument factory returning a fresh awaitable for each attempt.
+    endpoint: Serving endpoint the call goes to.
+    max_attempts: Maximum number of attempts, including the first. Defaults to
+      SERVING_MAX_ATTEMPTS.
+
+  Returns:
+    The result of the first successful attempt.
+  """
+  if max_attempts is None:
+    max_attempts = get_settings().serving_max_attempts
+  limiter = get_serving_limiter(endpoint)
+  semaphore = get_serving_semaphore()
+  for attempt in range(max_attempts - 1):
+    try:
+      async with semaphore, limiter:
+        return await call()
+    except Exception as e:
+      if not is_rate_limit_error(e):
+        raise
+      delay = _backoff_delay(attempt, _retry_after_secs(e))
+      logger.info('Rate limited by %s (%s). Retrying in %.1fs', endpoint, type(e).__name__, delay)
+      await asyncio.sleep(delay)
+
+  async with semaphore, limiter:
+    return await call()
+
+
+@dataclass
+class EndpointHealth:
+  """Recent outcomes of calls to one serving endpoint."""
+
+  consecutive_failures: int = 0
+  # time.monotonic() value until which the endpoint is skipped
+  unavailable_until: float = 0.0
+
+
+class EndpointRouter:
+  """Chooses which serving endpoints to try for a call, routing around unhealthy ones.
+
+  A throttled or timed-out endpoint cools down for THROTTLE_COOLDOWN_SECS; BREAKER_FAILURES
+  consecutive failures open its breaker for BREAKER_OPEN_SECS. Once either expires the endpoint is
+  tried again, and a single further failure reopens the breaker until a call succeeds.
+  """
+
+  def __init__(self):
+    self._health: Dict[str, EndpointHealth] = {}
+
+  def health(self, endpoint: str) -> EndpointHealth:
+    """Return the health record for an endpoint, creating it on first use."""
+    return self._health.setdefault(endpoint, EndpointHealth())
+
+  def candidates(self, endpoints: Sequence[str]) -> List[str]:
+    """Endpoints to try, in order.
+
+    Available endpoints keep their priority order. When every endpoint is cooling down, all of
+    them are returned, soonest to recover first, rather than failing the call outright.
+    """
+    now = time.monotonic()
+    available = [
+      endpoint for endpoint in endpoints if self.health(endpoint).unavailable_until <= now
+    ]
+    if available:
+      return available
+    return sorted(endpoints, key=lambda endpoint: self.health(endpoint).unavailable_until)
+
+  def record_success(self, endpoint: str) -> None:
+    """Mark an endpoint healthy again."""
+    health = self.health(endpoint)
+    health.consecutive_failures = 0
+    health.unavailable_until = 0.0
+
+  def record_throttled(self, endpoint: str) -> None:
+    """Skip an endpoint that is throttling or timing out for THROTTLE_COOLDOWN_SECS."""
+    health = self.health(endpoint)
+    health.unavailable_until = max(
+      health.unavailable_until, time.monotonic() + THROTTLE_COOLDOWN_SECS
+    )
+
+  def record_failure(self, endpoint: str) -> None:
+    """Count a failed call, opening the endpoint's breaker after BREAKER_FAILURES in a row."""
+    health = self.health(endpoint)
+    health.consecutive_failures += 1
+    if health.consecutive_failures >= BREAKER_FAILURES:
+      logger.warning('Opening circuit breaker for %s for %.0fs', endpoint, BREAKER_OPEN_SECS)
+      health.unavailable_until = time.monotonic() + BREAKER_OPEN_SECS
+
+
+@lru_cache(maxsize=1)
+def get_endpoint_router() -> EndpointRouter:
+  """Return the process-wide endpoint router."""
+  return EndpointRouter()
@@ -0,0 +1,22 @@
+"""Response classes shared by the API routers."""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class OrjsonResponse(JSONResponse):
+  """JSON response rendered with orjson.
+
+  This is the app's default response class, so response_model results (e.g. the batch analysis
+  result with one entry per item) are serialized by orjson once FastAPI has encoded them.
+  Handlers that return large plain dicts (batch previews carrying a row per item with its
+  category values) return this directly, which skips FastAPI's recursive jsonable_encoder pass and
+  serializes the payload in a single orjson call. Declare it as the route's response_class too,
+  so the OpenAPI schema reports the right media type.
+  """
+
+  def render(self, content: Any) -> bytes:
+    """Serialize content to JSON bytes."""
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
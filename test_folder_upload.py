@@ -3,7 +3,6 @@
 
 import requests
 import json
-import base64
 from pathlib import Path
 
 def test_folder_upload():
@@ -44,11 +43,12 @@ def test_folder_upload():
         for item in result['table_data']:
             print(f"  - {item['source']}: {item['customer_name']}")
         
-        # Save the spreadsheet
-        if 'spreadsheet_base64' in result:
-            spreadsheet_data = base64.b64decode(result['spreadsheet_base64'])
+        # Save the spreadsheet; its download link can only be fetched once
+        if 'download_url' in result:
+            download = requests.get(f"http://localhost:8000{result['download_url']}", timeout=60)
+            download.raise_for_status()
             output_path = Path("batch_results.xlsx")
-            output_path.write_bytes(spreadsheet_data)
+            output_path.write_bytes(download.content)
             print(f"\nSpreadsheet saved to: {output_path}")
         
         return True
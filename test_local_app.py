@@ -142,9 +142,13 @@ def test_batch_processing():
                 print(f"  Industry: {row.get('industry', 'N/A')}")
                 print(f"  Use Case: {row.get('use_case', 'N/A')}")
             
-            # Check if spreadsheet was generated
-            if 'spreadsheet_base64' in result:
-                print(f"\n✅ Spreadsheet generated ({result.get('filename', 'N/A')})")
+            # Check if spreadsheet was generated and can be downloaded
+            if 'download_url' in result:
+                download = requests.get(f"{BASE_URL}{result['download_url']}", timeout=60)
+                if download.status_code == 200:
+                    print(f"\n✅ Spreadsheet generated ({result.get('filename', 'N/A')})")
+                else:
+                    print(f"\n❌ Spreadsheet download failed: {download.text}")
             
             return len(table_data) == len(test_files)
         else: